@@ -0,0 +1,334 @@
+"""Objetos falsos do discord (gateway/http) para rodar os players sem conexão com o discord.
+
+Apenas o necessário para o LavalinkPlayer, o wavelink e o sistema de retomada de players: servidores, canais,
+mensagens (envio/edição com latência simulada) e os eventos de voz do gateway (VOICE_STATE_UPDATE e
+VOICE_SERVER_UPDATE) que o wavelink usa para enviar o voiceUpdate ao lavalink.
+"""
+from __future__ import annotations
+import asyncio
+import itertools
+import os
+import time
+from typing import Dict, List, Optional
+
+import disnake
+from disnake.ext import commands
+
+snowflakes = itertools.count(100000000000000000)
+
+
+def snowflake() -> int:
+    return next(snowflakes)
+
+
+class FakeDiscordHTTP:
+    """Contador das requisições que seriam feitas na api do discord."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests: Dict[str, int] = {}
+        self.latencies: List[float] = []
+
+    async def request(self, action: str):
+
+        self.requests[action] = self.requests.get(action, 0) + 1
+
+        start = time.perf_counter()
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        self.latencies.append(time.perf_counter() - start)
+
+
+class FakePermissions:
+
+    def __getattr__(self, item):
+        return True
+
+
+class FakeUser:
+
+    def __init__(self, id_: int, name: str, *, bot: bool = False):
+        self.id = id_
+        self.name = name
+        self.bot = bot
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+
+class FakeVoiceState:
+
+    def __init__(self, channel: FakeVoiceChannel):
+        self.channel = channel
+        self.deaf = True
+        self.self_deaf = True
+        self.suppress = False
+
+
+class FakeMember(FakeUser):
+
+    def __init__(self, id_: int, name: str, guild: FakeGuild, *, bot: bool = False):
+        super().__init__(id_, name, bot=bot)
+        self.guild = guild
+        self.voice: Optional[FakeVoiceState] = None
+        self.guild_permissions = FakePermissions()
+
+    async def edit(self, **kwargs):
+        await self.guild.bot.http_stub.request("edit_member")
+
+
+class FakeMessage:
+
+    def __init__(self, channel: FakeTextChannel, content: Optional[str] = None, **kwargs):
+        self.id = snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.embeds = [kwargs["embed"]] if kwargs.get("embed") else kwargs.get("embeds", [])
+        self.thread = None
+
+    @property
+    def jump_url(self):
+        return f"https://discord.com/channels/{self.guild.id}/{self.channel.id}/{self.id}"
+
+    async def edit(self, content: Optional[str] = None, **kwargs):
+        await self.guild.bot.http_stub.request("edit_message")
+        self.content = content
+        if kwargs.get("embed"):
+            self.embeds = [kwargs["embed"]]
+        return self
+
+    async def delete(self, **kwargs):
+        await self.guild.bot.http_stub.request("delete_message")
+        self.channel.messages.pop(self.id, None)
+
+
+class FakeTextChannel:
+
+    def __init__(self, guild: FakeGuild, name: str):
+        self.id = snowflake()
+        self.name = name
+        self.guild = guild
+        self.parent = None
+        self.last_message_id: Optional[int] = None
+        self.messages: Dict[int, FakeMessage] = {}
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+    def permissions_for(self, *args, **kwargs):
+        return FakePermissions()
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        await self.guild.bot.http_stub.request("send_message")
+        message = FakeMessage(self, content, **kwargs)
+        self.messages[message.id] = message
+        self.last_message_id = message.id
+        return message
+
+    async def fetch_message(self, message_id: int):
+        await self.guild.bot.http_stub.request("fetch_message")
+        try:
+            return self.messages[message_id]
+        except KeyError:
+            raise Exception(f"Mensagem não encontrada: {message_id}")
+
+    async def purge(self, **kwargs):
+        await self.guild.bot.http_stub.request("purge")
+        return []
+
+
+class FakeVoiceClient:
+
+    def __init__(self, channel: FakeVoiceChannel):
+        self.channel = channel
+
+    async def disconnect(self, **kwargs):
+        await self.channel.guild.bot.gateway.voice_disconnect(self.channel.guild)
+
+    def cleanup(self):
+        pass
+
+
+class FakeVoiceChannel(FakeTextChannel):
+
+    def __init__(self, guild: FakeGuild, name: str):
+        super().__init__(guild, name)
+        self.user_limit = 0
+        self.voice_states: Dict[int, FakeVoiceState] = {}
+        self.members: List[FakeMember] = []
+
+    async def connect(self, **kwargs):
+        # o wavelink informa a classe do voice client, aqui a conexão é feita apenas pelos eventos do gateway.
+        await self.guild.bot.gateway.voice_connect(self.guild, self)
+        return self.guild.voice_client
+
+
+class FakeGuild:
+
+    def __init__(self, bot: FakeBot, name: str):
+        self.id = snowflake()
+        self.bot = bot
+        self.name = name
+        self.shard_id = 0
+        self.region = "us-central"
+        self.voice_client: Optional[FakeVoiceClient] = None
+        self.me = FakeMember(bot.user.id, bot.user.name, self, bot=True)
+        self.text_channel = FakeTextChannel(self, "musica")
+        self.voice_channel = FakeVoiceChannel(self, "Voz")
+        self.channels = {c.id: c for c in (self.text_channel, self.voice_channel)}
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def get_member(self, member_id: int):
+        if member_id == self.me.id:
+            return self.me
+
+    async def change_voice_state(self, *, channel: Optional[FakeVoiceChannel], **kwargs):
+        if channel:
+            await self.bot.gateway.voice_connect(self, channel)
+        else:
+            await self.bot.gateway.voice_disconnect(self)
+
+
+class FakeGateway:
+    """Envia os eventos de voz do jeito que o gateway do discord enviaria (via on_socket_response)."""
+
+    def __init__(self, bot: FakeBot, latency: float = 0.0):
+        self.bot = bot
+        self.latency = latency
+        self.events = 0
+
+    async def voice_connect(self, guild: FakeGuild, channel: FakeVoiceChannel):
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        guild.voice_client = FakeVoiceClient(channel)
+        guild.me.voice = FakeVoiceState(channel)
+        channel.voice_states[guild.me.id] = guild.me.voice
+
+        self.dispatch(
+            "VOICE_STATE_UPDATE",
+            {"guild_id": str(guild.id), "channel_id": str(channel.id), "user_id": str(self.bot.user.id),
+             "session_id": os.urandom(16).hex()}
+        )
+        self.dispatch(
+            "VOICE_SERVER_UPDATE",
+            {"guild_id": str(guild.id), "token": os.urandom(8).hex(), "endpoint": "fake.discord.media:443"}
+        )
+
+    async def voice_disconnect(self, guild: FakeGuild):
+
+        if guild.me.voice:
+            guild.me.voice.channel.voice_states.pop(guild.me.id, None)
+
+        guild.voice_client = None
+        guild.me.voice = None
+
+        self.dispatch(
+            "VOICE_STATE_UPDATE",
+            {"guild_id": str(guild.id), "channel_id": None, "user_id": str(self.bot.user.id), "session_id": ""}
+        )
+
+    def dispatch(self, event: str, data: dict):
+        self.events += 1
+        self.bot.dispatch("socket_response", {"t": event, "d": data})
+
+
+class FakeDatabase:
+    """Database em memória com os mesmos métodos usados pelo bot (LocalDatabase/MongoDatabase)."""
+
+    def __init__(self):
+        self.data: Dict[str, Dict[str, Dict[str, dict]]] = {}
+        self.operations = 0
+
+    def collection(self, collection: str, db_name: str) -> Dict[str, dict]:
+        return self.data.setdefault(collection, {}).setdefault(db_name, {})
+
+    async def get_data(self, id_, *, db_name: str, collection: str, default_model: dict = None):
+        self.operations += 1
+        return self.collection(collection, db_name).get(str(id_), {})
+
+    async def update_data(self, id_, data: dict, *, db_name: str, collection: str, default_model: dict = None):
+        self.operations += 1
+        self.collection(collection, db_name)[str(id_)] = data
+        return data
+
+    async def query_data(self, db_name: str, collection: str, filter: dict = None) -> list:
+        self.operations += 1
+        return list(self.collection(collection, db_name).values())
+
+    async def delete_data(self, id_, db_name: str, collection: str):
+        self.operations += 1
+        self.collection(collection, db_name).pop(str(id_), None)
+
+
+class FakePool:
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.bots = []
+        self.playlist_cache = {}
+        self.local_database = FakeDatabase()
+        self.mongo_database = None
+        self.tracer = None
+        self.watchdog = None
+
+    @property
+    def database(self):
+        return self.local_database
+
+
+class FakeBot(commands.Bot):
+
+    def __init__(self, config: dict, *, discord_latency: float = 0.0, gateway_latency: float = 0.0):
+        super().__init__(command_prefix=commands.when_mentioned, intents=disnake.Intents.default(), help_command=None)
+        self.config = config
+        self.identifier = "FAKE"
+        self.pool = FakePool(config)
+        self.pool.bots.append(self)
+        self.appinfo = None
+        self.bot_ready = True
+        self.player_skins = {}
+        self.player_static_skins = {}
+        self.default_skin = "default"
+        self.default_static_skin = "default"
+        self.fake_user = FakeUser(snowflake(), "Fake Music Bot", bot=True)
+        self.fake_guilds: Dict[int, FakeGuild] = {}
+        self.fake_channels: Dict[int, FakeTextChannel] = {}
+        self.http_stub = FakeDiscordHTTP(discord_latency)
+        self.gateway = FakeGateway(self, gateway_latency)
+
+    @property
+    def user(self):
+        return self.fake_user
+
+    async def wait_until_ready(self):
+        return
+
+    def is_ready(self):
+        return True
+
+    def get_guild(self, guild_id: int):
+        return self.fake_guilds.get(guild_id)
+
+    def get_channel(self, channel_id: int):
+        return self.fake_channels.get(channel_id)
+
+    def get_color(self, *args, **kwargs):
+        return 0
+
+    def create_guild(self, name: str = "") -> FakeGuild:
+        guild = FakeGuild(self, name or f"Fake Guild {len(self.fake_guilds)}")
+        self.fake_guilds[guild.id] = guild
+        self.fake_channels.update(guild.channels)
+        return guild
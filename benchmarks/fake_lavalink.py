@@ -0,0 +1,445 @@
+"""Servidor lavalink falso (api v3) para testes de desempenho sem conexão externa.
+
+Implementa as rotas REST usadas pelo bot (loadtracks, decodetrack e decodetracks) e o websocket com os eventos
+playerUpdate, stats, TrackStartEvent e TrackEndEvent em intervalos configuráveis.
+
+Buscas:
+    ytsearch:<termo>                                                -> 5 resultados.
+    https://www.youtube.com/playlist?list=<id>&fake_size=<qtd>      -> playlist com <qtd> músicas.
+    qualquer outro link                                             -> 1 resultado.
+    termos contendo "nomatches"                                     -> NO_MATCHES.
+
+Uso (servidor avulso, pode ser adicionado no lavalink.ini para testar o bot real):
+    python -m benchmarks.fake_lavalink --port 2333 --track-duration 30
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from aiohttp import web, WSMsgType
+
+
+def encode_track(info: dict) -> str:
+    return base64.b64encode(json.dumps(info, separators=(",", ":")).encode()).decode()
+
+
+def decode_track(track: str) -> dict:
+    return json.loads(base64.b64decode(track))
+
+
+def build_track(n: int, query: str, duration: int) -> dict:
+
+    identifier = f"{zlib.crc32(f'{query}:{n}'.encode()):011d}"
+
+    info = {
+        "identifier": identifier,
+        "isSeekable": True,
+        "author": f"Fake Author {n % 50}",
+        "length": duration,
+        "isStream": False,
+        "position": 0,
+        "title": f"Fake Track {n} ({query[:40]})",
+        "uri": f"https://www.youtube.com/watch?v={identifier}",
+        "sourceName": "youtube",
+    }
+
+    return {"track": encode_track(info), "info": info}
+
+
+class FakePlayerState:
+
+    __slots__ = ("guild_id", "track", "position", "started_at", "paused", "volume", "connected", "end_task")
+
+    def __init__(self, guild_id: str):
+        self.guild_id = guild_id
+        self.track: Optional[str] = None
+        self.position = 0
+        self.started_at = 0.0
+        self.paused = False
+        self.volume = 100
+        self.connected = False
+        self.end_task: Optional[asyncio.Task] = None
+
+    @property
+    def current_position(self) -> int:
+        if not self.track or self.paused:
+            return self.position
+        return int(self.position + (time.time() - self.started_at) * 1000)
+
+
+class FakeLavalink:
+
+    def __init__(
+            self, host: str = "localhost", port: int = 2333, password: str = "youshallnotpass", *,
+            rest_latency: float = 0.0, event_delay: float = 0.0, update_interval: float = 5.0,
+            stats_interval: float = 60.0, track_duration: int = 180000, playlist_size: int = 100
+    ):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.rest_latency = rest_latency
+        self.event_delay = event_delay
+        self.update_interval = update_interval
+        self.stats_interval = stats_interval
+        self.track_duration = track_duration
+        self.playlist_size = playlist_size
+        self.players: Dict[str, FakePlayerState] = {}
+        self.sockets: set = set()
+        self.runner: Optional[web.AppRunner] = None
+        self.tasks = []
+        self.started = time.time()
+        self.counters = {"rest": 0, "ws_received": 0, "ws_sent": 0, "player_updates": 0, "events": 0}
+
+    @property
+    def rest_uri(self):
+        return f"http://{self.host}:{self.port}"
+
+    def node_data(self, identifier: str = "FAKE") -> dict:
+        # parâmetros usados no bot.music.initiate_node()
+        return {
+            "host": self.host,
+            "port": self.port,
+            "rest_uri": self.rest_uri,
+            "password": self.password,
+            "identifier": identifier,
+            "region": "us_central",
+        }
+
+    async def start(self):
+
+        app = web.Application()
+        app.router.add_get("/", self.websocket_handler)
+        app.router.add_get("/loadtracks", self.loadtracks)
+        app.router.add_get("/decodetrack", self.decodetrack)
+        app.router.add_post("/decodetracks", self.decodetracks)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+
+        self.tasks = [
+            asyncio.create_task(self.player_update_loop()),
+            asyncio.create_task(self.stats_loop()),
+        ]
+
+    async def stop(self):
+
+        for t in self.tasks:
+            t.cancel()
+
+        for p in self.players.values():
+            if p.end_task:
+                p.end_task.cancel()
+
+        for ws in list(self.sockets):
+            await ws.close()
+
+        if self.runner:
+            await self.runner.cleanup()
+
+    def authorized(self, request: web.Request):
+        return request.headers.get("Authorization") == self.password
+
+    async def rest_delay(self):
+        self.counters["rest"] += 1
+        if self.rest_latency:
+            await asyncio.sleep(self.rest_latency * random.uniform(0.5, 1.5))
+
+    async def loadtracks(self, request: web.Request):
+
+        if not self.authorized(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+
+        await self.rest_delay()
+
+        query = request.query.get("identifier", "")
+
+        if "nomatches" in query:
+            return web.json_response({"loadType": "NO_MATCHES", "playlistInfo": {}, "tracks": []})
+
+        if query.startswith(("ytsearch:", "ytmsearch:", "scsearch:")):
+            return web.json_response(
+                {
+                    "loadType": "SEARCH_RESULT",
+                    "playlistInfo": {},
+                    "tracks": [build_track(n, query, self.track_duration) for n in range(5)]
+                }
+            )
+
+        qs = parse_qs(urlparse(query).query)
+
+        if "list" in qs:
+
+            try:
+                size = int(qs["fake_size"][0])
+            except (KeyError, ValueError):
+                size = self.playlist_size
+
+            return web.json_response(
+                {
+                    "loadType": "PLAYLIST_LOADED",
+                    "playlistInfo": {"name": f"Fake Playlist ({size})", "selectedTrack": -1},
+                    "tracks": [build_track(n, query, self.track_duration) for n in range(size)]
+                }
+            )
+
+        return web.json_response(
+            {"loadType": "TRACK_LOADED", "playlistInfo": {}, "tracks": [build_track(0, query, self.track_duration)]}
+        )
+
+    async def decodetrack(self, request: web.Request):
+
+        if not self.authorized(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+
+        await self.rest_delay()
+
+        try:
+            return web.json_response(decode_track(request.query["track"]))
+        except Exception as e:
+            return web.json_response({"status": 500, "error": repr(e)}, status=500)
+
+    async def decodetracks(self, request: web.Request):
+
+        if not self.authorized(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+
+        await self.rest_delay()
+
+        tracks = await request.json()
+
+        return web.json_response([{"track": t, "info": decode_track(t)} for t in tracks])
+
+    async def websocket_handler(self, request: web.Request):
+
+        if not self.authorized(request):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+
+        ws = web.WebSocketResponse(heartbeat=60)
+        await ws.prepare(request)
+
+        self.sockets.add(ws)
+
+        try:
+            async for msg in ws:
+
+                if msg.type != WSMsgType.TEXT:
+                    continue
+
+                self.counters["ws_received"] += 1
+
+                await self.process_op(ws, json.loads(msg.data))
+        finally:
+            self.sockets.discard(ws)
+
+        return ws
+
+    async def send(self, ws: web.WebSocketResponse, data: dict):
+
+        if ws.closed:
+            return
+
+        self.counters["ws_sent"] += 1
+        await ws.send_str(json.dumps(data))
+
+    async def send_event(self, ws: web.WebSocketResponse, player: FakePlayerState, event_type: str, **kwargs):
+        self.counters["events"] += 1
+        await self.send(ws, {"op": "event", "type": event_type, "guildId": player.guild_id, **kwargs})
+
+    async def process_op(self, ws: web.WebSocketResponse, data: dict):
+
+        op = data.get("op")
+
+        if op == "configureResuming":
+            return
+
+        try:
+            guild_id = data["guildId"]
+        except KeyError:
+            return
+
+        try:
+            player = self.players[guild_id]
+        except KeyError:
+            player = self.players[guild_id] = FakePlayerState(guild_id)
+
+        if op == "voiceUpdate":
+            player.connected = True
+
+        elif op == "play":
+
+            if player.track and data.get("noReplace"):
+                return
+
+            old_track = player.track
+
+            if player.end_task:
+                player.end_task.cancel()
+
+            player.track = data["track"]
+            player.position = int(data.get("startTime") or 0)
+            player.started_at = time.time()
+            player.paused = bool(data.get("pause", False))
+
+            if old_track:
+                await self.send_event(ws, player, "TrackEndEvent", track=old_track, reason="REPLACED")
+
+            player.end_task = asyncio.create_task(self.track_lifecycle(ws, player, player.track))
+
+        elif op == "stop":
+
+            if player.end_task:
+                player.end_task.cancel()
+
+            if player.track:
+                track = player.track
+                player.track = None
+                await self.send_event(ws, player, "TrackEndEvent", track=track, reason="STOPPED")
+
+        elif op == "pause":
+            player.position = player.current_position
+            player.started_at = time.time()
+            player.paused = data.get("pause", False)
+
+        elif op == "seek":
+            player.position = int(data.get("position", 0))
+            player.started_at = time.time()
+
+        elif op == "volume":
+            player.volume = data.get("volume", 100)
+
+        elif op == "destroy":
+
+            if player.end_task:
+                player.end_task.cancel()
+
+            del self.players[guild_id]
+
+    async def track_lifecycle(self, ws: web.WebSocketResponse, player: FakePlayerState, track: str):
+
+        if self.event_delay:
+            await asyncio.sleep(self.event_delay)
+
+        await self.send_event(ws, player, "TrackStartEvent", track=track)
+
+        try:
+            duration = decode_track(track)["length"]
+        except Exception:
+            duration = self.track_duration
+
+        remaining = max(duration - player.position, 0) / 1000
+
+        await asyncio.sleep(remaining)
+
+        # considerar o tempo em que o player ficou pausado.
+        while player.paused or player.current_position < duration - 50:
+            await asyncio.sleep(0.5 if player.paused else max((duration - player.current_position) / 1000, 0.05))
+
+        if player.track != track:
+            return
+
+        player.track = None
+        player.end_task = None
+
+        await self.send_event(ws, player, "TrackEndEvent", track=track, reason="FINISHED")
+
+    async def player_update_loop(self):
+
+        while True:
+
+            await asyncio.sleep(self.update_interval)
+
+            now = int(time.time() * 1000)
+
+            for ws in list(self.sockets):
+                for player in list(self.players.values()):
+
+                    if not player.track:
+                        continue
+
+                    self.counters["player_updates"] += 1
+
+                    await self.send(
+                        ws,
+                        {
+                            "op": "playerUpdate",
+                            "guildId": player.guild_id,
+                            "state": {
+                                "time": now,
+                                "position": player.current_position,
+                                "connected": player.connected,
+                                "ping": 20
+                            }
+                        }
+                    )
+
+    def stats(self) -> dict:
+        return {
+            "op": "stats",
+            "players": len(self.players),
+            "playingPlayers": len([p for p in self.players.values() if p.track and not p.paused]),
+            "uptime": int((time.time() - self.started) * 1000),
+            "memory": {"free": 100000000, "used": 200000000, "allocated": 300000000, "reservable": 1000000000},
+            "cpu": {"cores": 4, "systemLoad": 0.1, "lavalinkLoad": 0.05},
+            "frameStats": {"sent": 3000, "nulled": 0, "deficit": 0},
+        }
+
+    async def stats_loop(self):
+
+        while True:
+
+            for ws in list(self.sockets):
+                await self.send(ws, self.stats())
+
+            await asyncio.sleep(self.stats_interval)
+
+
+async def serve(args):
+
+    server = FakeLavalink(
+        args.host, args.port, args.password, rest_latency=args.rest_latency, event_delay=args.event_delay,
+        update_interval=args.update_interval, stats_interval=args.stats_interval,
+        track_duration=args.track_duration * 1000, playlist_size=args.playlist_size
+    )
+
+    await server.start()
+
+    print(f"Lavalink falso iniciado em: {server.rest_uri} (senha: {server.password})")
+
+    try:
+        while True:
+            await asyncio.sleep(30)
+            print(f"[Lavalink falso] players: {len(server.players)} | {server.counters}")
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Servidor lavalink falso para testes de desempenho.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=2333)
+    parser.add_argument("--password", default="youshallnotpass")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="latência média das rotas REST (segundos).")
+    parser.add_argument("--event-delay", type=float, default=0.0, help="atraso do TrackStartEvent (segundos).")
+    parser.add_argument("--update-interval", type=float, default=5.0, help="intervalo do playerUpdate (segundos).")
+    parser.add_argument("--stats-interval", type=float, default=60.0)
+    parser.add_argument("--track-duration", type=int, default=180, help="duração das músicas (segundos).")
+    parser.add_argument("--playlist-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
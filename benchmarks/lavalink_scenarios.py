@@ -0,0 +1,458 @@
+"""Cenários de desempenho dos players usando o lavalink falso (benchmarks/fake_lavalink.py) e o discord falso
+(benchmarks/fake_discord.py), sem precisar de conexão externa.
+
+Cenários:
+    players  -> vários players tocando ao mesmo tempo (troca de músicas via process_next, playerUpdate e eventos).
+    queue    -> carregamento de playlists grandes pelo Node.get_tracks e operações usadas nos comandos de fila.
+    resume   -> retomada em massa de players salvos (PlayerSession.resume_players).
+
+Uso:
+    python -m benchmarks.lavalink_scenarios players --players 1000 --duration 60
+    python -m benchmarks.lavalink_scenarios queue --size 10000
+    python -m benchmarks.lavalink_scenarios resume --players 1000 --queue 50
+
+Os resultados mostram a taxa de processamento, as latências (p50/p95/p99), o atraso do event loop e a memória usada.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import psutil
+
+import wavelink
+from benchmarks.fake_discord import FakeBot
+from benchmarks.fake_lavalink import FakeLavalink
+from config_loader import DEFAULT_CONFIG
+from modules.player_resume import PlayerSession
+from utils.music.models import LavalinkPlayer, LavalinkTrack, LavalinkPlaylist
+from utils.others import queue_track_index
+from utils.watchdog import LoopWatchdog
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+
+def format_latency(values: List[float]) -> str:
+    return f"p50: {percentile(values, 50) * 1000:.2f}ms | p95: {percentile(values, 95) * 1000:.2f}ms | " \
+           f"p99: {percentile(values, 99) * 1000:.2f}ms ({len(values)} amostras)"
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+def playlist_url(size: int) -> str:
+    return f"https://www.youtube.com/playlist?list=PLbenchmark{size}&fake_size={size}"
+
+
+def copy_track(track: LavalinkTrack, requester: int = 0) -> LavalinkTrack:
+    info = {**track.info, "extra": {**track.info["extra"], "requester": requester or track.requester}}
+    return LavalinkTrack(id_=track.id, info=info, playlist=track.playlist)
+
+
+class BenchEnv:
+
+    def __init__(self, args):
+        self.args = args
+        self.server = FakeLavalink(
+            port=args.port, rest_latency=args.rest_latency, event_delay=args.event_delay,
+            update_interval=args.update_interval, stats_interval=args.stats_interval,
+            track_duration=args.track_duration * 1000
+        )
+        self.bot: Optional[FakeBot] = None
+        self.node: Optional[wavelink.Node] = None
+        self.watchdog = LoopWatchdog(threshold=0.1)
+
+    async def __aenter__(self) -> BenchEnv:
+
+        await self.server.start()
+
+        self.bot = FakeBot(dict(DEFAULT_CONFIG), discord_latency=self.args.discord_latency,
+                           gateway_latency=self.args.gateway_latency)
+
+        wavelink.Client(bot=self.bot)
+
+        self.node = await self.bot.music.initiate_node(**self.server.node_data(), auto_reconnect=False)
+
+        self.watchdog.start(asyncio.get_running_loop())
+
+        return self
+
+    async def __aexit__(self, *args):
+
+        for player in list(self.node.players.values()):
+            player.is_closing = True
+            try:
+                player.message_updater_task.cancel()
+            except AttributeError:
+                pass
+            try:
+                player.queue_updater_task.cancel()
+            except AttributeError:
+                pass
+
+        self.watchdog.task.cancel()
+
+        await self.bot.music.session.close()
+        await self.server.stop()
+
+    async def load_playlist(self, size: int) -> LavalinkPlaylist:
+        return await self.node.get_tracks(
+            playlist_url(size), track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, requester=self.bot.user.id
+        )
+
+    def print_summary(self, elapsed: float, rss_before: float):
+
+        bot = self.bot
+
+        print(f"Requisições no discord (falso): {sum(bot.http_stub.requests.values())} {bot.http_stub.requests}")
+        print(f"Eventos de voz do gateway (falso): {bot.gateway.events}")
+        print(f"Lavalink (falso): {self.server.counters} "
+              f"({self.server.counters['ws_sent'] / elapsed:.0f} msg/s enviadas para o bot)")
+        print(f"Atraso do event loop: máximo {self.watchdog.max_lag * 1000:.1f}ms | "
+              f"travamentos acima de {self.watchdog.threshold * 1000:.0f}ms: {self.watchdog.stalls}")
+        for d in self.watchdog.worst_offenders(3):
+            print(f"    {d['location']}: {d['count']}x | total: {d['total']:.2f}s | máx: {d['max']:.2f}s")
+        print(f"Memória (RSS): {rss_before:.1f}MB -> {rss_mb():.1f}MB")
+
+
+async def players_scenario(args):
+
+    async with BenchEnv(args) as env:
+
+        bot, node = env.bot, env.node
+
+        pending: Dict[int, float] = {}
+        start_latency: List[float] = []
+        counters = {"starts": 0, "ends": 0}
+
+        async def track_start(node, payload: wavelink.TrackStart):
+
+            player: LavalinkPlayer = payload.player
+
+            counters["starts"] += 1
+
+            try:
+                start_latency.append(time.perf_counter() - pending.pop(player.guild_id))
+            except KeyError:
+                pass
+
+            # mesma quantidade de requisições que o invoke_np faz no discord (envio e depois edições).
+            if player.message:
+                await player.message.edit(content=f"Tocando: {player.current.title}")
+            else:
+                player.message = await player.text_channel.send(f"Tocando: {player.current.title}")
+
+        async def track_end(node, payload: wavelink.TrackEnd):
+
+            player: LavalinkPlayer = payload.player
+
+            if player.locked or payload.reason != "FINISHED":
+                return
+
+            counters["ends"] += 1
+
+            # mesmo fluxo do Music.track_end (modules/music.py).
+            await player.track_end()
+            pending[player.guild_id] = time.perf_counter()
+            await player.process_next()
+
+        bot.add_listener(track_start, "on_wavelink_track_start")
+        bot.add_listener(track_end, "on_wavelink_track_end")
+
+        playlist = await env.load_playlist(args.queue)
+
+        rss_before = rss_mb()
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def create_player(n: int):
+
+            async with semaphore:
+
+                guild = bot.create_guild()
+
+                player: LavalinkPlayer = bot.music.get_player(
+                    guild.id, cls=LavalinkPlayer, node_id=node.identifier, guild=guild, channel=guild.text_channel,
+                    player_creator=n
+                )
+
+                player.loop = "queue"
+                player.queue.extend(copy_track(t, n) for t in playlist.tracks)
+
+                await player.connect(guild.voice_channel.id)
+
+                pending[guild.id] = time.perf_counter()
+                await player.process_next()
+
+        print(f"Criando {args.players} players com {args.queue} músicas na fila...")
+
+        t = time.perf_counter()
+
+        await asyncio.gather(*(create_player(n) for n in range(args.players)))
+
+        setup_time = time.perf_counter() - t
+
+        print(f"Players criados em {setup_time:.2f}s ({args.players / setup_time:.0f} players/s). "
+              f"Aguardando {args.duration}s...")
+
+        counters["starts"] = counters["ends"] = 0
+        env.server.counters.update({k: 0 for k in env.server.counters})
+        start_latency.clear()
+
+        t = time.perf_counter()
+
+        await asyncio.sleep(args.duration)
+
+        elapsed = time.perf_counter() - t
+
+        print("-" * 30)
+        print(f"Músicas iniciadas: {counters['starts']} ({counters['starts'] / elapsed:.1f}/s) | "
+              f"finalizadas: {counters['ends']}")
+        print(f"process_next -> TrackStartEvent: {format_latency(start_latency)}")
+        env.print_summary(elapsed, rss_before)
+        print(f"Memória por player: {(rss_mb() - rss_before) * 1024 / args.players:.1f}KB")
+
+
+async def queue_scenario(args):
+
+    async with BenchEnv(args) as env:
+
+        bot, node = env.bot, env.node
+
+        rss_before = rss_mb()
+
+        latencies = []
+
+        for _ in range(args.iterations):
+            t = time.perf_counter()
+            playlist = await env.load_playlist(args.size)
+            latencies.append(time.perf_counter() - t)
+
+        del playlist
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        playlist = await env.load_playlist(args.size)
+        track_memory = (tracemalloc.get_traced_memory()[0] - before) / args.size
+        tracemalloc.stop()
+
+        guild = bot.create_guild()
+
+        player: LavalinkPlayer = bot.music.get_player(
+            guild.id, cls=LavalinkPlayer, node_id=node.identifier, guild=guild, channel=guild.text_channel
+        )
+
+        # metade das músicas de cada usuário.
+        player.queue.extend(copy_track(t, n % 2 + 1) for n, t in enumerate(playlist.tracks))
+
+        inter = SimpleNamespace(guild_id=guild.id)
+        last_title = player.queue[-1].title
+
+        def remove_track():
+            track = player.queue[-1]
+            player.queue.remove(track)
+            player.queue.append(track)
+
+        def clear_user():
+            # mesmo processo usado no comando clear (remoção música por música).
+            queue = deque(player.queue)
+            for t in list(queue):
+                if t.requester == 1:
+                    queue.remove(t)
+
+        def save_info():
+            tracks = []
+            for t in player.queue:
+                t.info["id"] = t.id
+                tracks.append(t.info)
+            json.dumps(tracks)
+
+        operations = {
+            "shuffle": lambda: random.shuffle(player.queue),
+            "reverse": player.queue.reverse,
+            "rotate": lambda: player.queue.rotate(-(len(player.queue) // 2)),
+            "busca (queue_track_index)": lambda: queue_track_index(inter, bot, last_title),
+            "remove (última música)": remove_track,
+            "clear (músicas de um usuário)": clear_user,
+            "save_info (serialização)": save_info,
+        }
+
+        results = {}
+
+        for name, func in operations.items():
+            values = []
+            for _ in range(args.iterations):
+                t = time.perf_counter()
+                func()
+                values.append(time.perf_counter() - t)
+            results[name] = values
+
+        print("-" * 30)
+        print(f"Node.get_tracks ({args.size} músicas): {format_latency(latencies)} | "
+              f"{args.size / percentile(latencies, 50):.0f} músicas/s")
+        print(f"Memória por música (LavalinkTrack): {track_memory / 1024:.2f}KB "
+              f"({track_memory * args.size / 1024 / 1024:.1f}MB na playlist)")
+        print(f"Operações na fila com {len(player.queue)} músicas:")
+        for name, values in results.items():
+            print(f"    {name}: {format_latency(values)}")
+        print(f"Memória (RSS): {rss_before:.1f}MB -> {rss_mb():.1f}MB")
+
+
+def session_data(guild, playlist: LavalinkPlaylist, size: int) -> dict:
+
+    tracks = []
+
+    for t in playlist.tracks[:size]:
+        info = copy_track(t).info
+        info["id"] = t.id
+        info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
+        tracks.append(info)
+
+    # mesmo formato salvo pelo PlayerSession.save_info (modules/player_resume.py).
+    return {
+        "volume": "100",
+        "nightcore": False,
+        "position": str(random.randint(0, 60000)),
+        "voice_channel": str(guild.voice_channel.id),
+        "dj": [],
+        "player_creator": None,
+        "static": False,
+        "paused": False,
+        "text_channel": str(guild.text_channel.id),
+        "keep_connected": False,
+        "message": None,
+        "played": [],
+        "loop": False,
+        "stage_title_event": False,
+        "stage_title_template": None,
+        "skin": "default",
+        "skin_static": "default",
+        "uptime": int(time.time()),
+        "restrict_mode": False,
+        "mini_queue_enabled": False,
+        "tracks": tracks
+    }
+
+
+async def resume_scenario(args):
+
+    async with BenchEnv(args) as env:
+
+        bot = env.bot
+
+        playlist = await env.load_playlist(args.queue)
+
+        session_dir = f"./.player_sessions/{bot.user.id}"
+        os.makedirs(session_dir, exist_ok=True)
+
+        for _ in range(args.players):
+            guild = bot.create_guild()
+            with open(f"{session_dir}/{guild.id}.json", "w") as f:
+                json.dump(session_data(guild, playlist, args.queue), f)
+
+        del playlist
+
+        started: Dict[int, float] = {}
+
+        async def track_start(node, payload: wavelink.TrackStart):
+            started.setdefault(payload.player.guild_id, time.perf_counter() - t)
+
+        bot.add_listener(track_start, "on_wavelink_track_start")
+
+        rss_before = rss_mb()
+
+        print(f"Retomando {args.players} players com {args.queue} músicas na fila...")
+
+        t = time.perf_counter()
+
+        bot.player_resumed = False
+
+        # o cog também salva os dados do player a cada música iniciada (igual ao bot real).
+        cog = PlayerSession(bot)
+        bot.add_cog(cog)
+
+        await cog.resume_task
+
+        resume_time = time.perf_counter() - t
+
+        deadline = time.perf_counter() + args.timeout
+        while len(started) < args.players and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+
+        elapsed = time.perf_counter() - t
+
+        print("-" * 30)
+        print(f"resume_players finalizado em {resume_time:.2f}s ({args.players / resume_time:.0f} players/s)")
+        print(f"Players tocando: {len(started)}/{args.players}")
+        print(f"Tempo até a música iniciar (a partir do início da retomada): {format_latency(list(started.values()))}")
+        print(f"Operações na database (falsa): {bot.pool.local_database.operations}")
+        env.print_summary(elapsed, rss_before)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Cenários de desempenho com lavalink e discord falsos.")
+    parser.add_argument("--port", type=int, default=23330)
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="latência das rotas REST do lavalink (s).")
+    parser.add_argument("--event-delay", type=float, default=0.0, help="atraso do TrackStartEvent (s).")
+    parser.add_argument("--update-interval", type=float, default=1.0, help="intervalo do playerUpdate (s).")
+    parser.add_argument("--stats-interval", type=float, default=5.0)
+    parser.add_argument("--track-duration", type=int, default=10, help="duração das músicas (s).")
+    parser.add_argument("--discord-latency", type=float, default=0.0, help="latência das requisições do discord (s).")
+    parser.add_argument("--gateway-latency", type=float, default=0.0, help="atraso dos eventos de voz (s).")
+
+    subparsers = parser.add_subparsers(dest="scenario", required=True)
+
+    players = subparsers.add_parser("players")
+    players.add_argument("--players", type=int, default=1000)
+    players.add_argument("--queue", type=int, default=20)
+    players.add_argument("--concurrency", type=int, default=50)
+    players.add_argument("--duration", type=float, default=30.0)
+    players.set_defaults(func=players_scenario)
+
+    queue = subparsers.add_parser("queue")
+    queue.add_argument("--size", type=int, default=10000)
+    queue.add_argument("--iterations", type=int, default=5)
+    queue.set_defaults(func=queue_scenario)
+
+    resume = subparsers.add_parser("resume")
+    resume.add_argument("--players", type=int, default=1000)
+    resume.add_argument("--queue", type=int, default=50)
+    resume.add_argument("--timeout", type=float, default=60.0)
+    resume.set_defaults(func=resume_scenario)
+
+    args = parser.parse_args(argv)
+
+    if args.scenario != "resume":
+        asyncio.run(args.func(args))
+        return
+
+    # a retomada lê os arquivos da pasta .player_sessions do diretório atual.
+    cwd = os.getcwd()
+    tmp_dir = tempfile.mkdtemp(prefix="player_resume_bench_")
+    os.chdir(tmp_dir)
+
+    try:
+        asyncio.run(args.func(args))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
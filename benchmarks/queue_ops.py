@@ -0,0 +1,228 @@
+"""Comparação das operações em massa na fila (clear com filtros e move de várias músicas): loops originais dos
+comandos (remove/insert na deque para cada música) e as funções do utils.music.queue_ops (filtro único sobre os
+campos pré-calculados e reconstrução da fila).
+
+O resultado do clear das duas versões é comparado para cada cenário. Também são medidos o shuffle (random.shuffle
+direto na deque x shuffle_queue), o smart shuffle (com a maior sequência de músicas seguidas do mesmo membro) e os
+reverse/rotate da deque.
+
+Uso:
+    python -m benchmarks.queue_ops --tracks 10000
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from collections import deque
+from typing import Callable, List, NamedTuple
+
+from utils.music.queue_ops import TrackQueue, compile_filter, filter_indexes, remove_indexes, move_indexes, \
+    shuffle_queue
+
+
+class FakeTrack(NamedTuple):
+    title: str
+    author: str
+    requester: int
+    playlist_name: str
+    duration: int
+
+
+WORDS = ["love", "night", "dance", "remix", "live", "feat", "official", "video", "lyrics", "summer", "heart", "fire",
+         "dream", "rain", "acoustic", "version", "mix", "party", "song", "blue"]
+
+
+def build_tracks(amount: int) -> List[FakeTrack]:
+
+    random.seed(0)
+
+    playlists = [f"Playlist {n}" for n in range(20)] + [""] * 5
+
+    return [
+        FakeTrack(
+            title=" ".join(random.choices(WORDS, k=4)).title(),
+            author=f"Artist {random.randint(0, 300)}",
+            requester=random.randint(1, 30),
+            playlist_name=random.choice(playlists),
+            duration=random.randint(60, 600) * 1000,
+        ) for _ in range(amount)
+    ]
+
+
+def legacy_clear(queue: deque, song_name=None, song_author=None, user=None, playlist=None, min_duration=None,
+                 max_duration=None, voice_members=None) -> int:
+    """Cópia do loop usado anteriormente no comando clear."""
+
+    filters = []
+
+    if song_name:
+        filters.append('song_name')
+    if song_author:
+        filters.append('song_author')
+    if user:
+        filters.append('user')
+    if playlist:
+        filters.append('playlist')
+    if min_duration:
+        filters.append('time_below')
+    if max_duration:
+        filters.append('time_above')
+    if voice_members is not None:
+        filters.append('absent_members')
+
+    deleted_tracks = 0
+
+    for t in list(queue):
+
+        temp_filter = list(filters)
+
+        if 'time_below' in temp_filter and t.duration <= min_duration:
+            temp_filter.remove('time_below')
+
+        elif 'time_above' in temp_filter and t.duration >= max_duration:
+            temp_filter.remove('time_above')
+
+        if 'song_name' in temp_filter and song_name.lower() in t.title.lower():
+            temp_filter.remove('song_name')
+
+        if 'song_author' in temp_filter and song_author.lower() in t.author.lower():
+            temp_filter.remove('song_author')
+
+        if 'user' in temp_filter and user == t.requester:
+            temp_filter.remove('user')
+
+        elif 'absent_members' in temp_filter and t.requester not in voice_members:
+            temp_filter.remove('absent_members')
+
+        if 'playlist' in temp_filter and playlist == t.playlist_name:
+            temp_filter.remove('playlist')
+
+        if not temp_filter:
+            queue.remove(t)
+            deleted_tracks += 1
+
+    return deleted_tracks
+
+
+def legacy_move(queue: deque, indexes: List[int], position: int):
+    """Cópia do loop usado anteriormente no comando move."""
+
+    tracks = [(i, queue[i]) for i in indexes]
+
+    for index, track in reversed(tracks):
+        queue.remove(track)
+        queue.insert(position - 1, track)
+
+
+def longest_run(tracks, key: Callable) -> int:
+    """Maior sequência de músicas seguidas com o mesmo valor (ex: do mesmo membro)."""
+
+    best = run = 0
+    last = object()
+
+    for t in tracks:
+        value = key(t)
+        run = run + 1 if value == last else 1
+        last = value
+        best = max(best, run)
+
+    return best
+
+
+def timeit(func: Callable, rounds: int) -> float:
+
+    total = 0
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+
+    return total / rounds
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Operações em massa na fila: loops originais x queue_ops.")
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    tracks = build_tracks(args.tracks)
+
+    scenarios = {
+        "nome": {"song_name": "remix"},
+        "autor + duração mínima": {"song_author": "artist 1", "min_duration": 300000},
+        "usuário": {"user": 7},
+        "playlist + duração máxima": {"playlist": "Playlist 3", "max_duration": 200000},
+        "membros ausentes": {"voice_members": set(range(1, 16))},
+    }
+
+    print(f"Fila com {len(tracks)} músicas | média de {args.rounds} execuções\n{'-' * 30}")
+
+    mismatches = 0
+
+    for name, filters in scenarios.items():
+
+        legacy_queue = deque(tracks)
+        legacy_queue_time = timeit(lambda: legacy_clear(deque(tracks), **filters), args.rounds)
+        legacy_clear(legacy_queue, **filters)
+
+        def engine_clear():
+            queue = TrackQueue(tracks)
+            predicate = compile_filter(
+                song_name=filters.get("song_name"), song_author=filters.get("song_author"),
+                user_id=filters.get("user"), playlist=filters.get("playlist"),
+                min_duration=filters.get("min_duration"), max_duration=filters.get("max_duration"),
+                voice_members=filters.get("voice_members")
+            )
+            remove_indexes(queue, filter_indexes(queue, predicate))
+            return queue
+
+        engine_time = timeit(engine_clear, args.rounds)
+
+        if list(engine_clear()) != list(legacy_queue):
+            mismatches += 1
+
+        print(f"clear ({name}): {len(tracks) - len(legacy_queue)} removidas | loop original: "
+              f"{legacy_queue_time * 1000:.1f}ms | queue_ops: {engine_time * 1000:.1f}ms "
+              f"({legacy_queue_time / engine_time:.0f}x)")
+
+    # move de várias músicas (ex: todas com o mesmo nome) para o início da fila.
+    indexes = [i for i, t in enumerate(tracks) if "remix" in t.title.lower() and "live" in t.title.lower()]
+
+    legacy_time = timeit(lambda: legacy_move(deque(tracks), indexes, 1), args.rounds)
+    engine_time = timeit(lambda: move_indexes(TrackQueue(tracks), indexes, 1), args.rounds)
+
+    print(f"move ({len(indexes)} músicas): loop original: {legacy_time * 1000:.1f}ms | queue_ops: "
+          f"{engine_time * 1000:.1f}ms ({legacy_time / engine_time:.0f}x)\n"
+          f"Resultados diferentes no clear: {mismatches}\n{'-' * 30}")
+
+    # fila típica de servidor movimentado: um membro com uma playlist grande e outros com poucas músicas.
+    queue_tracks = [t._replace(requester=1) for t in tracks[:len(tracks) // 2]] + tracks[len(tracks) // 2:]
+
+    legacy_time = timeit(lambda: random.shuffle(TrackQueue(queue_tracks)), args.rounds)
+    engine_time = timeit(lambda: shuffle_queue(TrackQueue(queue_tracks)), args.rounds)
+    smart_time = timeit(lambda: shuffle_queue(TrackQueue(queue_tracks), smart=True), args.rounds)
+
+    shuffled = TrackQueue(queue_tracks)
+    shuffle_queue(shuffled)
+    smart = TrackQueue(queue_tracks)
+    shuffle_queue(smart, smart=True)
+
+    print(f"shuffle: random.shuffle na deque: {legacy_time * 1000:.1f}ms | shuffle_queue: {engine_time * 1000:.1f}ms "
+          f"({legacy_time / engine_time:.0f}x) | smart: {smart_time * 1000:.1f}ms\n"
+          f"Maior sequência do mesmo membro: shuffle: {longest_run(shuffled, lambda t: t.requester)} | "
+          f"smart: {longest_run(smart, lambda t: t.requester)}\n"
+          f"Maior sequência do mesmo artista: shuffle: {longest_run(shuffled, lambda t: t.author)} | "
+          f"smart: {longest_run(smart, lambda t: t.author)}")
+
+    queue = TrackQueue(queue_tracks)
+    reverse_time = timeit(queue.reverse, args.rounds)
+    rotate_time = timeit(lambda: queue.rotate(-(len(queue) // 2)), args.rounds)
+
+    print(f"reverse: {reverse_time * 1000:.2f}ms | rotate (metade da fila): {rotate_time * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Teste de carga do servidor de rpc (web_app.py).
+
+Simula milhares de clientes de rpc conectados e um bot enviando atualizações em lote (snapshot + deltas),
+medindo a taxa de entrega e a latência das mensagens.
+
+Uso:
+    python -m benchmarks.rpc_relay_load --spawn-server --clients 2000 --updates 100
+
+Nota: para muitos clientes pode ser necessário aumentar o limite de arquivos abertos (ulimit -n).
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+import aiohttp
+
+
+class RelayStats:
+
+    def __init__(self):
+        self.received = 0
+        self.closed = 0
+        self.latencies: List[float] = []
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0
+        values = sorted(self.latencies)
+        return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+
+async def user_client(session: aiohttp.ClientSession, url: str, user_id: int, stats: RelayStats,
+                      ready: asyncio.Event, connected: List[int], total: int):
+
+    try:
+        ws = await session.ws_connect(url, heartbeat=30)
+    except Exception as e:
+        print(f"Falha ao conectar o usuário {user_id}: {repr(e)}")
+        stats.closed += 1
+        return
+
+    await ws.send_json({"user_ids": [user_id]})
+
+    connected[0] += 1
+    if connected[0] + stats.closed >= total:
+        ready.set()
+
+    async for msg in ws:
+
+        if msg.type != aiohttp.WSMsgType.TEXT:
+            break
+
+        data = json.loads(msg.data)
+
+        stats.received += 1
+
+        try:
+            stats.latencies.append(time.perf_counter() - data["ts"])
+        except KeyError:
+            pass
+
+    stats.closed += 1
+
+
+async def bot_client(session: aiohttp.ClientSession, url: str, bot_id: int, users: List[int], updates: int,
+                     batch: int, interval: float):
+
+    ws = await session.ws_connect(url, heartbeat=30)
+
+    await ws.send_json({"user_ids": [bot_id], "bot": True})
+
+    batches = [users[i:i + batch] for i in range(0, len(users), batch)]
+
+    session_id = os.urandom(6).hex()
+
+    # snapshot inicial para todos os usuários.
+    for n, b in enumerate(batches):
+        await ws.send_json(
+            {
+                "op": "update",
+                "bot_id": bot_id,
+                "bot_name": "Load Test#0000",
+                "thumb": "",
+                "session": session_id,
+                "ts": time.perf_counter(),
+                "track": {
+                    "source": "youtube",
+                    "title": f"Track {n}",
+                    "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                    "author": "Load Test",
+                    "duration": 212000,
+                    "stream": False,
+                    "position": 0,
+                    "paused": False,
+                    "loop": False,
+                    "queue": 10,
+                },
+                "info": {
+                    "channel": {"name": "load-test", "id": n},
+                    "guild": {"name": "Load Test", "id": n},
+                    "members": len(b),
+                },
+                "users": b,
+            }
+        )
+
+    sent = len(batches)
+
+    for n in range(updates):
+
+        for b in batches:
+            await ws.send_json(
+                {
+                    "op": "delta",
+                    "bot_id": bot_id,
+                    "session": session_id,
+                    "users": b,
+                    "set": {"ts": time.perf_counter()},
+                    "patch": {"track": {"position": n * 1000}},
+                }
+            )
+            sent += 1
+
+        if interval:
+            await asyncio.sleep(interval)
+
+    await ws.close()
+
+    return sent
+
+
+async def run(args):
+
+    stats = RelayStats()
+
+    connector = aiohttp.TCPConnector(limit=0)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        ready = asyncio.Event()
+        connected = [0]
+
+        users = list(range(100000, 100000 + args.clients))
+
+        print(f"Conectando {args.clients} clientes em {args.url}...")
+
+        t = time.perf_counter()
+
+        client_tasks = [
+            asyncio.create_task(user_client(session, args.url, u, stats, ready, connected, args.clients))
+            for u in users
+        ]
+
+        await ready.wait()
+
+        print(f"{connected[0]} clientes conectados em {time.perf_counter() - t:.2f}s")
+
+        await asyncio.sleep(1)
+
+        t = time.perf_counter()
+
+        sent = await bot_client(session, args.url, 1, users, args.updates, args.batch, args.interval)
+
+        expected = (args.updates + 1) * connected[0]
+
+        # aguardar as mensagens restantes serem entregues.
+        deadline = time.perf_counter() + args.timeout
+        while stats.received < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+
+        elapsed = time.perf_counter() - t
+
+        for task in client_tasks:
+            task.cancel()
+
+    print("-" * 30)
+    print(f"Payloads enviados pelo bot: {sent}")
+    print(f"Mensagens entregues: {stats.received}/{expected} ({stats.received / elapsed:.0f} msg/s)")
+    print(f"Clientes desconectados pelo servidor: {stats.closed}")
+    print(f"Latência p50: {stats.percentile(50) * 1000:.2f}ms | p95: {stats.percentile(95) * 1000:.2f}ms | "
+          f"p99: {stats.percentile(99) * 1000:.2f}ms")
+
+
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de rpc.")
+    parser.add_argument("--url", default="ws://localhost:8080/ws")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=200, help="quantidade de usuários por payload.")
+    parser.add_argument("--interval", type=float, default=0.0, help="intervalo entre cada rodada de atualizações.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--spawn-server", action="store_true", help="iniciar uma instância local do web_app.py.")
+    args = parser.parse_args(argv)
+
+    server = None
+
+    if args.spawn_server:
+        port = args.url.split(":")[-1].split("/")[0]
+        server = subprocess.Popen([sys.executable, "web_app.py"], env={**os.environ, "PORT": port})
+        time.sleep(2)
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Comparação da taxa de mensagens de websocket com asyncio/uvloop e json/orjson (PERFORMANCE_MODE).
+
+Um servidor aiohttp local envia payloads no formato do lavalink (playerUpdate, stats e eventos) e o cliente
+recebe e decodifica cada mensagem da mesma forma que o wavelink, medindo mensagens por segundo e o uso de cpu.
+
+Uso:
+    python -m benchmarks.ws_throughput --messages 200000 --connections 4
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Callable, List, Tuple
+
+import aiohttp
+import psutil
+from aiohttp import web
+
+
+def build_payloads(amount: int = 1000) -> List[str]:
+
+    payloads = []
+
+    for n in range(amount):
+
+        guild_id = str(random.randint(10 ** 17, 10 ** 18))
+
+        if n % 20 == 0:
+            payloads.append(json.dumps({
+                "op": "stats", "players": 1000, "playingPlayers": 900, "uptime": n * 1000,
+                "memory": {"free": 1, "used": 2, "allocated": 3, "reservable": 4},
+                "cpu": {"cores": 4, "systemLoad": 0.5, "lavalinkLoad": 0.2},
+                "frameStats": {"sent": 3000, "nulled": 0, "deficit": 0},
+            }))
+        elif n % 10 == 0:
+            payloads.append(json.dumps({
+                "op": "event", "type": "TrackEndEvent", "guildId": guild_id, "reason": "FINISHED",
+                "track": "QAAAjQIAJVJpY2sgQXN0bGV5IC0gTmV2ZXIgR29ubmEgR2l2ZSBZb3UgVXAADlJpY2tBc3RsZXlWRVZPAAAAAAADPCAAC2RRdzR3OVdnWGNRAAEAK2h0dHBzOi8vd3d3LnlvdXR1YmUuY29tL3dhdGNoP3Y9ZFF3NHc5V2dYY1EAB3lvdXR1YmUAAAAAAAAAAA==",
+            }))
+        else:
+            payloads.append(json.dumps({
+                "op": "playerUpdate", "guildId": guild_id,
+                "state": {"time": int(time.time() * 1000), "position": n * 1000, "connected": True, "ping": 20},
+            }))
+
+    return payloads
+
+
+async def run_case(messages: int, connections: int, loads: Callable, port: int) -> Tuple[float, float]:
+
+    payloads = build_payloads()
+    per_connection = messages // connections
+
+    async def websocket_handler(request: web.Request):
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        for n in range(per_connection):
+            await ws.send_str(payloads[n % len(payloads)])
+
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", websocket_handler)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    async def client(session: aiohttp.ClientSession):
+
+        received = 0
+
+        async with session.ws_connect(f"ws://127.0.0.1:{port}/", max_msg_size=0) as ws:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                data = msg.json(loads=loads)
+                if data.get("op"):
+                    received += 1
+
+        return received
+
+    process = psutil.Process()
+    cpu_start = process.cpu_times()
+    start = time.perf_counter()
+
+    async with aiohttp.ClientSession() as session:
+        received = sum(await asyncio.gather(*(client(session) for _ in range(connections))))
+
+    elapsed = time.perf_counter() - start
+    cpu_end = process.cpu_times()
+
+    await runner.cleanup()
+
+    cpu = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+
+    return received / elapsed, cpu / elapsed * 100
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Taxa de mensagens de websocket: asyncio/uvloop e json/orjson.")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--port", type=int, default=23340)
+    args = parser.parse_args(argv)
+
+    loops = [("asyncio", asyncio.DefaultEventLoopPolicy)]
+
+    try:
+        import uvloop
+        loops.append(("uvloop", uvloop.EventLoopPolicy))
+    except ImportError:
+        print("uvloop não instalado, apenas o asyncio será testado.")
+
+    backends = [("json", json.loads)]
+
+    try:
+        import orjson
+        backends.append(("orjson", orjson.loads))
+    except ImportError:
+        print("orjson não instalado, apenas o json será testado.")
+
+    print(f"{args.messages} mensagens | {args.connections} conexões\n{'-' * 30}")
+
+    for loop_name, policy in loops:
+        for json_name, loads in backends:
+            asyncio.set_event_loop_policy(policy())
+            rate, cpu = asyncio.run(run_case(args.messages, args.connections, loads, args.port))
+            print(f"{loop_name} + {json_name}: {rate:,.0f} mensagens/s | cpu: {cpu:.0f}%")
+
+    asyncio.set_event_loop_policy(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Comparação da busca de extractor do yt-dlp: loop sobre todos os extractors (compilando o _VALID_URL a cada url)
+e a tabela pré-compilada agrupada por domínio (ExtractorTable).
+
+As urls usadas são as dos testes dos próprios extractors (_TESTS) e algumas urls sem extractor correspondente, e
+o resultado das duas buscas é comparado para cada url.
+
+Uso:
+    python -m benchmarks.ytdl_dispatch --urls 2000
+"""
+from __future__ import annotations
+import argparse
+import random
+import re
+import time
+from typing import List, Optional
+
+import yt_dlp
+
+from utils.music.ytdl_tools import ExtractorTable, exclude_extractors
+
+
+def naive_match(extractors: list, url: str) -> Optional[str]:
+
+    for e in extractors:
+
+        if not e._VALID_URL:
+            continue
+
+        for pattern in (e._VALID_URL if isinstance(e._VALID_URL, (list, tuple)) else [e._VALID_URL]):
+
+            if not (matches := re.compile(pattern).match(url)):
+                continue
+
+            if not matches.groups():
+                continue
+
+            if any(ee in type(e).__name__.lower() for ee in exclude_extractors):
+                break
+
+            return e.ie_key()
+
+
+def build_corpus(extractors: list, amount: int) -> List[str]:
+
+    urls = set()
+
+    for e in extractors:
+        try:
+            for test in e.get_testcases(include_onlymatching=True):
+                if isinstance(url := test.get("url"), str):
+                    urls.add(url)
+        except Exception:
+            continue
+
+    urls = sorted(urls)
+
+    # urls sem extractor (ex: links de sites comuns enviados no canal de song-request).
+    urls.extend(f"https://example{n}.com/pagina/{n}?q=musica" for n in range(len(urls) // 20 + 1))
+
+    random.seed(0)
+    random.shuffle(urls)
+
+    return urls[:amount]
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Busca de extractor do yt-dlp: loop simples x tabela pré-compilada.")
+    parser.add_argument("--urls", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    extractors = yt_dlp.list_extractors()
+    corpus = build_corpus(extractors, args.urls)
+
+    start = time.perf_counter()
+    table = ExtractorTable(extractors)
+    build_time = time.perf_counter() - start
+
+    generic = len(table.generic)
+    indexed = sum(len(b) for b in table.buckets.values())
+
+    print(f"yt-dlp {yt_dlp.version.__version__} | {len(extractors)} extractors | {len(corpus)} urls\n"
+          f"Tabela: {len(table.buckets)} domínios, {indexed} padrões indexados, {generic} genéricos "
+          f"(criada em {build_time * 1000:.0f}ms)\n{'-' * 30}")
+
+    # o cache interno do módulo re (limitado) não comporta todos os padrões, igual ao uso real no bot.
+    start = time.perf_counter()
+    naive = [naive_match(extractors, url) for url in corpus]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [e.ie_key if (e := table.match(url)) else None for url in corpus]
+    table_time = time.perf_counter() - start
+
+    mismatches = [(url, a, b) for url, a, b in zip(corpus, naive, indexed) if a != b]
+
+    print(f"Loop simples: {naive_time / len(corpus) * 1000:.3f}ms por url\n"
+          f"Tabela: {table_time / len(corpus) * 1000:.3f}ms por url ({naive_time / table_time:.0f}x)\n"
+          f"Resultados diferentes: {len(mismatches)}")
+
+    for url, a, b in mismatches[:20]:
+        print(f"    {url}: {a} != {b}")
+
+
+if __name__ == "__main__":
+    main()
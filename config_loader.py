@@ -13,6 +13,7 @@ DEFAULT_CONFIG = {
     "AUTO_SYNC_COMMANDS": True,
     "OWNER_IDS": "",
     "COMMAND_LOG": False,
+    "COMMAND_TRACING": False,
     "EMBED_COLOR": None,
     "BOT_ADD_REMOVE_LOG": '',
     "ERROR_REPORT_WEBHOOK": '',
@@ -29,6 +30,8 @@ DEFAULT_CONFIG = {
     "GLOBAL_PREFIX": True,
     "KILL_ON_429": True,
     "PREFIXED_POOL_TIMEOUT": 4,
+    "POOL_WORKERS": 0,
+    "POOL_IPC_PORT": 8095,
 
     ################
     ### Database ###
@@ -48,6 +51,16 @@ DEFAULT_CONFIG = {
     "IDLE_TIMEOUT": 180,
     "RUN_RPC_SERVER": True,
     "RPC_SERVER": "ws://localhost:$PORT/ws",
+    "RPC_UPDATE_INTERVAL": 2,
+    "VOICE_UPDATE_DELAY": 2,
+    "WATCHDOG_THRESHOLD_MS": 250,
+    "DIAGNOSTICS_TOKEN": "",
+    "PERFORMANCE_MODE": False,
+    "EXECUTOR_WORKERS": 0,
+    "PLAY_HISTORY_SIZE": 20000,
+    "PLAY_HISTORY_SAVE_INTERVAL": 300,
+    "MAX_QUEUE_SIZE": 10000,
+    "MAX_USER_QUEUE_SIZE": 0,
     "MAX_USER_FAVS": 10,
     "USER_FAV_MAX_NAME_LENGTH": 35,
     "USER_FAV_MAX_URL_LENGTH": 90,
@@ -58,6 +71,7 @@ DEFAULT_CONFIG = {
     "GUILD_DEAFEN_WARN": True,
     "ADD_REGISTER_COMMAND": False,
     "ENABLE_DISCORD_URLS_PLAYBACK": True,
+    "YTDL_PROCESSES": 0,
     "PLAYER_INFO_BACKUP_INTERVAL": 45,
     "PLAYER_SESSIONS_MONGODB": False,
 
@@ -157,7 +171,18 @@ def load_config():
         "INVITE_PERMISSIONS",
         "MONGO_CACHE_CLEANUP_INTERVAL",
         "PREFIXED_POOL_TIMEOUT",
-        "PLAYER_INFO_BACKUP_INTERVAL"
+        "POOL_WORKERS",
+        "POOL_IPC_PORT",
+        "PLAYER_INFO_BACKUP_INTERVAL",
+        "RPC_UPDATE_INTERVAL",
+        "VOICE_UPDATE_DELAY",
+        "WATCHDOG_THRESHOLD_MS",
+        "EXECUTOR_WORKERS",
+        "PLAY_HISTORY_SIZE",
+        "PLAY_HISTORY_SAVE_INTERVAL",
+        "MAX_QUEUE_SIZE",
+        "MAX_USER_QUEUE_SIZE",
+        "YTDL_PROCESSES",
     ]:
         try:
             CONFIG[i] = int(CONFIG[i])
@@ -171,6 +196,8 @@ def load_config():
         "INTERACTION_COMMAND_ONLY",
         "RUN_LOCAL_LAVALINK",
         "COMMAND_LOG",
+        "COMMAND_TRACING",
+        "PERFORMANCE_MODE",
         "RUN_RPC_SERVER",
         "AUTO_DOWNLOAD_LAVALINK_SERVERLIST",
         "ENABLE_LOGGER",
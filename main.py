@@ -1,8 +1,11 @@
 from utils.client import BotPool
 import gc
 
-gc.collect()
+# o main.py também é importado (como __mp_main__) pelos processos do pool de extração do yt-dlp (spawn).
+if __name__ == "__main__":
 
-pool = BotPool()
+    gc.collect()
 
-pool.setup()
+    pool = BotPool()
+
+    pool.setup()
@@ -495,6 +495,70 @@ class Owner(commands.Cog):
         else:
             return txt
 
+    @commands.is_owner()
+    @panel_command(aliases=["lag", "loopstats"], description="Ver os travamentos do event loop e seus causadores.",
+                   emoji="🐢", alt_name="Travamentos do event loop")
+    async def watchdog(self, ctx: Union[CustomContext, disnake.MessageInteraction], amount: int = 10):
+
+        watchdog = self.bot.pool.watchdog
+
+        if not watchdog:
+            raise GenericError("**O watchdog do event loop não foi iniciado.**")
+
+        stats = watchdog.stats(amount or 10)
+
+        txt = "🐢 **| Event loop:**\n" \
+              f"Atraso atual: `{stats['lag'] * 1000:.1f}ms` | Maior atraso: `{stats['max_lag'] * 1000:.1f}ms`\n" \
+              f"Travamentos (acima de {stats['threshold'] * 1000:.0f}ms): `{stats['stalls']}`\n\n"
+
+        if stats["offenders"]:
+            txt += "**Maiores causadores:**\n" + "\n".join(
+                f"`{d['location']}`\n> `{d['count']}x | total: {d['total']:.2f}s | máx: {d['max']:.2f}s` <t:{d['last']}:R>"
+                for d in stats["offenders"]
+            )
+        else:
+            txt += "**Nenhum travamento registrado até o momento.**"
+
+        txt = txt[:4096]
+
+        if isinstance(ctx, CustomContext):
+
+            embed = disnake.Embed(
+                description=txt,
+                color=self.bot.get_color(ctx.guild.me)
+            )
+
+            await ctx.send(embed=embed, view=self.owner_view)
+
+        else:
+            return txt
+
+    @commands.is_owner()
+    @commands.command(hidden=True, aliases=["traces", "cmdtraces"],
+                      description="Ver o tempo gasto nos comandos e as execuções mais lentas.")
+    async def cmdtrace(self, ctx: CustomContext, amount: int = 10):
+
+        if not self.bot.pool.tracer:
+            raise GenericError("**O rastreamento de comandos está desativado.**\n"
+                               "`Ative usando a configuração: COMMAND_TRACING=true`")
+
+        stats = self.bot.pool.tracer.stats()
+
+        if not stats:
+            raise GenericError("**Nenhum comando foi rastreado até o momento.**")
+
+        txt = "\n".join(f"`{d['command']}` **({d['samples']}x)**\n> `p50: {d['p50'] * 1000:.0f}ms | "
+                        f"p95: {d['p95'] * 1000:.0f}ms | p99: {d['p99'] * 1000:.0f}ms`" for d in stats[:amount or 10])
+
+        await ctx.send(
+            embed=disnake.Embed(
+                title="Tempo dos comandos:",
+                description=txt[:4096],
+                color=self.bot.get_color(ctx.guild.me)
+            ),
+            file=string_to_file(self.bot.pool.tracer.dump(amount or 10), filename="command_traces.txt")
+        )
+
     @commands.has_guild_permissions(manage_guild=True)
     @commands.command(description="Sincronizar/Registrar os comandos de barra no servidor.", hidden=True)
     async def syncguild(self, ctx: Union[CustomContext, disnake.MessageInteraction]):
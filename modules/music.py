@@ -9,12 +9,15 @@ from random import shuffle
 import aiofiles
 import aiohttp
 import disnake
+import humanize
 from aiohttp import ClientConnectorCertificateError
 from disnake.ext import commands
 import wavelink
 
 from utils.client import BotCore
 from utils.db import DBModel
+from utils.metrics import rest_latency, rest_failures
+from utils.tracing import traced
 from utils.music.errors import GenericError, MissingVoicePerms, NoVoice, PoolException
 from utils.music.spotify import process_spotify
 from utils.music.checks import check_voice, has_player, has_source, is_requester, is_dj, \
@@ -22,8 +25,10 @@ from utils.music.checks import check_voice, has_player, has_source, is_requester
     check_channel_limit, check_stage_topic
 from utils.music.models import LavalinkPlayer, LavalinkTrack, LavalinkPlaylist
 from utils.music.converters import time_format, fix_characters, string_to_seconds, URL_REG, \
-    YOUTUBE_VIDEO_REG, google_search, percentage
+    YOUTUBE_VIDEO_REG, percentage
 from utils.music.interactions import VolumeInteraction, QueueInteraction, SelectInteraction
+from utils.music.queue_ops import compile_filter, filter_indexes, remove_indexes, move_indexes, shuffle_queue
+from utils.music.memory import top_players
 from utils.others import check_cmd, send_idle_embed, CustomContext, PlayerControls, fav_list, queue_track_index, \
     pool_command
 from user_agent import generate_user_agent
@@ -224,6 +229,33 @@ class Music(commands.Cog):
 
         await ctx.send("O arquivo de cache foi importado com sucesso!", delete_after=30)
 
+    @commands.is_owner()
+    @commands.command(hidden=True, aliases=["mem"])
+    async def memory(self, ctx: CustomContext, amount: int = 10):
+
+        results = top_players(self.bot.pool.bots, amount=min(amount, 25))
+
+        if not results:
+            raise GenericError("**Não há players ativos...**")
+
+        txt = []
+
+        for n, (player, usage) in enumerate(results, start=1):
+            txt.append(
+                f"`{n}.` **{fix_characters(player.guild.name, 25)}** `[{player.guild.id}]` ({player.bot.user.mention})\n"
+                f"`Total: {humanize.naturalsize(sum(usage.values()))} | Fila: {len(player.queue)} músicas "
+                f"({humanize.naturalsize(usage['queue'])}) | Tocadas: {humanize.naturalsize(usage['played'])} | "
+                f"Embeds: {humanize.naturalsize(usage['embeds'])} | RPC: {humanize.naturalsize(usage['rpc'])}`"
+            )
+
+        embed = disnake.Embed(
+            title="Players usando mais memória (estimativa)",
+            description="\n\n".join(txt)[:4096],
+            color=self.bot.get_color(ctx.guild.me)
+        )
+
+        await ctx.send(embed=embed)
+
     stage_cd = commands.CooldownMapping.from_cooldown(2, 45, commands.BucketType.guild)
     stage_mc = commands.MaxConcurrency(1, per=commands.BucketType.guild, wait=False)
 
@@ -404,7 +436,7 @@ class Music(commands.Cog):
         except AttributeError:
             return [current[:99]]
 
-        return await google_search(bot, current)
+        return await bot.pool.suggestions.search(bot, current, inter.author.id)
 
     @is_dj()
     @has_player()
@@ -948,7 +980,7 @@ class Music(commands.Cog):
         if not inter.response.is_done():
             await inter.response.defer(ephemeral=ephemeral)
 
-        tracks, node = await self.get_tracks(query, inter.user, node=node, track_loops=repeat_amount)
+        tracks, node = await self.get_tracks(query, inter.user, node=node, track_loops=repeat_amount, stream=True)
 
         try:
             player = bot.music.players[inter.guild_id]
@@ -1058,6 +1090,11 @@ class Music(commands.Cog):
 
         position -= 1
 
+        queue_space = player.queue_space(inter.author.id)
+
+        if queue_space == 0:
+            raise GenericError("**A fila atingiu o limite de músicas permitido (para o servidor ou para você).**")
+
         if isinstance(tracks, list):
 
             if manual_selection and len(tracks) > 1:
@@ -1129,7 +1166,7 @@ class Music(commands.Cog):
             if force_play == "yes":
                 player.queue.insert(0, track)
             elif position < 0:
-                player.queue.append(track)
+                player.add_tracks([track])
             else:
                 player.queue.insert(position, track)
                 pos_txt = f" na posição {position + 1} da fila"
@@ -1148,15 +1185,28 @@ class Music(commands.Cog):
 
         else:
 
+            # as opções de playlist e a posição precisam da playlist completa.
+            if options or position >= 0:
+                await tracks.fill()
+
             if options == "shuffle":
                 shuffle(tracks.tracks)
 
+            if queue_space is None or queue_space >= tracks.total:
+                limit_txt = ""
+            elif queue_space < len(tracks.tracks):
+                tracks.truncate(queue_space)
+                limit_txt = f"\n`Limite de músicas na fila atingido: apenas {queue_space} música(s) adicionada(s).`"
+            else:
+                # playlist ainda carregando: o limite é aplicado no playlist_stream_task.
+                limit_txt = f"\n`Limite de músicas na fila: no máximo {queue_space} música(s) da playlist serão " \
+                            f"adicionada(s).`"
+
             if position < 0 or len(tracks.tracks) < 2:
 
                 if options == "reversed":
                     tracks.tracks.reverse()
-                for track in tracks.tracks:
-                    player.queue.append(track)
+                player.add_tracks(tracks.tracks)
             else:
                 if options != "reversed":
                     tracks.tracks.reverse()
@@ -1165,13 +1215,14 @@ class Music(commands.Cog):
 
                 pos_txt = f" (Pos. {position + 1})"
 
-            log_text = f"{inter.author.mention} adicionou a playlist [`{fix_characters(tracks.name, 20)}`]({tracks.url}){pos_txt} `({len(tracks.tracks)})`."
-
-            total_duration = 0
+            log_text = f"{inter.author.mention} adicionou a playlist [`{fix_characters(tracks.name, 20)}`]({tracks.url}){pos_txt} `({tracks.total})`."
 
-            for t in tracks.tracks:
-                if not t.is_stream:
-                    total_duration += t.duration
+            if tracks.pending:
+                # o limite da fila também é verificado durante o carregamento das músicas restantes.
+                duration = "carregando..."
+                player.stream_playlist(tracks)
+            else:
+                duration = time_format(sum(t.duration for t in tracks.tracks if not t.is_stream))
 
             try:
                 embed.set_author(name=fix_characters(tracks.name, 35), url=tracks.url)
@@ -1180,7 +1231,7 @@ class Music(commands.Cog):
                     name="Spotify Playlist",
                 )
             embed.set_thumbnail(url=tracks.tracks[0].thumb)
-            embed.description = f"`{len(tracks.tracks)} música(s)`**┃**`{time_format(total_duration)}`**┃**{inter.author.mention}"
+            embed.description = f"`{tracks.total} música(s)`**┃**`{duration}`**┃**{inter.author.mention}{limit_txt}"
             emoji = "🎶"
 
         embed.description += player.controller_link
@@ -1261,7 +1312,14 @@ class Music(commands.Cog):
         if not vc or not query or (favs_size := len(favs)) >= 20:
             return favs[:20]
 
-        return await google_search(self.bot, query, max_entries=20 - favs_size) + favs
+        # músicas já tocadas no pool (ao selecionar são carregadas sem fazer a busca no lavalink).
+        history = [f"{e['author']} - {e['title']}"[:99] for e in await self.bot.pool.play_history.search(query, limit=5)]
+
+        suggestions = await self.bot.pool.suggestions.search(
+            self.bot, query, inter.author.id, max_entries=20 - favs_size - len(history)
+        )
+
+        return history + [s for s in suggestions if s not in history] + favs
 
     skip_back_cd = commands.CooldownMapping.from_cooldown(2, 13, commands.BucketType.member)
     skip_back_mc = commands.MaxConcurrency(1, per=commands.BucketType.member, wait=False)
@@ -1946,7 +2004,7 @@ class Music(commands.Cog):
 
         track = player.queue[index]
 
-        player.queue.remove(track)
+        del player.queue[index]
 
         txt = [
             f"removeu a música [`{(fix_characters(track.title, 25))}`]({track.uri}) da fila.",
@@ -2073,10 +2131,7 @@ class Music(commands.Cog):
         if not indexes:
             raise GenericError(f"**Não há músicas na fila com o nome: {query}**")
 
-        for index, track in reversed(indexes):
-            player.queue.remove(track)
-
-            player.queue.insert(int(position) - 1, track)
+        move_indexes(player.queue, [index for index, track in indexes], int(position))
 
         if (i_size := len(indexes)) == 1:
             track = indexes[0][1]
@@ -2499,16 +2554,24 @@ class Music(commands.Cog):
     @has_player()
     @check_voice()
     @pool_command(name="shuffle", aliases=["sf", "shf", "sff", "misturar"], only_voiced=True,
-                  description="Misturar as músicas da fila", cooldown=queue_manipulation_cd, max_concurrency=remove_mc)
-    async def shuffle_legacy(self, ctx: CustomContext):
-        await self.shuffle_.callback(self, inter=ctx)
+                  description="Misturar as músicas da fila (use -smart para distribuir as músicas de cada "
+                              "membro/artista pela fila)", cooldown=queue_manipulation_cd, max_concurrency=remove_mc)
+    async def shuffle_legacy(self, ctx: CustomContext, *, flags: str = ""):
+        await self.shuffle_.callback(self, inter=ctx, smart=any(f in flags.split() for f in ("-smart", "-s")))
 
     @is_dj()
     @q.sub_command(
         name=disnake.Localized("shuffle", data={disnake.Locale.pt_BR: "misturar"}),
         description=f"{desc_prefix}Misturar as músicas da fila",
         extras={"only_voiced": True}, cooldown=queue_manipulation_cd, max_concurrency=remove_mc)
-    async def shuffle_(self, inter: disnake.AppCmdInter):
+    async def shuffle_(
+            self,
+            inter: disnake.AppCmdInter,
+            smart: bool = commands.Param(
+                name="inteligente", default=False,
+                description="Distribuir as músicas de cada membro/artista pela fila (ao invés de agrupadas)."
+            )
+    ):
 
         try:
             bot = inter.music_bot
@@ -2520,12 +2583,14 @@ class Music(commands.Cog):
         if len(player.queue) < 3:
             raise GenericError("**A fila tem que ter no mínimo 3 músicas para ser misturada.**")
 
-        shuffle(player.queue)
+        shuffle_queue(player.queue, smart=smart)
+
+        txt = " (distribuindo as músicas de cada membro/artista)" if smart else ""
 
         await self.interaction_message(
             inter,
-            ["misturou as músicas da fila.",
-             f"🔀 **⠂{inter.author.mention} misturou as músicas da fila.**"],
+            [f"misturou as músicas da fila{txt}.",
+             f"🔀 **⠂{inter.author.mention} misturou as músicas da fila{txt}.**"],
             emoji="🔀"
         )
 
@@ -2681,6 +2746,10 @@ class Music(commands.Cog):
             raise GenericError(
                 "Você deve escolher apenas uma das opções: **duração_abaixo_de** ou **duração_acima_de**.")
 
+        if user and absent_members:
+            raise GenericError(
+                "Você deve escolher apenas uma das opções: **usuário** ou **membros_ausentes**.")
+
         try:
             bot = inter.music_bot
         except AttributeError:
@@ -2691,29 +2760,15 @@ class Music(commands.Cog):
         if not player.queue:
             raise GenericError("**Não há musicas na fila.**")
 
-        filters = []
-        final_filters = set()
-
         txt = []
 
-        if song_name:
-            filters.append('song_name')
-        if song_author:
-            filters.append('song_author')
-        if user:
-            filters.append('user')
-        if playlist:
-            filters.append('playlist')
         if min_duration:
-            filters.append('time_below')
             min_duration = string_to_seconds(min_duration) * 1000
         if max_duration:
-            filters.append('time_above')
             max_duration = string_to_seconds(max_duration) * 1000
-        if absent_members:
-            filters.append('absent_members')
 
-        if not filters and not range_start and not range_end:
+        if not any((song_name, song_author, user, playlist, min_duration, max_duration, absent_members,
+                    range_start, range_end)):
             player.queue.clear()
             txt = ['limpou a fila de música.', f'♻️ **⠂{inter.author.mention} limpou a fila de música.**']
 
@@ -2724,107 +2779,59 @@ class Music(commands.Cog):
                 if range_start >= range_end:
                     raise GenericError("**A posição final deve ser maior que a posição inicial!**")
 
-                song_list = list(player.queue)[range_start - 1: range_end - 1]
                 txt.append(f"**Posição inicial da fila:** `{range_start}`\n"
                            f"**Posição final da fila:** `{range_end}`")
 
             elif range_start:
-                song_list = list(player.queue)[range_start - 1:]
                 txt.append(f"**Posição inicial da fila:** `{range_start}`")
             elif range_end:
-                song_list = list(player.queue)[:range_end - 1]
                 txt.append(f"**Posição final da fila:** `{range_end}`")
-            else:
-                song_list = list(player.queue)
-
-            deleted_tracks = 0
 
-            for t in song_list:
+            start = range_start - 1 if range_start else 0
+            end = range_end - 1 if range_end else None
 
-                temp_filter = list(filters)
+            if playlist and isinstance(inter, CustomContext):
+                # nos comandos por prefixo o nome da playlist pode ser parcial: apenas as músicas da primeira playlist
+                # (no intervalo informado) que tiver o nome são removidas.
+                playlist_name = playlist.lower()
+                playlist = next((f.playlist_name for f in player.queue.fields[start:end]
+                                 if playlist_name in f.playlist_name), playlist)
 
-                if 'time_below' in temp_filter and t.duration <= min_duration:
-                    temp_filter.remove('time_below')
-                    final_filters.add('time_below')
-
-                elif 'time_above' in temp_filter and t.duration >= max_duration:
-                    temp_filter.remove('time_above')
-                    final_filters.add('time_above')
-
-                if 'song_name' in temp_filter and song_name.lower() in t.title.lower():
-                    temp_filter.remove('song_name')
-                    final_filters.add('song_name')
-
-                if 'song_author' in temp_filter and song_author.lower() in t.author.lower():
-                    temp_filter.remove('song_author')
-                    final_filters.add('song_author')
-
-                if 'user' in temp_filter and user.id == t.requester:
-                    temp_filter.remove('user')
-                    final_filters.add('user')
-
-                elif 'absent_members' in temp_filter and t.requester not in player.guild.me.voice.channel.voice_states:
-                    temp_filter.remove('absent_members')
-                    final_filters.add('absent_members')
-
-                if 'playlist' in temp_filter:
-                    if playlist == t.playlist_name:
-                        temp_filter.remove('playlist')
-                        final_filters.add('playlist')
-                    elif isinstance(inter, CustomContext) and playlist.lower() in t.playlist_name.lower():
-                        playlist = t.playlist_name
-                        temp_filter.remove('playlist')
-                        final_filters.add('playlist')
+            predicate = compile_filter(
+                song_name=song_name, song_author=song_author, user_id=user.id if user else None, playlist=playlist,
+                min_duration=min_duration or None, max_duration=max_duration or None,
+                voice_members=player.guild.me.voice.channel.voice_states if absent_members else None
+            )
 
-                if not temp_filter:
-                    player.queue.remove(t)
-                    deleted_tracks += 1
+            indexes = filter_indexes(player.queue, predicate, start=start, end=end)
 
-            if not deleted_tracks:
+            if not indexes:
                 await inter.send("Nenhuma música encontrada!", ephemeral=True)
                 return
 
-            try:
-                final_filters.remove("song_name")
+            removed = remove_indexes(player.queue, indexes)
+            deleted_tracks = len(removed)
+
+            if song_name:
                 txt.append(f"**inclui nome:** `{fix_characters(song_name)}`")
-            except:
-                pass
 
-            try:
-                final_filters.remove("song_author")
+            if song_author:
                 txt.append(f"**Inclui nome no uploader/artista:** `{fix_characters(song_author)}`")
-            except:
-                pass
 
-            try:
-                final_filters.remove("user")
+            if user:
                 txt.append(f"**Pedido pelo membro:** {user.mention}")
-            except:
-                pass
 
-            try:
-                final_filters.remove("playlist")
-                txt.append(f"**Playlist:** `{fix_characters(playlist)}`")
-            except:
-                pass
+            if playlist:
+                txt.append(f"**Playlist:** `{fix_characters(removed[0].playlist_name)}`")
 
-            try:
-                final_filters.remove("time_below")
+            if min_duration:
                 txt.append(f"**Com duração mínima:** `{min_duration}`")
-            except:
-                pass
 
-            try:
-                final_filters.remove("time_above")
+            if max_duration:
                 txt.append(f"**Com duração máxima:** `{max_duration}`")
-            except:
-                pass
 
-            try:
-                final_filters.remove("absent_members")
+            if absent_members:
                 txt.append("`Músicas pedidas por membros que saíram do canal.`")
-            except:
-                pass
 
             txt = [f"removeu {deleted_tracks} música(s) da fila via clear.",
                    f"♻️ **⠂{inter.author.mention} removeu {deleted_tracks} música(s) da fila usando os seguintes "
@@ -2917,6 +2924,45 @@ class Music(commands.Cog):
 
         await self.interaction_message(inter, text, emoji=msg[1])
 
+    @is_dj()
+    @has_player()
+    @check_voice()
+    @pool_command(name="fairqueue", aliases=["fair", "revezamento", "rr"], only_voiced=True, cooldown=restrict_cd,
+                  max_concurrency=restrict_mc,
+                  description="Ativar/Desativar o modo revezamento da fila (intercalar as músicas de cada membro).")
+    async def fair_queue_legacy(self, ctx: CustomContext):
+
+        await self.fair_queue.callback(self=self, inter=ctx)
+
+    @is_dj()
+    @has_player()
+    @check_voice()
+    @commands.slash_command(
+        name=disnake.Localized("fair_queue", data={disnake.Locale.pt_BR: "revezamento"}),
+        description=f"{desc_prefix}Ativar/Desativar o modo revezamento da fila (intercalar as músicas de cada membro).",
+        extras={"only_voiced": True}, cooldown=restrict_cd, max_concurrency=restrict_mc)
+    async def fair_queue(self, inter: disnake.AppCmdInter):
+
+        try:
+            bot = inter.music_bot
+        except AttributeError:
+            bot = inter.bot
+
+        player: LavalinkPlayer = bot.music.players[inter.guild_id]
+
+        player.fair_queue = not player.fair_queue
+
+        player.fair_queue_update()
+
+        msg = ["ativou", "🔁"] if player.fair_queue else ["desativou", "➡️"]
+
+        text = [
+            f"{msg[0]} o modo revezamento da fila (uma música de cada membro por vez).",
+            f"{msg[1]} **⠂{inter.author.mention} {msg[0]} o modo revezamento da fila (uma música de cada membro por vez).**"
+        ]
+
+        await self.interaction_message(inter, text, emoji=msg[1])
+
     nonstop_cd = commands.CooldownMapping.from_cooldown(1, 5, commands.BucketType.member)
     nonstop_mc =commands.MaxConcurrency(1, per=commands.BucketType.member, wait=False)
 
@@ -3414,6 +3460,7 @@ class Music(commands.Cog):
 
                 elif control == PlayerControls.shuffle:
                     cmd = self.bot.get_slash_command("queue").children.get("shuffle")
+                    kwargs = {"smart": False}
 
                 elif control == PlayerControls.seek_to_start:
                     cmd = self.bot.get_slash_command("seek")
@@ -3514,6 +3561,14 @@ class Music(commands.Cog):
         if message.author.bot and not isinstance(message.channel, disnake.StageChannel):
             return
 
+        if self.bot.song_request_loaded and message.channel.id not in self.bot.song_request_channels:
+            # fora dos canais de song-request apenas a thread do player (sem player fixo) é verificada.
+            try:
+                if player.static or player.message.id != message.channel.id:
+                    return
+            except AttributeError:
+                return
+
         try:
             data = await self.bot.get_data(message.guild.id, db_name=DBModel.guilds)
         except AttributeError:
@@ -3708,7 +3763,7 @@ class Music(commands.Cog):
         except AttributeError:
             pass
 
-        tracks, node = await self.get_tracks(message.content, message.author)
+        tracks, node = await self.get_tracks(message.content, message.author, stream=True)
 
         try:
             player = self.bot.music.players[message.guild.id]
@@ -3752,13 +3807,23 @@ class Music(commands.Cog):
 
         embed = disnake.Embed(color=self.bot.get_color(message.guild.me))
 
+        queue_space = player.queue_space(message.author.id)
+
+        if queue_space == 0:
+            raise GenericError("**A fila atingiu o limite de músicas permitido (para o servidor ou para você).**")
+
         try:
-            player.queue.extend(tracks.tracks)
+            # playlists ainda carregando têm o limite aplicado no playlist_stream_task.
+            if queue_space is not None and queue_space < len(tracks.tracks):
+                tracks.truncate(queue_space)
+            player.add_tracks(tracks.tracks)
+            if tracks.pending:
+                player.stream_playlist(tracks)
             if isinstance(message.channel, disnake.Thread) and not isinstance(message.channel.parent,
                                                                               disnake.ForumChannel):
                 embed.description = f"> 🎶 **┃ Playlist adicionada:** [`{tracks.data['playlistInfo']['name']}`]({message.content})\n" \
                                     f"> ✋ **┃ Pedido por:** {message.author.mention}\n" \
-                                    f"> 🎼 **┃ Música(s):** `[{len(tracks.tracks)}]`"
+                                    f"> 🎼 **┃ Música(s):** `[{tracks.total}]`"
                 embed.set_thumbnail(url=tracks.tracks[0].thumb)
                 if response:
                     await response.edit(content=None, embed=embed, view=None)
@@ -3768,7 +3833,7 @@ class Music(commands.Cog):
             else:
                 player.set_command_log(
                     text=f"{message.author.mention} adicionou a playlist [`{fix_characters(tracks.data['playlistInfo']['name'], 20)}`]"
-                         f"({tracks.tracks[0].playlist_url}) `({len(tracks.tracks)})`.",
+                         f"({tracks.tracks[0].playlist_url}) `({tracks.total})`.",
                     emoji="🎶"
                 )
 
@@ -3787,7 +3852,7 @@ class Music(commands.Cog):
 
                 track.uri = ""
 
-            player.queue.append(track)
+            player.add_tracks([track])
             if isinstance(message.channel, disnake.Thread) and not isinstance(message.channel.parent,
                                                                               disnake.ForumChannel):
                 embed.description = f"> 🎵 **┃ Adicionado:** [`{tracks[0].title}`]({tracks[0].uri})\n" \
@@ -4019,6 +4084,14 @@ class Music(commands.Cog):
         player.locked = False
         await player.process_next()
 
+    @commands.Cog.listener("on_wavelink_rest_request")
+    async def node_rest_request(self, node: wavelink.Node, latency: float, result: str):
+
+        rest_latency.observe(latency, bot=self.bot.identifier, node=node.identifier)
+
+        if result == "error":
+            rest_failures.inc(bot=self.bot.identifier, node=node.identifier)
+
     @commands.Cog.listener("on_wavelink_node_ready")
     async def node_ready(self, node: wavelink.Node):
         print(f'{self.bot.user} - Servidor de música: [{node.identifier}] está pronto para uso!')
@@ -4058,6 +4131,11 @@ class Music(commands.Cog):
 
         player.process_hint()
 
+        self.bot.pool.suggestions.add_history(player.current.title)
+
+        if isinstance(player.current, LavalinkTrack):
+            self.bot.pool.play_history.add(player.current.id, player.current.info)
+
         if not player.guild.me.voice:
             try:
                 await self.bot.wait_for(
@@ -4149,9 +4227,12 @@ class Music(commands.Cog):
         node.search = search
         node.website = node_website
 
+    @traced("get_tracks")
     async def get_tracks(
             self, query: str, user: disnake.Member, node: wavelink.Node = None,
-            track_loops=0, use_cache=True):
+            track_loops=0, use_cache=True, stream=False):
+        """stream: retornar playlists grandes com apenas as primeiras músicas carregadas (as restantes são
+        carregadas usando o playlist.next_pages()/player.stream_playlist())."""
 
         if not node:
             node = self.get_best_node()
@@ -4177,9 +4258,17 @@ class Music(commands.Cog):
                             'tracks': cached_tracks
                         },
                         requester=user.id,
-                        url=cached_tracks[0]["info"]["extra"]["playlist"]["url"]
+                        url=cached_tracks[0]["info"]["extra"]["playlist"]["url"],
+                        stream=stream
                     )
 
+            if not tracks and use_cache and (entry := self.bot.pool.play_history.get(
+                    query if URL_REG.match(query) else query.split(":", 1)[-1])):
+                tracks = [LavalinkTrack(id_=entry["track"], info=dict(entry["info"]), requester=user.id)]
+
+            if not tracks and self.bot.pool.ytdl and URL_REG.match(query):
+                tracks = await self.bot.pool.ytdl.get_track_info(query, user)
+
             if not tracks:
 
                 if node.search:
@@ -4196,7 +4285,8 @@ class Music(commands.Cog):
 
                 try:
                     tracks = await node_search.get_tracks(
-                        query, track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, requester=user.id
+                        query, track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, requester=user.id,
+                        stream=stream
                     )
                 except ClientConnectorCertificateError:
                     node_search.available = False
@@ -4208,7 +4298,8 @@ class Music(commands.Cog):
 
                         try:
                             tracks = await n.get_tracks(
-                                query, track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, requester=user.id
+                                query, track_cls=LavalinkTrack, playlist_cls=LavalinkPlaylist, requester=user.id,
+                                stream=stream
                             )
                             node_search = n
                             break
@@ -4228,8 +4319,12 @@ class Music(commands.Cog):
         else:
 
             if (selected := tracks.data['playlistInfo']['selectedTrack']) > 0:
+                await tracks.fill()
                 tracks.tracks = tracks.tracks[selected:] + tracks.tracks[:selected]
 
+            elif not stream:
+                await tracks.fill()
+
         return tracks, node
 
     async def connect_local_lavalink(self):
@@ -4312,12 +4407,6 @@ class Music(commands.Cog):
         except KeyError:
             return
 
-        try:
-            player.members_timeout_task.cancel()
-            player.members_timeout_task = None
-        except AttributeError:
-            pass
-
         if destroy_player:
 
             if player.static:
@@ -4338,58 +4427,31 @@ class Music(commands.Cog):
         if member.id == self.bot.user.id:
             # tempfix para channel do voice_client não ser setado ao mover bot do canal.
             player.guild.voice_client.channel = after.channel
-
-        try:
-            check = any(m for m in player.guild.me.voice.channel.members if not m.bot)
-        except:
-            check = None
-
-        if not check:
-            player.members_timeout_task = self.bot.loop.create_task(player.members_timeout())
-
-        # rich presence stuff
-
-        if player.is_closing or member.bot:
+            player.reset_voice_members()
+            player.check_members_timeout()
             return
 
-        channels = set()
-
-        try:
-            channels.add(before.channel.id)
-        except:
-            pass
-
-        try:
-            channels.add(after.channel.id)
-        except:
-            pass
-
-        if player.channel_id not in channels:
+        if player.is_closing:
             return
 
-        if not after or before.channel != after.channel:
-
-            try:
-                vc = player.guild.me.voice.channel
-            except AttributeError:
+        try:
+            channel_id = player.guild.me.voice.channel.id
+        except AttributeError:
 
+            if player.channel_id in (getattr(before.channel, "id", None), getattr(after.channel, "id", None)):
                 try:
                     await player.destroy()
                 except:
                     pass
 
-                vc = before.channel
-
-            if vc:
+            return
 
-                try:
-                    self.bot.loop.create_task(
-                        player.process_rpc(vc, users=[member.id], close=after.channel != player.guild.me.voice.channel))
-                except AttributeError:
-                    pass
+        # contagem de membros, timeout e rich presence são processados em conjunto pelo player (voice_update_flush).
+        if before.channel and before.channel.id == channel_id:
+            player.voice_member_update(member.id, joined=False)
 
-                self.bot.loop.create_task(
-                    player.process_rpc(vc, users=[m for m in vc.voice_states if (m != member.id)]))
+        if after.channel and after.channel.id == channel_id:
+            player.voice_member_update(member.id, joined=True)
 
     async def reset_controller_db(self, guild_id: int, data: dict, inter: disnake.AppCmdInter = None):
 
@@ -111,6 +111,7 @@ class PlayerSession(commands.Cog):
             "skin_static": player.skin_static,
             "uptime": player.uptime,
             "restrict_mode": player.restrict_mode,
+            "fair_queue": player.fair_queue,
             "mini_queue_enabled": player.mini_queue_enabled,
             "tracks": tracks
         }
@@ -249,6 +250,7 @@ class PlayerSession(commands.Cog):
 
                 player.dj = set(data["dj"])
                 player.restrict_mode = data["restrict_mode"]
+                player.fair_queue = data.get("fair_queue", False)
                 player.loop = data["loop"]
 
                 try:
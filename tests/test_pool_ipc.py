@@ -0,0 +1,84 @@
+import asyncio
+import socket
+import unittest
+
+from utils.pool_ipc import GlobalDatabaseHandler, PoolIPCClient, PoolIPCServer, SharedLocalDatabase
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class FakeGlobalDatabase:
+    """Database do supervisor (apenas em memória) para o teste."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get_data(self, id_, *, db_name, collection, default_model=None):
+        return self.data.get((collection, db_name, id_), dict(default_model[db_name], _id=id_))
+
+    async def update_data(self, id_, data, *, db_name, collection, default_model=None):
+        self.data[(collection, db_name, id_)] = data
+        return data
+
+    async def query_data(self, db_name, collection, filter=None, limit=100):
+        return [v for (c, d, _), v in self.data.items() if c == collection and d == db_name][:limit]
+
+    async def delete_data(self, id_, db_name, collection):
+        self.data.pop((collection, db_name, id_), None)
+
+
+class SharedLocalDatabaseTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+
+        port = free_port()
+
+        self.database = FakeGlobalDatabase()
+
+        self.server = PoolIPCServer(port=port)
+        self.server.handlers["db"] = GlobalDatabaseHandler(self.database)
+        await self.server.start()
+
+        self.client = PoolIPCClient(worker_id=0, workers=1, port=port)
+        self.connect_task = asyncio.create_task(self.client.connect())
+        await asyncio.wait_for(self.client.connected.wait(), timeout=5)
+
+        # LocalDatabase.__init__ não é chamado para não criar os arquivos do tinymongo.
+        self.db = SharedLocalDatabase.__new__(SharedLocalDatabase)
+        self.db.ipc = self.client
+
+    async def asyncTearDown(self):
+
+        self.client.writer.close()
+        await self.client.writer.wait_closed()
+        await asyncio.sleep(0.1)
+
+        self.connect_task.cancel()
+        self.server.server.close()
+        await self.server.server.wait_closed()
+
+    async def test_global_data_round_trip(self):
+
+        data = await self.db.get_data(123, db_name="guilds", collection="global")
+        self.assertEqual(data["_id"], "123")
+
+        data["prefix"] = "?"
+        await self.db.update_data(123, data, db_name="guilds", collection="global")
+
+        self.assertEqual((await self.db.get_data(123, db_name="guilds", collection="global"))["prefix"], "?")
+        self.assertEqual(len(await self.db.query_data("guilds", "global", limit=1)), 1)
+
+        await self.db.delete_data(123, "guilds", "global")
+        self.assertNotIn(("global", "guilds", "123"), self.database.data)
+
+    async def test_handler_error(self):
+        with self.assertRaises(Exception):
+            await self.client.call("db", method="invalid", kwargs={})
+
+
+if __name__ == "__main__":
+    unittest.main()
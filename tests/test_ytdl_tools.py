@@ -0,0 +1,81 @@
+import re
+import unittest
+from typing import List, Optional, Tuple
+
+import yt_dlp
+
+from utils.music.ytdl_tools import ExtractorTable, exclude_extractors
+
+
+def linear_patterns(extractors: list) -> List[Tuple[str, List[re.Pattern]]]:
+    """Extractors na ordem original com os padrões compilados (mesmo resultado da busca feita antes da
+    ExtractorTable, que compilava o _VALID_URL de cada extractor para cada url)."""
+
+    patterns = []
+
+    for e in extractors:
+
+        if not e._VALID_URL:
+            continue
+
+        if any(ee in type(e).__name__.lower() for ee in exclude_extractors):
+            continue
+
+        compiled = []
+
+        for pattern in (e._VALID_URL if isinstance(e._VALID_URL, (list, tuple)) else [e._VALID_URL]):
+            try:
+                compiled.append(re.compile(pattern))
+            except re.error:
+                continue
+
+        patterns.append((e.ie_key(), compiled))
+
+    return patterns
+
+
+def linear_match(patterns: List[Tuple[str, List[re.Pattern]]], url: str) -> Optional[str]:
+
+    for ie_key, compiled in patterns:
+        for pattern in compiled:
+            if (matches := pattern.match(url)) and matches.groups():
+                return ie_key
+
+
+class ExtractorTableTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.extractors = yt_dlp.list_extractors()
+        cls.table = ExtractorTable(cls.extractors)
+        cls.patterns = linear_patterns(cls.extractors)
+
+        urls = set()
+
+        # urls dos testes dos próprios extractors (uma amostra distribuída pela lista de extractors).
+        for e in cls.extractors[::3]:
+            try:
+                for test in e.get_testcases(include_onlymatching=True):
+                    if isinstance(url := test.get("url"), str):
+                        urls.add(url)
+            except Exception:
+                continue
+
+        cls.urls = sorted(urls) + [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://soundcloud.com/artista/musica",
+            "https://example.com/pagina/1?q=musica",
+            "https://sub.example.org/",
+        ]
+
+    def test_same_extractor_as_linear_scan(self):
+
+        for url in self.urls:
+            with self.subTest(url=url):
+                entry = self.table.match(url)
+                self.assertEqual(entry.ie_key if entry else None, linear_match(self.patterns, url))
+
+
+if __name__ == "__main__":
+    unittest.main()
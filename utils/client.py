@@ -1,14 +1,14 @@
 from __future__ import annotations
 import asyncio
 import datetime
+import itertools
 import json
 import logging
 import os
 import traceback
 from configparser import ConfigParser
 from importlib import import_module
-from subprocess import check_output
-from typing import Optional, Union, List
+from typing import Dict, Optional, Set, Union, List
 
 import aiohttp
 import requests
@@ -20,11 +20,22 @@ from web_app import WSClient, start
 from utils.music.checks import check_pool_bots
 from utils.music.errors import GenericError
 from utils.music.local_lavalink import run_lavalink
-from utils.music.models import music_mode
+from utils.music.models import music_mode, LavalinkPlayer
 from utils.music.spotify import spotify_client
+from utils.music.suggestions import SuggestionService
+from utils.music.history import PlayHistory
+from utils.music.ytdl_tools import YTDLTools
 from asyncspotify import Client
 from utils.owner_panel import PanelView
 from utils.db import MongoDatabase, LocalDatabase, guild_prefix, DBModel, global_db_models
+from utils.metrics import db_latency
+from utils.watchdog import LoopWatchdog
+from utils.tracing import CommandTracer, span, trace_discord_requests
+from utils.pool_router import PoolMessageRouter
+from utils.voice_index import VoiceIndex
+from utils.pool_ipc import PoolIPCClient, SharedDict, SharedLocalDatabase
+from utils.pool_workers import PoolSupervisor, worker_info
+from utils.startup import setup_event_loop, StartupTimer
 from asyncspotify import Client as SpotifyClient
 from utils.others import CustomContext
 
@@ -43,9 +54,19 @@ class BotPool:
         self.commit = ""
         self.remote_git_url = ""
         self.max_counter: int = 0
-        self.message_ids: set = set()
         self.db_cache_cleanup_task = None
         self.bot_mentions = set()
+        self.watchdog: Optional[LoopWatchdog] = None
+        self.tracer: Optional[CommandTracer] = None
+        self.router: Optional[PoolMessageRouter] = None
+        self.voice_index = VoiceIndex()
+        self.ipc: Optional[PoolIPCClient] = None
+        self.player_skins = {}
+        self.player_static_skins = {}
+        self.startup: Optional[StartupTimer] = None
+        self.suggestions = SuggestionService()
+        self.play_history: Optional[PlayHistory] = None
+        self.ytdl: Optional[YTDLTools] = None
 
     @property
     def database(self) -> Union[LocalDatabase, MongoDatabase]:
@@ -99,6 +120,88 @@ class BotPool:
             [asyncio.create_task(self.start_bot(bot)) for bot in bots]
         )
 
+    def download_lavalink_serverlist(self):
+        r = requests.get(self.config["LAVALINK_SERVER_LIST"], allow_redirects=True)
+        with open("auto_lavalink.ini", 'wb') as f:
+            f.write(r.content)
+        r.close()
+
+    def load_lavalink_servers(self, ini_file: str) -> dict:
+
+        servers = {}
+
+        for key, value in self.config.items():
+
+            if key.lower().startswith("lavalink_node_"):
+                try:
+                    servers[key] = json.loads(value)
+                except Exception as e:
+                    print(f"Falha ao adicionar node: {key}, erro: {repr(e)}")
+
+        config = ConfigParser()
+        try:
+            config.read(ini_file)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            traceback.print_exc()
+        else:
+            for key, value in {section: dict(config.items(section)) for section in config.sections()}.items():
+                value["identifier"] = key.replace(" ", "_")
+                value["secure"] = value.get("secure") == "true"
+                value["search"] = value.get("search") != "false"
+                servers[key] = value
+
+        return servers
+
+    async def load_git_info(self):
+
+        async def git(*args):
+            p = await asyncio.create_subprocess_exec(
+                "git", *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await p.communicate()
+            if p.returncode != 0:
+                raise Exception(f"git {' '.join(args)}: {p.returncode}")
+            return stdout.decode('ascii').strip()
+
+        try:
+            self.commit = await git('rev-parse', 'HEAD')
+            print(f"Commit ver: {self.commit}\n{'-' * 30}")
+        except:
+            self.commit = None
+
+        try:
+            self.remote_git_url = (await git('remote', '-v')).split("\n")[0][7:].replace(".git", "").replace(" (fetch)", "")
+        except:
+            self.remote_git_url = ""
+
+    def load_skins(self):
+
+        for skin in os.listdir("./utils/music/skins/normal_player"):
+            if not skin.endswith(".py"):
+                continue
+            try:
+                skin_file = import_module(f"utils.music.skins.normal_player.{skin[:-3]}")
+                if not hasattr(skin_file, "load"):
+                    print(f"Skin ignorada: {skin} | Função load() não configurada/encontrada...")
+                    continue
+                self.player_skins[skin[:-3]] = skin_file.load()
+            except Exception:
+                print(f"Falha ao carregar skin [normal_player]: {traceback.format_exc()}")
+
+        for skin in os.listdir("./utils/music/skins/static_player"):
+            if not skin.endswith(".py"):
+                continue
+            try:
+                skin_file = import_module(f"utils.music.skins.static_player.{skin[:-3]}")
+                if not hasattr(skin_file, "load"):
+                    print(f"Skin ignorada: {skin} | Função load() não configurada/encontrada...")
+                    continue
+                self.player_static_skins[skin[:-3]] = skin_file.load()
+            except Exception:
+                print(f"Falha ao carregar skin [static_player]: {traceback.format_exc()}")
+
     def load_playlist_cache(self):
 
         try:
@@ -137,8 +240,14 @@ class BotPool:
 
     def setup(self):
 
+        self.startup = StartupTimer()
+
         self.config = load_config()
 
+        loop = setup_event_loop(self.config)
+
+        self.startup.mark("config/event loop")
+
         if not self.config["DEFAULT_PREFIX"]:
             self.config["DEFAULT_PREFIX"] = "!!"
 
@@ -158,39 +267,33 @@ class BotPool:
         if self.config["AUTO_DOWNLOAD_LAVALINK_SERVERLIST"]:
             ini_file = "auto_lavalink.ini"
             print("Baixando lista de servidores lavalink (arquivo: lavalink.ini)")
-            r = requests.get(self.config["LAVALINK_SERVER_LIST"], allow_redirects=True)
-            with open("auto_lavalink.ini", 'wb') as f:
-                f.write(r.content)
-            r.close()
+            # o download ocorre em paralelo com o restante da inicialização.
+            lavalink_download = loop.run_in_executor(None, self.download_lavalink_serverlist)
         else:
             ini_file = "lavalink.ini"
+            lavalink_download = None
 
-        for key, value in self.config.items():
+        def wait_lavalink_servers() -> bool:
 
-            if key.lower().startswith("lavalink_node_"):
+            if lavalink_download:
                 try:
-                    LAVALINK_SERVERS[key] = json.loads(value)
-                except Exception as e:
-                    print(f"Falha ao adicionar node: {key}, erro: {repr(e)}")
+                    loop.run_until_complete(lavalink_download)
+                except Exception:
+                    traceback.print_exc()
 
-        config = ConfigParser()
-        try:
-            config.read(ini_file)
-        except FileNotFoundError:
-            pass
-        except Exception:
-            traceback.print_exc()
-        else:
-            for key, value in {section: dict(config.items(section)) for section in config.sections()}.items():
-                value["identifier"] = key.replace(" ", "_")
-                value["secure"] = value.get("secure") == "true"
-                value["search"] = value.get("search") != "false"
-                LAVALINK_SERVERS[key] = value
+            LAVALINK_SERVERS.update(self.load_lavalink_servers(ini_file))
 
-        if start_local := (self.config['RUN_LOCAL_LAVALINK'] is True or not LAVALINK_SERVERS):
-            pass
-        else:
-            start_local = False
+            return self.config['RUN_LOCAL_LAVALINK'] is True or not LAVALINK_SERVERS
+
+        worker = worker_info()
+
+        if not worker and self.config["POOL_WORKERS"] > 1:
+            PoolSupervisor(self.config, start_local=wait_lavalink_servers()).run()
+            return
+
+        if worker:
+            self.ipc = PoolIPCClient(*worker, port=self.config["POOL_IPC_PORT"])
+            self.voice_index.attach(self.ipc)
 
         intents = disnake.Intents(**{i[:-7].lower(): v for i, v in self.config.items() if i.lower().endswith("_intent")})
         intents.members = True
@@ -203,28 +306,45 @@ class BotPool:
         else:
             print(f"O token/link do mongoDB não foi configurado...\nSerá usado um arquivo json para database.\n{'-' * 30}")
 
-        self.local_database = LocalDatabase()
+        self.local_database = SharedLocalDatabase(self.ipc) if self.ipc else LocalDatabase()
 
-        try:
-            self.commit = check_output(['git', 'rev-parse', 'HEAD']).decode('ascii').strip()
-            print(f"Commit ver: {self.commit}\n{'-' * 30}")
-        except:
-            self.commit = None
+        loop.create_task(self.load_git_info())
 
-        try:
-            self.remote_git_url = check_output(['git', 'remote', '-v']).decode(
-                'ascii').strip().split("\n")[0][7:].replace(".git", "").replace(" (fetch)", "")
-        except:
-            self.remote_git_url = ""
+        self.startup.mark("database")
 
         prefix = guild_prefix if intents.message_content else commands.when_mentioned
 
         self.load_playlist_cache()
 
+        if self.ipc:
+            self.playlist_cache = SharedDict(self.ipc, "playlist_cache", self.playlist_cache)
+
+        # no modo POOL_WORKERS cada processo mantém o próprio histórico.
+        self.play_history = PlayHistory(
+            path=f"./play_history_{self.ipc.worker_id}.json" if self.ipc else "./play_history.json",
+            max_size=self.config["PLAY_HISTORY_SIZE"]
+        )
+        self.play_history.load()
+
         self.ws_client = WSClient(self.config["RPC_SERVER"], pool=self)
 
         self.spotify = spotify_client(self.config)
 
+        if self.config["YTDL_PROCESSES"] > 0:
+            self.ytdl = YTDLTools(processes=self.config["YTDL_PROCESSES"])
+
+        if self.config["COMMAND_TRACING"]:
+            self.tracer = CommandTracer()
+
+        if self.config["GLOBAL_PREFIX"]:
+            self.router = PoolMessageRouter(timeout=self.config["PREFIXED_POOL_TIMEOUT"])
+
+        self.load_skins()
+
+        self.startup.mark("skins")
+
+        token_counter = itertools.count()
+
         def load_bot(bot_name: str, token: str):
 
             if self.config["GLOBAL_PREFIX"]:
@@ -243,6 +363,9 @@ class BotPool:
                 print(f"{bot_name} Ignorado (token não informado)...")
                 return
 
+            if self.ipc and next(token_counter) % self.ipc.workers != self.ipc.worker_id:
+                return
+
             try:
                 test_guilds = list([int(i) for i in self.config[f"TEST_GUILDS_{bot_name}"].split("||")])
             except:
@@ -263,10 +386,17 @@ class BotPool:
 
             bot.http.token = token
 
-            bot.load_extension("jishaku")
+            if self.tracer:
+                trace_discord_requests(bot)
 
-            jsk = bot.get_command("jsk")
-            jsk.hidden = True
+            # o jishaku só é carregado quando for usado pela primeira vez.
+            @bot.command(name="jsk", aliases=["jishaku"], hidden=True)
+            @commands.is_owner()
+            async def load_jishaku(ctx: CustomContext):
+                bot.remove_command("jsk")
+                bot.load_extension("jishaku")
+                bot.get_command("jsk").hidden = True
+                await bot.invoke(await bot.get_context(ctx.message, cls=CustomContext))
 
             if bot.config['INTERACTION_COMMAND_ONLY']:
 
@@ -279,23 +409,6 @@ class BotPool:
 
                     return True
 
-            if bot.config["GLOBAL_PREFIX"]:
-
-                @bot.listen("on_command")
-                async def message_id_cleanup(ctx: CustomContext):
-
-                    id_ = f"{ctx.guild.id}-{ctx.channel.id}-{ctx.message.id}"
-
-                    if id_ not in ctx.bot.pool.message_ids:
-                        return
-
-                    await asyncio.sleep(ctx.bot.config["PREFIXED_POOL_TIMEOUT"])
-
-                    try:
-                        ctx.bot.pool.message_ids.remove(id_)
-                    except:
-                        pass
-
             @bot.application_command_check(slash_commands=True, message_commands=True, user_commands=True)
             async def check(inter: disnake.ApplicationCommandInteraction):
 
@@ -323,9 +436,32 @@ class BotPool:
 
                 return True
 
+            @bot.listen("on_guild_join")
+            async def voice_index_guild_join(guild: disnake.Guild):
+                self.voice_index.add_guild(bot, guild)
+
+            @bot.listen("on_guild_remove")
+            async def voice_index_guild_remove(guild: disnake.Guild):
+                self.voice_index.remove_guild(bot, guild.id)
+
+            @bot.listen("on_voice_state_update")
+            async def voice_index_voice_update(member: disnake.Member, before: disnake.VoiceState, after: disnake.VoiceState):
+                if member.id == bot.user.id:
+                    self.voice_index.update_voice(bot, member.guild.id, after.channel.id if after.channel else None)
+
+            @bot.listen("on_player_create")
+            async def voice_index_player_create(player: LavalinkPlayer):
+                self.voice_index.player_created(bot, player.guild_id)
+
+            @bot.listen("on_player_destroy")
+            async def voice_index_player_destroy(player: LavalinkPlayer):
+                self.voice_index.player_destroyed(bot, player.guild_id)
+
             @bot.listen()
             async def on_ready():
 
+                self.voice_index.load_bot(bot)
+
                 if not bot.bot_ready:
 
                     if not bot.config["INTERACTION_BOTS"] or str(bot.user.id) in bot.config["INTERACTION_BOTS"]:
@@ -392,12 +528,16 @@ class BotPool:
 
                     bot.add_view(PanelView(bot))
 
+                    bot.loop.create_task(bot.load_song_request_channels())
+
                     self.bot_mentions.update((f"<@!{bot.user.id}>", f"<@{bot.user.id}>"))
 
                     bot.sync_command_cooldowns()
 
                     bot.bot_ready = True
 
+                    self.startup.bot_ready(bot, len(self.bots))
+
                 print(f'{bot.user} - [{bot.user.id}] Online.')
 
             self.bots.append(bot)
@@ -416,6 +556,8 @@ class BotPool:
 
             load_bot(bot_name, v)
 
+        self.startup.mark(f"bots ({len(self.bots)})")
+
         if not self.bots:
             os.system('cls' if os.name == 'nt' else 'clear')
             raise Exception(
@@ -424,7 +566,11 @@ class BotPool:
                 "Caso ainda tenha dúvidas, entre no servidor de suporte: https://discord.gg/R7BPG8fZTr"
             )
 
-        if start_local:
+        start_local = wait_lavalink_servers()
+
+        self.startup.mark("lista de servidores lavalink")
+
+        if start_local and not self.ipc:
             run_lavalink(
                 lavalink_file_url=self.config['LAVALINK_FILE_URL'],
                 lavalink_initial_ram=self.config['LAVALINK_INITIAL_RAM'],
@@ -432,12 +578,20 @@ class BotPool:
                 lavalink_additional_sleep=int(self.config['LAVALINK_ADDITIONAL_SLEEP']),
             )
 
-        loop = asyncio.get_event_loop()
-
         self.database.start_task(loop)
         self.db_cache_cleanup_task = loop.create_task(self.db_cache_cleanup())
+        loop.create_task(self.play_history.save_task(self.config["PLAY_HISTORY_SAVE_INTERVAL"]))
+        self.watchdog = LoopWatchdog(threshold=self.config["WATCHDOG_THRESHOLD_MS"] / 1000)
+        self.watchdog.start(loop)
+
+        if self.ytdl:
+            loop.create_task(self.ytdl.load_extractor_table())
 
-        if self.config["RUN_RPC_SERVER"]:
+        if self.ipc:
+            loop.create_task(self.ipc.connect())
+
+        # no modo POOL_WORKERS o servidor RPC roda no supervisor.
+        if self.config["RUN_RPC_SERVER"] and not self.ipc:
 
             for bot in self.bots:
                 loop.create_task(self.start_bot(bot))
@@ -445,7 +599,7 @@ class BotPool:
             loop.create_task(self.connect_rpc_ws())
             loop.create_task(self.connect_spotify())
 
-            start(self.bots)
+            start(self.bots, diagnostics_token=self.config["DIAGNOSTICS_TOKEN"])
 
         else:
 
@@ -470,17 +624,24 @@ class BotCore(commands.Bot):
         self.identifier = kwargs.pop("identifier", "")
         self.appinfo: Optional[disnake.AppInfo] = None
         self.bot_ready = False
-        self.player_skins = {}
-        self.player_static_skins = {}
+        self.player_skins = self.pool.player_skins
+        self.player_static_skins = self.pool.player_static_skins
         self.default_skin = self.config.get("DEFAULT_SKIN", "default")
         self.default_static_skin = self.config.get("DEFAULT_STATIC_SKIN", "default")
         self.default_controllerless_skin = self.config.get("DEFAULT_CONTROLLERLESS_SKIN", "default")
         self.default_idling_skin = self.config.get("DEFAULT_IDLING_SKIN", "default")
-        self.load_skins()
+        if self.default_skin not in self.player_skins:
+            self.default_skin = "default"
+        if self.default_static_skin not in self.player_static_skins:
+            self.default_static_skin = "default"
         self.uptime = disnake.utils.utcnow()
         self.env_owner_ids = set()
         self.dm_cooldown = commands.CooldownMapping.from_cooldown(rate=2, per=30, type=commands.BucketType.member)
         self.number = kwargs.pop("number", 0)
+        # ids dos canais/threads de song-request configurados (para ignorar as demais mensagens sem acessar a database).
+        self.song_request_channels: Set[int] = set()
+        self.song_request_guilds: Dict[int, Set[int]] = {}
+        self.song_request_loaded = False
         super().__init__(*args, **kwargs)
         self.music = music_mode(self)
 
@@ -494,55 +655,73 @@ class BotCore(commands.Bot):
             except ValueError:
                 print(f"Owner_ID inválido: {i}")
 
-    def load_skins(self):
+    async def get_data(self, id_: int, *, db_name: Union[DBModel.guilds, DBModel.users]):
+        with db_latency.time(op="get_data", db_name=db_name), span(f"db: get_data ({db_name})"):
+            return await self.pool.database.get_data(
+                id_=id_, db_name=db_name, collection=str(self.user.id)
+            )
 
-        for skin in os.listdir("./utils/music/skins/normal_player"):
-            if not skin.endswith(".py"):
-                continue
-            try:
-                skin_file = import_module(f"utils.music.skins.normal_player.{skin[:-3]}")
-                if not hasattr(skin_file, "load"):
-                    print(f"Skin ignorada: {skin} | Função load() não configurada/encontrada...")
-                    continue
-                self.player_skins[skin[:-3]] = skin_file.load()
-            except Exception:
-                print(f"Falha ao carregar skin [normal_player]: {traceback.format_exc()}")
-        if self.default_skin not in self.player_skins:
-            self.default_skin = "default"
+    async def update_data(self, id_, data: dict, *, db_name: Union[DBModel.guilds, DBModel.users]):
 
-        for skin in os.listdir("./utils/music/skins/static_player"):
-            if not skin.endswith(".py"):
-                continue
-            try:
-                skin_file = import_module(f"utils.music.skins.static_player.{skin[:-3]}")
-                if not hasattr(skin_file, "load"):
-                    print(f"Skin ignorada: {skin} | Função load() não configurada/encontrada...")
-                    continue
-                self.player_static_skins[skin[:-3]] = skin_file.load()
-            except Exception:
-                print(f"Falha ao carregar skin [static_player]: {traceback.format_exc()}")
-        if self.default_static_skin not in self.player_static_skins:
-            self.default_static_skin = "default"
+        if db_name == DBModel.guilds:
+            self.update_song_request_channels(id_, data)
 
-    async def get_data(self, id_: int, *, db_name: Union[DBModel.guilds, DBModel.users]):
-        return await self.pool.database.get_data(
-            id_=id_, db_name=db_name, collection=str(self.user.id)
-        )
+        with db_latency.time(op="update_data", db_name=db_name), span(f"db: update_data ({db_name})"):
+            return await self.pool.database.update_data(
+                id_=id_, data=data, db_name=db_name, collection=str(self.user.id)
+            )
 
-    async def update_data(self, id_, data: dict, *, db_name: Union[DBModel.guilds, DBModel.users]):
-        return await self.pool.database.update_data(
-            id_=id_, data=data, db_name=db_name, collection=str(self.user.id)
-        )
+    def update_song_request_channels(self, guild_id: int, data: dict):
+
+        try:
+            controller = data["player_controller"]
+        except KeyError:
+            return
+
+        # o message_id também é o id da thread criada na mensagem do player fixo.
+        ids = {int(i) for i in (controller.get("channel"), controller.get("message_id")) if i}
+
+        for channel_id in self.song_request_guilds.pop(int(guild_id), set()):
+            self.song_request_channels.discard(channel_id)
+
+        if ids:
+            self.song_request_guilds[int(guild_id)] = ids
+            self.song_request_channels.update(ids)
+
+    async def load_song_request_channels(self):
+
+        # no database local todos os servidores são carregados (o tinymongo não tem suporte garantido para filtros
+        # em chaves com "." usando $ne), os servidores sem canal de song-request são ignorados no
+        # update_song_request_channels.
+        if isinstance(self.pool.database, LocalDatabase):
+            query_filter = None
+        else:
+            query_filter = {"player_controller.channel": {"$ne": None}}
+
+        try:
+            guilds = await self.pool.database.query_data(
+                db_name=DBModel.guilds, collection=str(self.user.id), filter=query_filter, limit=None
+            )
+        except Exception:
+            traceback.print_exc()
+            return
+
+        for data in guilds:
+            self.update_song_request_channels(data["_id"], data)
+
+        self.song_request_loaded = True
 
     async def get_global_data(self, id_: int, *, db_name: Union[DBModel.guilds, DBModel.users]):
-        return await self.pool.database.get_data(
-            id_=id_, db_name=db_name, collection="global", default_model=global_db_models
-        )
+        with db_latency.time(op="get_global_data", db_name=db_name), span(f"db: get_global_data ({db_name})"):
+            return await self.pool.database.get_data(
+                id_=id_, db_name=db_name, collection="global", default_model=global_db_models
+            )
 
     async def update_global_data(self, id_, data: dict, *, db_name: Union[DBModel.guilds, DBModel.users]):
-        return await self.pool.database.update_data(
-            id_=id_, data=data, db_name=db_name, collection="global", default_model=global_db_models
-        )
+        with db_latency.time(op="update_global_data", db_name=db_name), span(f"db: update_global_data ({db_name})"):
+            return await self.pool.database.update_data(
+                id_=id_, data=data, db_name=db_name, collection="global", default_model=global_db_models
+            )
 
     def check_skin(self, skin: str):
 
@@ -709,6 +888,10 @@ class BotCore(commands.Bot):
             await message.reply(embed=embed, **kwargs)
             return
 
+        if self.pool.router and not message.content.startswith(tuple(self.pool.bot_mentions)):
+            await self.pool.router.route(self, message)
+            return
+
         ctx: CustomContext = await self.get_context(message, cls=CustomContext)
 
         self.dispatch("song_request", ctx, message)
@@ -728,13 +911,22 @@ class BotCore(commands.Bot):
         except AttributeError:
             kwargs = {"return_first": True}
 
+        trace = self.pool.tracer.start(ctx.command.qualified_name, ctx.guild.id, ctx.author.id) if self.pool.tracer else None
+
         try:
-            await check_pool_bots(ctx, **kwargs)
-        except Exception as e:
-            self.dispatch("command_error", ctx, e)
-            return
 
-        await self.invoke(ctx)
+            try:
+                await check_pool_bots(ctx, **kwargs)
+            except Exception as e:
+                ctx.command_failed = True
+                self.dispatch("command_error", ctx, e)
+                return
+
+            await self.invoke(ctx)
+
+        finally:
+            if trace:
+                self.pool.tracer.finish(trace, failed=ctx.command_failed)
 
     def check_bot_forum_post(
             self,
@@ -804,7 +996,16 @@ class BotCore(commands.Bot):
             except:
                 traceback.print_exc()
 
-        await super().on_application_command(inter)
+        if not self.pool.tracer:
+            await super().on_application_command(inter)
+            return
+
+        trace = self.pool.tracer.start(f"/{inter.data.name}", inter.guild_id, inter.author.id)
+
+        try:
+            await super().on_application_command(inter)
+        finally:
+            self.pool.tracer.finish(trace, failed=inter.command_failed)
 
     def load_modules(self):
 
@@ -8,12 +8,11 @@ import shutil
 import traceback
 import disnake
 from disnake.ext import commands
-from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime
 from tinymongo import TinyMongoClient
 from tinydb_serialization import Serializer, SerializationMiddleware
 from tinymongo.serializers import DateTimeSerializer
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 if TYPE_CHECKING:
     from utils.client import BotCore
@@ -184,7 +183,7 @@ class LocalDatabase(BaseDB):
 
         return data
 
-    async def query_data(self, db_name: str, collection: str, filter: dict = None) -> list:
+    async def query_data(self, db_name: str, collection: str, filter: dict = None, limit: Optional[int] = 100) -> list:
         return self._connect[collection][db_name].find(filter or {})
 
     async def delete_data(self, id_, db_name: str, collection: str):
@@ -194,6 +193,7 @@ class MongoDatabase(BaseDB):
 
     def __init__(self, token: str):
         super().__init__()
+        from motor.motor_asyncio import AsyncIOMotorClient
         self._connect = AsyncIOMotorClient(token, connectTimeoutMS=30000)
 
     async def push_data(self, data, *, db_name: Union[DBModel.guilds, DBModel.users], collection: str):
@@ -251,8 +251,8 @@ class MongoDatabase(BaseDB):
 
         return await self._connect[collection][db_name].update_one({'_id': str(id_)}, {'$set': data}, upsert=True)
 
-    async def query_data(self, db_name: str, collection: str, filter: dict = None) -> list:
-        return await self._connect[collection][db_name].find(filter or {}).to_list(100)
+    async def query_data(self, db_name: str, collection: str, filter: dict = None, limit: Optional[int] = 100) -> list:
+        return await self._connect[collection][db_name].find(filter or {}).to_list(limit)
 
     async def delete_data(self, id_, db_name: str, collection: str):
         return await self._connect[collection][db_name].delete_one({'_id': str(id_)})
@@ -0,0 +1,214 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+from utils.music.memory import player_memory
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in labels) + "}"
+
+
+class Metric:
+
+    type_name = ""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(f"{self.name}{format_labels(k)} {v}" for k, v in self.values.items())
+        return lines
+
+
+class Counter(Metric):
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[tuple(sorted(labels.items()))] = value
+
+    def clear(self):
+        self.values.clear()
+
+
+class Histogram(Metric):
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, description)
+        self.buckets = buckets
+        self.observations: Dict[Tuple[Tuple[str, str], ...], list] = {}
+
+    def observe(self, value: float, **labels):
+
+        key = tuple(sorted(labels.items()))
+
+        try:
+            data = self.observations[key]
+        except KeyError:
+            data = self.observations[key] = [[0] * len(self.buckets), 0, 0.0]
+
+        for n, b in enumerate(self.buckets):
+            if value <= b:
+                data[0][n] += 1
+
+        data[1] += 1
+        data[2] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+
+        for key, (buckets, count, total) in self.observations.items():
+            for b, c in zip(self.buckets, buckets):
+                lines.append(f"{self.name}_bucket{format_labels(key + (('le', str(b)),))} {c}")
+            lines.append(f"{self.name}_bucket{format_labels(key + (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_count{format_labels(key)} {count}")
+            lines.append(f"{self.name}_sum{format_labels(key)} {total}")
+
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def _get(self, cls, name: str, description: str, **kwargs):
+        try:
+            return self.metrics[name]
+        except KeyError:
+            metric = self.metrics[name] = cls(name, description, **kwargs)
+            return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._get(Gauge, name, description)
+
+    def histogram(self, name: str, description: str, **kwargs) -> Histogram:
+        return self._get(Histogram, name, description, **kwargs)
+
+    def add_collector(self, func: Callable[[], None]):
+        self.collectors.append(func)
+
+    def render(self) -> str:
+
+        for func in self.collectors:
+            try:
+                func()
+            except Exception as e:
+                print(f"Falha ao coletar métricas: {repr(e)}")
+
+        lines = []
+
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+rest_latency = metrics.histogram("lavalink_rest_request_seconds", "Tempo das requisições de busca (loadtracks) no lavalink.")
+rest_failures = metrics.counter("lavalink_rest_failures_total", "Requisições de busca no lavalink que falharam.")
+resolve_latency = metrics.histogram("player_resolve_track_seconds", "Tempo para converter músicas parciais (ex: spotify).")
+db_latency = metrics.histogram("database_request_seconds", "Tempo das operações na database.")
+discord_messages = metrics.counter("player_controller_messages_total", "Mensagens do player enviadas/editadas no discord.")
+loop_lag = metrics.gauge("event_loop_lag_seconds", "Atraso atual do event loop.")
+loop_lag_histogram = metrics.histogram("event_loop_lag_histogram_seconds", "Atrasos medidos no event loop.")
+
+
+def pool_collector(bots: List[BotCore]):
+
+    players = metrics.gauge("music_players", "Players ativos por bot.")
+    queue_tracks = metrics.gauge("music_queue_tracks", "Quantidade de músicas nas filas dos players por bot.")
+    node_players = metrics.gauge("lavalink_node_players", "Players por servidor de música (dados do lavalink).")
+    node_playing = metrics.gauge("lavalink_node_playing_players", "Players tocando por servidor de música.")
+    node_local_players = metrics.gauge("lavalink_node_bot_players", "Players do bot por servidor de música.")
+    node_penalty = metrics.gauge("lavalink_node_penalty", "Penalidade de balanceamento de carga do servidor de música.")
+    player_bytes = metrics.gauge("music_player_memory_bytes", "Memória estimada dos players por bot (fila, tocadas, embeds e rpc).")
+    top_player_bytes = metrics.gauge("music_player_top_memory_bytes", "Memória estimada dos players que mais usam memória.")
+
+    def collect():
+
+        for m in (players, queue_tracks, node_players, node_playing, node_local_players, node_penalty, player_bytes,
+                  top_player_bytes):
+            m.clear()
+
+        usage_list = []
+
+        for bot in bots:
+
+            if not bot.bot_ready:
+                continue
+
+            bot_players = bot.music.players
+
+            players.set(len(bot_players), bot=bot.identifier)
+            queue_tracks.set(sum(len(p.queue) for p in bot_players.values()), bot=bot.identifier)
+
+            bot_usage = {}
+
+            for player in bot_players.values():
+                usage = player_memory(player)
+                usage_list.append((sum(usage.values()), bot.identifier, player.guild_id))
+                for kind, size in usage.items():
+                    bot_usage[kind] = bot_usage.get(kind, 0) + size
+
+            for kind, size in bot_usage.items():
+                player_bytes.set(size, bot=bot.identifier, kind=kind)
+
+            for node in bot.music.nodes.values():
+
+                node_local_players.set(len(node.players), bot=bot.identifier, node=node.identifier)
+
+                if node.stats:
+                    node_players.set(node.stats.players, node=node.identifier)
+                    node_playing.set(node.stats.playing_players, node=node.identifier)
+
+                node_penalty.set(node.penalty, node=node.identifier)
+
+        # apenas os maiores players (para não criar uma série por servidor).
+        for size, bot_id, guild_id in sorted(usage_list, reverse=True)[:10]:
+            top_player_bytes.set(size, bot=bot_id, guild=guild_id)
+
+    return collect
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import asyncio
 import traceback
 from typing import TYPE_CHECKING, Union
 
@@ -12,6 +11,11 @@ from utils.music.errors import NoVoice, NoPlayer, NoSource, NotRequester, NotDJo
 from utils.music.models import LavalinkPlayer
 from utils.db import DBModel
 from utils.others import CustomContext
+from utils.tracing import traced
+from utils.voice_index import RemoteBot
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
 
 
 def can_send_message(
@@ -47,17 +51,7 @@ async def check_requester_channel(ctx: CustomContext):
     return True
 
 
-def check_forum(inter, bot):
-
-    if not bot.check_bot_forum_post(inter.channel, raise_error=False):
-
-        if inter.channel.owner_id == bot.user.id:
-            inter.music_bot = bot
-            inter.music_guild = inter.guild
-            return True
-        else:
-            raise PoolException()
-
+@traced("check_pool_bots")
 async def check_pool_bots(inter, only_voiced: bool = False, check_player: bool = True, return_first=False):
 
     try:
@@ -92,41 +86,15 @@ async def check_pool_bots(inter, only_voiced: bool = False, check_player: bool =
 
     if isinstance(inter, CustomContext):
 
-        is_forum = check_forum(inter, inter.bot)
-
-        if is_forum:
-            return True
-
-        if not (mention_prefixed:=inter.message.content.startswith(tuple(inter.bot.pool.bot_mentions))):
-
-            msg_id = f"{inter.guild_id}-{inter.channel.id}-{inter.message.id}"
-
-            if msg_id in inter.bot.pool.message_ids:
-
-                def check(ctx, b_id):
-                    try:
-                        return f"{ctx.guild_id}-{ctx.channel.id}-{ctx.message.id}" == msg_id
-                    except AttributeError:
-                        return
-
-                inter.bot.dispatch("pool_payload_ready", inter)
-
-                try:
-                    ctx, bot_id = await inter.bot.wait_for("pool_dispatch", check=check, timeout=10)
-                except asyncio.TimeoutError:
-                    raise PoolException()
-
-                if not bot_id or bot_id != inter.bot.user.id:
-                    raise PoolException()
-
-                inter.music_bot = inter.bot
-                inter.music_guild = inter.guild
-
-                return True
-
-            inter.bot.pool.message_ids.add(msg_id)
+        if not inter.bot.check_bot_forum_post(inter.channel, raise_error=False):
+            # postagem de fórum criada por um dos bots do pool: o comando deve ser processado pelo bot que criou.
+            for bot in inter.bot.pool.bots:
+                if bot.user.id == inter.channel.owner_id:
+                    inter.music_bot = bot
+                    inter.music_guild = bot.get_guild(inter.guild_id)
+                    return True
 
-        else:
+        if mention_prefixed:=inter.message.content.startswith(tuple(inter.bot.pool.bot_mentions)):
 
             if not check_player and not only_voiced:
 
@@ -156,91 +124,85 @@ async def check_pool_bots(inter, only_voiced: bool = False, check_player: bool =
                 return True
 
     free_bot = []
+    remote_owner = False
 
-    for bot in sorted(inter.bot.pool.bots, key=lambda b: b.identifier):
+    voice_index = inter.bot.pool.voice_index
 
-        if not bot.bot_ready:
-            continue
+    # comandos por prefixo são recebidos por todos os processos do pool (modo POOL_WORKERS) e cada um faz a mesma
+    # escolha, apenas o processo do bot escolhido executa o comando.
+    routed = isinstance(inter, CustomContext) and not mention_prefixed
 
-        if bot.user.id == inter.bot.user.id and mention_prefixed:
-            continue
+    def allowed(b: Union[BotCore, RemoteBot]):
+        if isinstance(b, RemoteBot):
+            # o cache de membros do bot remoto está em outro processo, que faz a mesma verificação ao receber o comando.
+            return routed
+        if mention_prefixed and b.user.id == inter.bot.user.id:
+            return False
+        # o autor precisa estar no cache do servidor do bot (mesma verificação feita antes do voice_index).
+        return bool((guild := b.get_guild(inter.guild_id)) and guild.get_member(inter.author.id))
 
-        if not (guild := bot.get_guild(inter.guild_id)):
-            continue
+    if guild_bots := [b for b in voice_index.guild_bots(inter.guild_id) if allowed(b)]:
 
-        if not (author := guild.get_member(inter.author.id)):
-            continue
+        bot = guild_bots[0]
+        remote_owner = isinstance(bot, RemoteBot)
 
-        inter.author = author
+        if (guild := bot.get_guild(inter.guild_id)) and (author := guild.get_member(inter.author.id)):
+            inter.author = author
 
-        if not author.voice:
+        if not inter.author.voice:
 
-            inter.bot.dispatch("pool_dispatch", inter, None)
+            if remote_owner:
+                raise PoolException()
 
             if return_first:
                 inter.music_bot = bot
                 inter.music_guild = guild
-                free_bot.clear()
                 return True
 
             raise NoVoice()
 
-        if bot.user.id in author.voice.channel.voice_states:
+        for bot in voice_index.channel_bots(inter.author.voice.channel.id):
 
-            inter.music_bot = bot
-            inter.music_guild = guild
-            free_bot.clear()
-
-            if isinstance(inter, CustomContext) and bot.user.id != inter.bot.user.id and not mention_prefixed:
-                try:
-                    await inter.music_bot.wait_for(
-                        "pool_payload_ready", timeout=10,
-                        check=lambda ctx: f"{ctx.guild_id}-{ctx.channel.id}-{ctx.message.id}" == msg_id
-                    )
-                except asyncio.TimeoutError:
-                    pass
-                inter.music_bot.dispatch("pool_dispatch", inter, bot.user.id)
+            if not allowed(bot):
+                if isinstance(bot, RemoteBot):
+                    raise GenericError(f"**O bot <@{bot.user.id}> já está em uso no seu canal de voz.**")
+                continue
+
+            if isinstance(bot, RemoteBot):
                 raise PoolException()
-            return True
 
-        if only_voiced:
-            continue
+            inter.music_bot = bot
+            inter.music_guild = bot.get_guild(inter.guild_id)
+            return True
 
-        if not guild.me.voice:
-            free_bot.append([bot, guild])
+        if not only_voiced:
+            free_bot = [[b, b.get_guild(inter.guild_id)] for b in voice_index.free_bots(inter.guild_id) if allowed(b)]
 
     try:
         if not isinstance(inter, CustomContext) and not inter.guild.voice_client:
 
             if only_voiced:
-                inter.bot.dispatch("pool_dispatch", None)
                 raise NoPlayer()
 
             inter.music_bot = inter.bot
             inter.music_guild = inter.guild
-            inter.bot.dispatch("pool_dispatch", inter, None)
             return True
     except AttributeError:
         pass
 
     if free_bot:
+
+        if isinstance(free_bot[0][0], RemoteBot):
+            raise PoolException()
+
         inter.music_bot, inter.music_guild = free_bot.pop(0)
         free_bot.clear()
-        if isinstance(inter, CustomContext) and not mention_prefixed and inter.music_bot.user.id != inter.bot.user.id:
-            try:
-                await inter.music_bot.wait_for(
-                    "pool_payload_ready", timeout=10,
-                    check=lambda ctx: f"{ctx.guild_id}-{ctx.channel.id}-{ctx.message.id}" == msg_id
-                )
-            except asyncio.TimeoutError:
-                pass
-            inter.music_bot.dispatch("pool_dispatch", inter, inter.music_bot.user.id, bot=inter.music_bot)
-            raise PoolException()
         return True
 
-    elif check_player:
+    if remote_owner:
+        raise PoolException()
 
-        inter.bot.dispatch("pool_dispatch", inter, None)
+    if check_player:
 
         if return_first:
             inter.music_bot = inter.bot
@@ -287,8 +249,6 @@ async def check_pool_bots(inter, only_voiced: bool = False, check_player: bool =
         if extra_bots_counter:
             components = [disnake.ui.Button(custom_id="bot_invite", label="Precisa de mais bots de música? Clique aqui.")]
 
-    inter.bot.dispatch("pool_dispatch", inter, None)
-
     await inter.send(embed=disnake.Embed(description=msg, color=inter.bot.get_color()), components=components)
 
     raise PoolException()
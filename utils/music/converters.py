@@ -33,7 +33,7 @@ u_agent = generate_user_agent()
 async def google_search(bot, query: str, *, max_entries: int = 20) -> list:
 
     async with bot.session.get(
-            f"http://suggestqueries.google.com/complete/search?client=chrome&ds=yt&q={query}",
+            "http://suggestqueries.google.com/complete/search", params={"client": "chrome", "ds": "yt", "q": query},
             headers={'User-Agent': u_agent}) as r:
         return json.loads(await r.text())[1][:max_entries]
 
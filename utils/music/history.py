@@ -0,0 +1,260 @@
+from __future__ import annotations
+import asyncio
+import difflib
+import json
+import os
+import re
+import time
+import traceback
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiofiles
+
+TOKEN_REG = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_REG.findall(text.lower())
+
+
+def normalize(text: str) -> str:
+    return " ".join(tokenize(text))
+
+
+def close_matches(candidates: List[Tuple[str, List[str]]]) -> Set[str]:
+    return {m for token, words in candidates for m in difflib.get_close_matches(token, words, n=5, cutoff=0.75)}
+
+
+class PlayHistory:
+    """Índice das músicas tocadas no pool (salvo em arquivo) usado no autocomplete do /play e para carregar
+    músicas já conhecidas sem precisar fazer a busca no lavalink.
+
+    Cada música é identificada pelo uri e o índice de palavras permite buscas por prefixo (ex: "never gon") com busca
+    aproximada caso nenhuma música contenha todos os termos. Ao ultrapassar o limite de músicas as menos tocadas (e
+    tocadas há mais tempo) são removidas.
+    """
+
+    def __init__(self, path: str = "./play_history.json", max_size: int = 20000):
+        self.path = path
+        self.max_size = max_size
+        self.entries: Dict[str, dict] = {}
+        # palavra -> uris das músicas que contém a palavra no título/autor.
+        self.tokens: Dict[str, Set[str]] = {}
+        # "autor título" normalizado -> uri (buscas exatas no formato "autor - título" usado no autocomplete).
+        self.titles: Dict[str, str] = {}
+        self.sorted_tokens: Optional[List[str]] = None
+        self.dirty = False
+
+    def load(self):
+
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            traceback.print_exc()
+            return
+
+        for entry in entries:
+            self.index(entry)
+
+    def index(self, entry: dict):
+
+        self.entries[entry["uri"]] = entry
+
+        for token in tokenize(f"{entry['title']} {entry['author']}"):
+            self.tokens.setdefault(token, set()).add(entry["uri"])
+
+        self.titles[normalize(f"{entry['author']} {entry['title']}")] = entry["uri"]
+        self.sorted_tokens = None
+
+    def remove(self, uri: str):
+
+        entry = self.entries.pop(uri)
+
+        for token in tokenize(f"{entry['title']} {entry['author']}"):
+            try:
+                uris = self.tokens[token]
+            except KeyError:
+                continue
+            uris.discard(uri)
+            if not uris:
+                del self.tokens[token]
+
+        key = normalize(f"{entry['author']} {entry['title']}")
+
+        if self.titles.get(key) == uri:
+            del self.titles[key]
+
+        self.sorted_tokens = None
+
+    def add(self, track_id: str, info: dict):
+
+        if not self.max_size or not track_id or not info.get("uri") or info.get("isStream"):
+            return
+
+        try:
+            entry = self.entries[info["uri"]]
+        except KeyError:
+            entry = {"uri": info["uri"], "title": info["title"], "author": info["author"], "plays": 0}
+            self.index(entry)
+
+        entry["track"] = track_id
+        entry["info"] = {k: v for k, v in info.items() if k != "extra"}
+        entry["plays"] += 1
+        entry["last_played"] = int(time.time())
+
+        self.dirty = True
+
+        if len(self.entries) > self.max_size * 1.1:
+            self.compact()
+
+    @staticmethod
+    def score(entry: dict, now: float) -> float:
+        # músicas tocadas recentemente têm mais relevância (o peso cai pela metade a cada 30 dias).
+        return entry["plays"] * 0.5 ** ((now - entry.get("last_played", 0)) / 2592000)
+
+    def compact(self):
+
+        if len(self.entries) <= self.max_size:
+            return
+
+        now = time.time()
+
+        for entry in sorted(self.entries.values(), key=lambda e: self.score(e, now))[:len(self.entries) - self.max_size]:
+            self.remove(entry["uri"])
+
+        self.dirty = True
+
+    def prefix_uris(self, prefix: str) -> Set[str]:
+
+        if self.sorted_tokens is None:
+            self.sorted_tokens = sorted(self.tokens)
+
+        uris = set()
+
+        for i in range(bisect_left(self.sorted_tokens, prefix), len(self.sorted_tokens)):
+            token = self.sorted_tokens[i]
+            if not token.startswith(prefix):
+                break
+            uris.update(self.tokens[token])
+
+        return uris
+
+    def fuzzy_candidates(self, token: str) -> List[str]:
+        """Palavras com a mesma inicial e com tamanho próximo (as demais não atingem o cutoff usado no
+        close_matches)."""
+
+        if self.sorted_tokens is None:
+            self.sorted_tokens = sorted(self.tokens)
+
+        # ratio = 2 * iguais / (len(a) + len(b)) >= 0.75 só é possível com 0.6 * len(a) <= len(b) <= len(a) * 5/3.
+        min_len, max_len = (len(token) * 3 + 4) // 5, len(token) * 5 // 3
+
+        candidates = []
+
+        for i in range(bisect_left(self.sorted_tokens, token[0]), len(self.sorted_tokens)):
+            word = self.sorted_tokens[i]
+            if not word.startswith(token[0]):
+                break
+            if min_len <= len(word) <= max_len:
+                candidates.append(word)
+
+        return candidates
+
+    async def fuzzy_uris(self, tokens: List[str]) -> Set[str]:
+
+        candidates = [(token, self.fuzzy_candidates(token)) for token in tokens]
+
+        # o difflib é lento com muitas palavras e rodaria no event loop do bot.
+        matches = await asyncio.get_running_loop().run_in_executor(None, close_matches, candidates)
+
+        uris = set()
+
+        for match in matches:
+            uris.update(self.tokens.get(match, ()))
+
+        return uris
+
+    async def search(self, query: str, limit: int = 10) -> List[dict]:
+
+        if not (tokens := tokenize(query)):
+            return []
+
+        results: Optional[Set[str]] = None
+
+        for token in tokens:
+            uris = self.prefix_uris(token)
+            results = uris if results is None else results & uris
+            if not results:
+                break
+
+        if not results:
+            # nenhuma música com todos os termos: busca aproximada (erros de digitação).
+            results = set()
+            fuzzy_tokens = []
+
+            for token in tokens:
+                if uris := self.prefix_uris(token):
+                    results.update(uris)
+                else:
+                    fuzzy_tokens.append(token)
+
+            if fuzzy_tokens:
+                results.update(await self.fuzzy_uris(fuzzy_tokens))
+
+        now = time.time()
+
+        # músicas removidas (compact) durante a busca aproximada são ignoradas.
+        entries = (self.entries[uri] for uri in results if uri in self.entries)
+
+        return sorted(entries, key=lambda e: self.score(e, now), reverse=True)[:limit]
+
+    def get(self, query: str) -> Optional[dict]:
+        """Música do histórico para um link ou busca no formato "autor - título" (apenas o título pode corresponder a
+        outras músicas e nesse caso a busca deve ser feita no lavalink)."""
+
+        try:
+            return self.entries[query]
+        except KeyError:
+            pass
+
+        if " - " not in query:
+            return
+
+        try:
+            return self.entries[self.titles[normalize(query)]]
+        except KeyError:
+            return
+
+    async def save(self):
+
+        if not self.dirty:
+            return
+
+        self.dirty = False
+
+        # cópia das músicas para gerar o json fora do event loop (as músicas podem ser alteradas enquanto isso).
+        entries = [dict(e) for e in self.entries.values()]
+
+        data = await asyncio.get_running_loop().run_in_executor(None, json.dumps, entries)
+
+        # arquivo temporário para não corromper o histórico caso o processo seja finalizado durante a gravação.
+        async with aiofiles.open(f"{self.path}.tmp", "w") as f:
+            await f.write(data)
+
+        os.replace(f"{self.path}.tmp", self.path)
+
+    async def save_task(self, interval: int):
+
+        while True:
+
+            await asyncio.sleep(interval)
+
+            try:
+                self.compact()
+                await self.save()
+            except Exception:
+                traceback.print_exc()
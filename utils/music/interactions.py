@@ -1,7 +1,9 @@
+from __future__ import annotations
+import itertools
 import disnake
 from disnake.ext import commands
 from utils.music.converters import time_format, fix_characters
-from typing import List, Union, Optional
+from typing import Dict, List, Union, Optional
 
 
 class VolumeInteraction(disnake.ui.View):
@@ -34,15 +36,42 @@ class VolumeInteraction(disnake.ui.View):
         self.stop()
 
 
+class QueueJumpModal(disnake.ui.Modal):
+
+    def __init__(self, view: QueueInteraction):
+
+        self.view = view
+
+        super().__init__(
+            title="Ir para página/música",
+            custom_id="queue_jump",
+            timeout=120,
+            components=[
+                disnake.ui.TextInput(
+                    label="Número da página ou nome da música:",
+                    custom_id="queue_jump_query",
+                    max_length=100,
+                ),
+            ]
+        )
+
+    async def callback(self, inter: disnake.ModalInteraction):
+        await self.view.jump(inter, inter.text_values["queue_jump_query"].strip())
+
+
 class QueueInteraction(disnake.ui.View):
 
+    page_size = 8
+
     def __init__(self, player, user: disnake.Member, timeout=60):
 
         self.player = player
         self.user = user
-        self.pages = []
+        # páginas geradas apenas ao serem exibidas (descartadas quando a fila é alterada).
+        self.pages: Dict[int, str] = {}
+        self.version = None
         self.current = 0
-        self.max_page = len(self.pages) - 1
+        self.max_page = 0
         super().__init__(timeout=timeout)
         self.embed = disnake.Embed(color=player.bot.get_color(user.guild.me))
         self.update_pages()
@@ -50,30 +79,67 @@ class QueueInteraction(disnake.ui.View):
 
     def update_pages(self):
 
-        counter = 1
+        self.pages.clear()
+        self.version = self.player.queue.version
+        self.max_page = max(0, (len(self.player.queue) - 1) // self.page_size)
+        self.current = min(self.current, self.max_page)
 
-        entries = list(self.player.queue)
+    def render_page(self, page: int) -> str:
 
-        self.pages = [entries[i:i + 8] for i in range(0, len(entries), 8)]
+        start = page * self.page_size
+        queue = self.player.queue
 
-        for n, page in enumerate(self.pages):
+        txt = "\n"
 
-            txt = "\n"
-            for t in page:
-                txt += f"`{counter})` [`{fix_characters(t.title, limit=50)}`]({t.uri})\n" \
-                       f"`[{time_format(t.duration) if not t.is_stream else '🔴 Livestream'}]`" + \
-                       (f" - `Repetições: {t.track_loops}`" if t.track_loops else  "") + f" - <@{t.requester}>\n`---------`\n"
+        # acesso direto pelo índice (o islice percorreria a fila desde o início até a página).
+        for index in range(start, min(start + self.page_size, len(queue))):
+            t = queue[index]
+            txt += f"`{index + 1})` [`{fix_characters(t.title, limit=50)}`]({t.uri})\n" \
+                   f"`[{time_format(t.duration) if not t.is_stream else '🔴 Livestream'}]`" + \
+                   (f" - `Repetições: {t.track_loops}`" if t.track_loops else  "") + f" - <@{t.requester}>\n`---------`\n"
 
-                counter += 1
+        return txt
 
-            self.pages[n] = txt
+    def update_embed(self):
 
-        self.current = 0
-        self.max_page = len(self.pages) - 1
+        if self.version != self.player.queue.version:
+            self.update_pages()
+
+        try:
+            page = self.pages[self.current]
+        except KeyError:
+            page = self.pages[self.current] = self.render_page(self.current)
 
-    def update_embed(self):
         self.embed.title = f"**Músicas da fila [{self.current+1} / {self.max_page+1}]**"
-        self.embed.description = self.pages[self.current]
+        self.embed.description = page if self.player.queue else "**Não há músicas na fila.**"
+
+    def find_track(self, query: str) -> Optional[int]:
+
+        query = query.lower()
+        start = (self.current + 1) * self.page_size
+
+        # campos em minúsculo das músicas (lista mantida em cache pela fila enquanto ela não for alterada).
+        fields = self.player.queue.fields
+
+        # a busca começa na página seguinte à atual (para exibir as próximas ocorrências ao repetir a busca).
+        for index in itertools.chain(range(start, len(fields)), range(min(start, len(fields)))):
+            if query in fields[index].title or query in fields[index].author:
+                return index
+
+    async def jump(self, inter: disnake.ModalInteraction, query: str):
+
+        if query.isdigit():
+            self.current = min(max(int(query) - 1, 0), self.max_page)
+
+        elif (index := self.find_track(query)) is not None:
+            self.current = index // self.page_size
+
+        else:
+            await inter.send(f"Nenhuma música encontrada na fila com o nome: {query}", ephemeral=True)
+            return
+
+        self.update_embed()
+        await inter.response.edit_message(embed=self.embed)
 
     @disnake.ui.button(emoji='⏮️', style=disnake.ButtonStyle.grey)
     async def first(self, button, interaction: disnake.MessageInteraction):
@@ -109,6 +175,10 @@ class QueueInteraction(disnake.ui.View):
         self.update_embed()
         await interaction.response.edit_message(embed=self.embed)
 
+    @disnake.ui.button(emoji='🔎', label="Ir para", style=disnake.ButtonStyle.grey)
+    async def jump_to(self, button, interaction: disnake.MessageInteraction):
+        await interaction.response.send_modal(QueueJumpModal(self))
+
     @disnake.ui.button(emoji='⏹️', style=disnake.ButtonStyle.grey)
     async def stop_interaction(self, button, interaction: disnake.MessageInteraction):
 
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import itertools
+import sys
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+    from utils.music.models import LavalinkPlayer
+    from utils.music.queue_ops import TrackQueue
+
+# atributos que apontam para objetos compartilhados entre várias músicas (não entram na conta de cada música).
+shared_attrs = {"playlist"}
+
+
+def object_size(obj, seen: set) -> int:
+    """Tamanho aproximado (em bytes) do objeto incluindo o conteúdo de dicts/listas/tuplas/sets."""
+
+    if id(obj) in seen:
+        return 0
+
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(object_size(k, seen) + object_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(object_size(i, seen) for i in obj)
+
+    return size
+
+
+def track_size(track, seen: set) -> int:
+
+    size = object_size(track, seen)
+
+    attrs = {}
+
+    try:
+        attrs.update(vars(track))
+        size += sys.getsizeof(vars(track))
+    except TypeError:
+        pass
+
+    for cls in type(track).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in ((slots,) if isinstance(slots, str) else slots):
+            try:
+                attrs[name] = getattr(track, name)
+            except AttributeError:
+                continue
+
+    return size + sum(object_size(v, seen) for k, v in attrs.items() if k not in shared_attrs)
+
+
+def tracks_size(tracks: Iterable, sample: int = 100) -> int:
+    """Estimativa do tamanho das músicas usando uma amostra (distribuída pela lista) de até <sample> músicas."""
+
+    if not (total := len(tracks)):
+        return 0
+
+    items = list(itertools.islice(tracks, 0, None, max(total // sample, 1)))
+
+    seen = set()
+
+    return sys.getsizeof(tracks) + sum(track_size(t, seen) for t in items) * total // len(items)
+
+
+def queue_size(queue: TrackQueue) -> int:
+
+    # estimativa reaproveitada enquanto a fila não for alterada.
+    if queue.memory_estimate and queue.memory_estimate[0] == queue.version:
+        return queue.memory_estimate[1]
+
+    size = tracks_size(queue)
+
+    queue.memory_estimate = (queue.version, size)
+
+    return size
+
+
+def embeds_size(player: LavalinkPlayer) -> int:
+    """Tamanho dos dados do player controller guardados para comparar/reenviar a mensagem."""
+
+    seen = set()
+
+    size = object_size(player.last_data.get("content"), seen)
+
+    for embed in list(player.last_data.get("embeds") or []) + ([player.temp_embed] if player.temp_embed else []):
+        try:
+            size += sys.getsizeof(embed) + object_size(embed.to_dict(), seen)
+        except AttributeError:
+            size += object_size(embed, seen)
+
+    return size
+
+
+def player_memory(player: LavalinkPlayer) -> Dict[str, int]:
+
+    return {
+        "queue": queue_size(player.queue),
+        "played": tracks_size(player.played),
+        "embeds": embeds_size(player),
+        "rpc": object_size(player.rpc_user_data, set()) + object_size(player.rpc_user_timestamps, set()),
+    }
+
+
+def top_players(bots: List[BotCore], amount: int = 10) -> List[Tuple[LavalinkPlayer, Dict[str, int]]]:
+    """Players que estão usando mais memória (estimativa) entre os bots informados."""
+
+    results = [(player, player_memory(player)) for bot in bots for player in bot.music.players.values()]
+
+    results.sort(key=lambda r: sum(r[1].values()), reverse=True)
+
+    return results[:amount]
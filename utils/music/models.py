@@ -1,6 +1,8 @@
 from __future__ import annotations
 import datetime
+import os
 import random
+import time
 from itertools import cycle
 import disnake
 import asyncio
@@ -8,19 +10,97 @@ import wavelink
 from urllib import parse
 from utils.music.converters import fix_characters, time_format, get_button_style
 from utils.music.filters import AudioFilter
+from utils.music.queue_ops import TrackQueue, fair_order, fair_extend
 from utils.db import DBModel
+from utils.metrics import resolve_latency, discord_messages
 from utils.others import send_idle_embed, PlayerControls
 import traceback
 from collections import deque
-from typing import Optional, Union, TYPE_CHECKING, List
+from typing import Optional, Union, TYPE_CHECKING, List, AsyncIterator
 
 if TYPE_CHECKING:
     from utils.client import BotCore
 
 exclude_tags = ["remix", "edit", "extend"]
 
+# chaves do rpc que podem ser enviadas parcialmente nos deltas.
+rpc_patch_keys = ("track", "info")
 
-class PartialPlaylist:
+
+def rpc_diff(old: dict, new: dict) -> Optional[dict]:
+    """Retorna as alterações entre dois payloads de rpc (ou None caso seja necessário enviar um novo snapshot)."""
+
+    if old.get("op") != new.get("op") or any(k not in new for k in old):
+        return None
+
+    changes = {"set": {}, "patch": {}}
+
+    for k, v in new.items():
+
+        old_v = old.get(k)
+
+        if v == old_v:
+            continue
+
+        if k in rpc_patch_keys and isinstance(v, dict) and isinstance(old_v, dict) and \
+                not any(sk not in v for sk in old_v):
+            changes["patch"][k] = {sk: sv for sk, sv in v.items() if old_v.get(sk) != sv}
+        else:
+            changes["set"][k] = v
+
+    return changes
+
+
+class PlaylistLoader:
+    """Carregamento em partes das músicas de playlists grandes (para começar a tocar as primeiras músicas sem
+    aguardar a playlist inteira)."""
+
+    tracks: list
+    # partes restantes da playlist (None quando todas as músicas já foram carregadas).
+    pages: Optional[AsyncIterator[list]] = None
+    track_count: int = 0
+
+    @property
+    def pending(self) -> bool:
+        return self.pages is not None
+
+    @property
+    def total(self) -> int:
+        return max(self.track_count, len(self.tracks))
+
+    async def next_pages(self) -> AsyncIterator[list]:
+
+        if self.pages is None:
+            return
+
+        try:
+            async for tracks in self.pages:
+                self.tracks.extend(tracks)
+                yield tracks
+        finally:
+            self.pages = None
+            self.track_count = len(self.tracks)
+
+    async def fill(self):
+        async for _ in self.next_pages():
+            pass
+
+    def truncate(self, size: int):
+        """Mantém apenas as primeiras músicas da playlist (descartando as partes ainda não carregadas).
+
+        Não faz nada caso a playlist tenha até <size> músicas carregadas: as partes restantes continuam pendentes e o
+        limite deve ser verificado durante o carregamento (ex: player.playlist_stream_task).
+        """
+
+        if size >= len(self.tracks):
+            return
+
+        del self.tracks[size:]
+        self.pages = None
+        self.track_count = len(self.tracks)
+
+
+class PartialPlaylist(PlaylistLoader):
 
     def __init__(self, data: dict, url: str):
         self.data = data
@@ -145,18 +225,38 @@ class PartialTrack:
             return ""
 
 
-class LavalinkPlaylist:
+class LavalinkPlaylist(PlaylistLoader):
+
+    # quantidade de músicas criadas imediatamente no modo stream (o restante é criado em partes).
+    stream_first = 25
+    stream_chunk = 250
 
     def __init__(self, data: dict, **kwargs):
         self.data = data
         self.url = kwargs.pop("url")
+        stream = kwargs.pop("stream", False)
         try:
             if self.data['tracks'][0]['info'].get("sourceName") == "youtube":
                 self.url = f"https://www.youtube.com/playlist?list={parse.parse_qs(parse.urlparse(self.url).query)['list'][0]}"
         except IndexError:
             pass
-        self.tracks = [LavalinkTrack(
-            id_=track['track'], info=track['info'], playlist=self, **kwargs) for track in data['tracks']]
+
+        self.track_count = len(data['tracks'])
+
+        if stream and self.track_count > self.stream_first:
+            self.tracks = self.build_tracks(data['tracks'][:self.stream_first], kwargs)
+            self.pages = self.build_pages(data['tracks'][self.stream_first:], kwargs)
+        else:
+            self.tracks = self.build_tracks(data['tracks'], kwargs)
+
+    def build_tracks(self, tracks: List[dict], kwargs: dict) -> List[LavalinkTrack]:
+        return [LavalinkTrack(id_=track['track'], info=track['info'], playlist=self, **kwargs) for track in tracks]
+
+    async def build_pages(self, tracks: List[dict], kwargs: dict):
+
+        for i in range(0, len(tracks), self.stream_chunk):
+            yield self.build_tracks(tracks[i:i + self.stream_chunk], kwargs)
+            await asyncio.sleep(0)
 
     @property
     def name(self):
@@ -274,7 +374,7 @@ class LavalinkPlayer(wavelink.Player):
         self.static: bool = kwargs.pop('static', False)
         self.skin: str = kwargs.pop("skin", None) or self.bot.default_skin
         self.skin_static: str = kwargs.pop("skin_static", None) or self.bot.default_static_skin
-        self.queue: deque = deque()
+        self.queue: TrackQueue = TrackQueue()
         self.played: deque = deque(maxlen=20)
         self.nightcore: bool = False
         self.loop = False
@@ -288,6 +388,12 @@ class LavalinkPlayer(wavelink.Player):
         self.filters: dict = {}
         self.idle_task: Optional[asyncio.Task] = None
         self.members_timeout_task: Optional[asyncio.Task] = None
+        # alterações de membros no canal de voz agrupadas e processadas pelo voice_update_flush.
+        self.voice_members: Optional[int] = None
+        self.voice_joined: set = set()
+        self.voice_left: set = set()
+        self.voice_update_task: Optional[asyncio.Task] = None
+        self.playlist_stream_tasks: set = set()
         self.idle_timeout = self.bot.config["IDLE_TIMEOUT"]
         self.hint_rate = self.bot.config["HINT_RATE"]
         self.command_log: str = ""
@@ -304,6 +410,8 @@ class LavalinkPlayer(wavelink.Player):
         self.message_updater_task: Optional[asyncio.Task] = None
         # limitar apenas para dj's e staff's
         self.restrict_mode = kwargs.pop('restrict_mode', False)
+        # modo revezamento: a fila intercala as músicas de cada membro.
+        self.fair_queue: bool = kwargs.pop('fair_queue', False)
         self.ignore_np_once = False  # não invocar player controller em determinadas situações
         self.allowed_mentions = disnake.AllowedMentions(users=False, everyone=False, roles=False)
         self.uptime = kwargs.pop("uptime", None) or int(disnake.utils.utcnow().timestamp())
@@ -333,6 +441,13 @@ class LavalinkPlayer(wavelink.Player):
         self.hints: cycle = []
         self.current_hint: str = ""
         self.last_data: dict = {}
+        # controle de envio do rich presence por usuário (evitar reenviar dados repetidos/em excesso).
+        self.rpc_user_data: dict = {}
+        self.rpc_user_timestamps: dict = {}
+        self.rpc_pending_users: set = set()
+        self.rpc_flush_task: Optional[asyncio.Task] = None
+        # id usado pelo servidor de rpc para aplicar os deltas no último snapshot recebido.
+        self.rpc_session: str = os.urandom(6).hex()
         self.setup_features()
         self.setup_hints()
 
@@ -472,7 +587,8 @@ class LavalinkPlayer(wavelink.Player):
 
             if not track.id:
                 try:
-                    await self.resolve_track(track)
+                    with resolve_latency.time(bot=self.bot.identifier):
+                        await self.resolve_track(track)
                 except Exception as e:
                     try:
                         await self.text_channel.send(
@@ -665,6 +781,91 @@ class LavalinkPlayer(wavelink.Player):
         self.command_log = text
         self.command_log_emoji = emoji
 
+    def fair_queue_update(self):
+        """Reorganiza toda a fila na ordem do modo revezamento (usado apenas ao ativar o modo)."""
+
+        if not self.fair_queue or len(self.queue) < 2:
+            return
+
+        self.queue.replace(fair_order(list(self.queue), self.current.requester if self.current else None))
+
+    def add_tracks(self, tracks: list):
+        """Adiciona as músicas no final da fila.
+
+        No modo revezamento as músicas novas entram no final da rodada correspondente de cada membro e as músicas que
+        já estavam na fila continuam na mesma ordem (alterações feitas com move/skipto/shuffle são mantidas e as
+        próximas músicas adicionadas são distribuídas a partir da ordem atual). O process_next continua apenas pegando
+        a primeira música da fila.
+        """
+
+        if not self.fair_queue:
+            self.queue.extend(tracks)
+            return
+
+        fair_extend(self.queue, tracks, self.current.requester if self.current else None)
+
+    def queue_space(self, user_id: int) -> Optional[int]:
+        """Quantidade de músicas que o membro ainda pode adicionar na fila (None = sem limites)."""
+
+        limits = []
+
+        if max_size := self.bot.config["MAX_QUEUE_SIZE"]:
+            limits.append(max_size - len(self.queue))
+
+        if max_user_size := self.bot.config["MAX_USER_QUEUE_SIZE"]:
+            limits.append(max_user_size - sum(1 for t in self.queue if t.requester == user_id))
+
+        return max(min(limits), 0) if limits else None
+
+    def stream_playlist(self, playlist: Union[LavalinkPlaylist, PartialPlaylist]):
+        """Adiciona as músicas restantes da playlist na fila em segundo plano."""
+
+        task = self.bot.loop.create_task(self.playlist_stream_task(playlist))
+        self.playlist_stream_tasks.add(task)
+        task.add_done_callback(self.playlist_stream_tasks.discard)
+
+    async def playlist_stream_task(self, playlist: Union[LavalinkPlaylist, PartialPlaylist]):
+
+        name = fix_characters(playlist.name or "Spotify Playlist", 20)
+        progress_log = ""
+        requester = playlist.tracks[0].requester
+        limited = False
+
+        try:
+            async for tracks in playlist.next_pages():
+
+                if (space := self.queue_space(requester)) is not None and space < len(tracks):
+                    self.add_tracks(tracks[:space])
+                    playlist.truncate(len(playlist.tracks) - len(tracks) + space)
+                    limited = True
+                    break
+
+                self.add_tracks(tracks)
+
+                # não sobrescrever o log de outros comandos usados durante o carregamento.
+                if not progress_log or self.command_log == progress_log:
+                    progress_log = f"Carregando a playlist [`{name}`]({playlist.url}): " \
+                                   f"`{len(playlist.tracks)}/{playlist.total}`"
+                    self.set_command_log(text=progress_log, emoji="⏳")
+
+                self.update = True
+
+        except Exception:
+            traceback.print_exc()
+
+        if limited:
+            self.set_command_log(
+                text=f"Playlist [`{name}`]({playlist.url}): limite de músicas na fila atingido "
+                     f"(`{len(playlist.tracks)} música(s)` adicionada(s)).", emoji="⚠️"
+            )
+            self.update = True
+
+        elif progress_log and self.command_log == progress_log:
+            self.set_command_log(
+                text=f"Playlist [`{name}`]({playlist.url}) carregada: `{len(playlist.tracks)} música(s)`.", emoji="🎶"
+            )
+            self.update = True
+
     async def update_stage_topic(self):
 
         if not isinstance(self.guild.me.voice.channel, disnake.StageChannel):
@@ -751,6 +952,7 @@ class LavalinkPlayer(wavelink.Player):
                 self.last_data["embeds"].insert(0, self.temp_embed)
                 self.temp_embed = None
 
+            discord_messages.inc(bot=self.bot.identifier, action="send")
             await self.text_channel.send(allowed_mentions=self.allowed_mentions, **self.last_data)
 
         else:
@@ -841,6 +1043,7 @@ class LavalinkPlayer(wavelink.Player):
                 self.ignore_np_once = False
 
                 try:
+                    discord_messages.inc(bot=self.bot.identifier, action="edit")
                     if interaction and not interaction.response.is_done():
                         await interaction.response.edit_message(allowed_mentions=self.allowed_mentions, **self.last_data)
                     else:
@@ -870,6 +1073,8 @@ class LavalinkPlayer(wavelink.Player):
 
             await self.destroy_message()
 
+            discord_messages.inc(bot=self.bot.identifier, action="send")
+
             try:
                 self.message = await self.text_channel.send(allowed_mentions=self.allowed_mentions, **self.last_data)
             except:
@@ -954,6 +1159,11 @@ class LavalinkPlayer(wavelink.Player):
 
         vc = self.bot.get_channel(self.channel_id)
 
+        try:
+            self.rpc_flush_task.cancel()
+        except:
+            pass
+
         self.bot.loop.create_task(self.process_rpc(vc, close=True))
 
         try:
@@ -1018,6 +1228,14 @@ class LavalinkPlayer(wavelink.Player):
         except:
             pass
 
+        try:
+            self.voice_update_task.cancel()
+        except:
+            pass
+
+        for task in list(self.playlist_stream_tasks):
+            task.cancel()
+
     async def resolve_track(self, track: PartialTrack):
 
         if track.id:
@@ -1099,21 +1317,24 @@ class LavalinkPlayer(wavelink.Player):
 
         if close:
 
-            stats = {
-                "op": "close",
-                "bot_id": self.bot.user.id,
-                "bot_name": str(self.bot.user),
-                "thumb": thumb,
-            }
-
-            for u in users:
+            if not users:
+                return
 
-                stats["user"] = u
+            self.rpc_reset_users(users)
+            self.rpc_pending_users.difference_update(users)
 
-                try:
-                    await self.bot.ws_client.send(stats)
-                except Exception:
-                    traceback.print_exc()
+            try:
+                await self.bot.ws_client.send(
+                    {
+                        "op": "close",
+                        "bot_id": self.bot.user.id,
+                        "bot_name": str(self.bot.user),
+                        "thumb": thumb,
+                        "users": users,
+                    }
+                )
+            except Exception:
+                traceback.print_exc()
 
             return
 
@@ -1192,15 +1413,183 @@ class LavalinkPlayer(wavelink.Player):
                     }
                 )
 
+        now = time.monotonic()
+        interval = self.bot.config["RPC_UPDATE_INTERVAL"]
+
+        send_users = []
+
         for u in users:
 
-            stats["user"] = u
+            # ignorar usuários que já receberam exatamente os mesmos dados.
+            if self.rpc_user_data.get(u) == stats:
+                self.rpc_pending_users.discard(u)
+                continue
+
+            # atualização recente demais: será enviada posteriormente em conjunto pelo rpc_flush.
+            if now - self.rpc_user_timestamps.get(u, 0) < interval:
+                self.rpc_pending_users.add(u)
+                continue
+
+            self.rpc_pending_users.discard(u)
+            send_users.append(u)
+
+        if self.rpc_pending_users and not self.rpc_flush_task:
+            self.rpc_flush_task = self.bot.loop.create_task(self.rpc_flush(interval))
+
+        if not send_users:
+            return
+
+        snapshot_users = []
+        delta_groups = {}
+
+        # usuários que receberam o mesmo payload anteriormente compartilham o mesmo delta.
+        for u in send_users:
+            try:
+                last_stats = self.rpc_user_data[u]
+            except KeyError:
+                snapshot_users.append(u)
+            else:
+                delta_groups.setdefault(id(last_stats), (last_stats, []))[1].append(u)
+
+            self.rpc_user_data[u] = stats
+            self.rpc_user_timestamps[u] = now
+
+        payloads = []
+
+        for last_stats, group_users in delta_groups.values():
+
+            changes = rpc_diff(last_stats, stats)
+
+            if changes is None:
+                snapshot_users.extend(group_users)
+                continue
+
+            payloads.append(
+                {
+                    "op": "delta",
+                    "bot_id": self.bot.user.id,
+                    "session": self.rpc_session,
+                    "users": group_users,
+                    **changes
+                }
+            )
 
+        if snapshot_users:
+            payloads.append({**stats, "session": self.rpc_session, "users": snapshot_users})
+
+        # um único payload por grupo de usuários (o servidor de rpc distribui para cada usuário).
+        for payload in payloads:
             try:
-                await self.bot.ws_client.send(stats)
+                await self.bot.ws_client.send(payload)
             except Exception:
                 traceback.print_exc()
 
+    def rpc_reset_users(self, users: List[int] = None):
+
+        if users is None:
+            self.rpc_user_data.clear()
+            self.rpc_user_timestamps.clear()
+            return
+
+        for u in users:
+            self.rpc_user_data.pop(u, None)
+            self.rpc_user_timestamps.pop(u, None)
+
+    async def rpc_flush(self, delay: float):
+
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.rpc_flush_task = None
+
+        users = list(self.rpc_pending_users)
+        self.rpc_pending_users.clear()
+
+        try:
+            voice_channel = self.bot.get_channel(self.channel_id) or self.guild.voice_client.channel
+        except AttributeError:
+            return
+
+        if not voice_channel:
+            return
+
+        users = [u for u in users if u in voice_channel.voice_states]
+
+        if users:
+            await self.process_rpc(voice_channel, users=users)
+
+    def reset_voice_members(self):
+
+        self.voice_joined.clear()
+        self.voice_left.clear()
+
+        try:
+            self.voice_members = len([m for m in self.guild.me.voice.channel.members if not m.bot])
+        except AttributeError:
+            self.voice_members = 0
+
+    def voice_member_update(self, member_id: int, joined: bool):
+
+        if self.voice_members is None:
+            # a contagem inicial já inclui a alteração atual.
+            self.reset_voice_members()
+        else:
+            self.voice_members += 1 if joined else -1
+
+        # membros que entraram e saíram (ou vice-versa) antes do processamento são desconsiderados.
+        if joined:
+            if member_id in self.voice_left:
+                self.voice_left.remove(member_id)
+            else:
+                self.voice_joined.add(member_id)
+        elif member_id in self.voice_joined:
+            self.voice_joined.remove(member_id)
+        else:
+            self.voice_left.add(member_id)
+
+        if not self.voice_update_task:
+            self.voice_update_task = self.bot.loop.create_task(
+                self.voice_update_flush(self.bot.config["VOICE_UPDATE_DELAY"])
+            )
+
+    def check_members_timeout(self):
+
+        if self.voice_members:
+            try:
+                self.members_timeout_task.cancel()
+            except AttributeError:
+                pass
+            self.members_timeout_task = None
+
+        elif not self.members_timeout_task:
+            self.members_timeout_task = self.bot.loop.create_task(self.members_timeout())
+
+    async def voice_update_flush(self, delay: float):
+
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.voice_update_task = None
+
+        joined, self.voice_joined = self.voice_joined, set()
+        left, self.voice_left = self.voice_left, set()
+
+        self.check_members_timeout()
+
+        if self.is_closing or not (joined or left):
+            return
+
+        try:
+            voice_channel = self.guild.me.voice.channel
+        except AttributeError:
+            return
+
+        if left:
+            await self.process_rpc(voice_channel, users=list(left), close=True)
+
+        # apenas uma atualização para os membros do canal (incluindo os que entraram).
+        await self.process_rpc(voice_channel)
+
     async def track_end(self):
 
         self.votes.clear()
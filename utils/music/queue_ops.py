@@ -0,0 +1,323 @@
+from __future__ import annotations
+import itertools
+import random
+from collections import deque
+from operator import itemgetter
+from typing import Callable, Collection, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class TrackFields(NamedTuple):
+    title: str
+    author: str
+    requester: int
+    playlist_name: str
+    duration: int
+
+
+class TrackQueue(deque):
+    """Fila de músicas do player com contador de alterações (version), usado para saber quando as informações
+    calculadas a partir da fila (ex: páginas do /queue display e campos usados nos filtros) precisam ser atualizadas."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self._fields: Optional[List[TrackFields]] = None
+        self._fields_version = -1
+        # (version, bytes) da última estimativa de memória da fila (utils.music.memory).
+        self.memory_estimate: Optional[Tuple[int, int]] = None
+        # (version, last_requester, contagem por membro, fim de cada rodada) usado no fair_extend.
+        self.fair_rounds: Optional[Tuple[int, Optional[int], Dict[int, int], List[int]]] = None
+
+    @property
+    def fields(self) -> List[TrackFields]:
+        """Campos das músicas (na mesma ordem da fila) com título, autor e playlist em minúsculo."""
+
+        if self._fields_version != self.version:
+            self._fields = [
+                TrackFields(t.title.lower(), t.author.lower(), t.requester, t.playlist_name.lower(), t.duration)
+                for t in self
+            ]
+            self._fields_version = self.version
+
+        return self._fields
+
+    def replace(self, tracks: list):
+        """Substitui todo o conteúdo da fila."""
+        deque.clear(self)
+        deque.extend(self, tracks)
+        self.version += 1
+
+
+def queue_mutator(name: str):
+
+    method = getattr(deque, name)
+
+    def mutator(self: TrackQueue, *args):
+        self.version += 1
+        return method(self, *args)
+
+    mutator.__name__ = name
+    return mutator
+
+
+for _name in ("append", "appendleft", "extend", "extendleft", "pop", "popleft", "remove", "insert", "clear", "rotate",
+              "reverse", "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(TrackQueue, _name, queue_mutator(_name))
+
+
+def compile_filter(
+        song_name: str = None, song_author: str = None, user_id: int = None, playlist: str = None,
+        min_duration: int = None, max_duration: int = None, voice_members: Collection[int] = None
+) -> Callable[[TrackFields], bool]:
+    """Gera uma única função que verifica todos os filtros informados (usados nos comandos clear/move/remove).
+    Todos os filtros informados precisam ser atendidos.
+
+    playlist: nome completo da playlist (sem diferenciar maiúsculas/minúsculas).
+    min_duration: músicas com duração igual ou menor (em ms).
+    max_duration: músicas com duração igual ou maior (em ms).
+    voice_members: incluir apenas músicas pedidas por membros que não estão nessa lista.
+    """
+
+    checks = []
+
+    if song_name:
+        song_name = song_name.lower()
+        checks.append(lambda f: song_name in f.title)
+
+    if song_author:
+        song_author = song_author.lower()
+        checks.append(lambda f: song_author in f.author)
+
+    if user_id:
+        checks.append(lambda f: f.requester == user_id)
+
+    if playlist:
+        playlist = playlist.lower()
+        checks.append(lambda f: f.playlist_name == playlist)
+
+    if min_duration is not None:
+        checks.append(lambda f: f.duration <= min_duration)
+
+    if max_duration is not None:
+        checks.append(lambda f: f.duration >= max_duration)
+
+    if voice_members is not None:
+        checks.append(lambda f: f.requester not in voice_members)
+
+    if not checks:
+        return lambda f: True
+
+    if len(checks) == 1:
+        return checks[0]
+
+    return lambda f: all(check(f) for check in checks)
+
+
+def filter_indexes(queue: TrackQueue, predicate: Callable[[TrackFields], bool], start: int = 0,
+                   end: int = None) -> List[int]:
+    fields = queue.fields
+    return [i for i in range(start, len(fields) if end is None else min(end, len(fields))) if predicate(fields[i])]
+
+
+def remove_indexes(queue: TrackQueue, indexes: Sequence[int]) -> list:
+    """Remove as músicas das posições informadas reconstruindo a fila (O(n)) e retorna as músicas removidas."""
+
+    if not indexes:
+        return []
+
+    selected = set(indexes)
+
+    removed = []
+    kept = []
+
+    for i, track in enumerate(queue):
+        (removed if i in selected else kept).append(track)
+
+    queue.replace(kept)
+
+    return removed
+
+
+def move_indexes(queue: TrackQueue, indexes: Sequence[int], position: int) -> list:
+    """Move as músicas das posições informadas (mantendo a ordem entre elas) para a posição de destino (iniciando em 1)
+    da fila sem elas e retorna as músicas movidas."""
+
+    if not indexes:
+        return []
+
+    selected = set(indexes)
+
+    moved = []
+    kept = []
+
+    for i, track in enumerate(queue):
+        (moved if i in selected else kept).append(track)
+
+    position = max(position - 1, 0)
+
+    queue.replace(kept[:position] + moved + kept[position:])
+
+    return moved
+
+
+def shuffle_queue(queue: TrackQueue, smart: bool = False, rng: random.Random = random):
+    """Mistura as músicas da fila.
+
+    A mistura é feita em uma lista com as referências das músicas (o random.shuffle direto na deque acessa as posições
+    por índice, que na deque não é O(1)). No modo smart as músicas de cada membro (e de cada artista) ficam
+    distribuídas pela fila ao invés de agrupadas.
+    """
+
+    tracks = list(queue)
+
+    if smart:
+        tracks = smart_shuffle(tracks, rng)
+    else:
+        rng.shuffle(tracks)
+
+    queue.replace(tracks)
+
+
+def group_by(tracks: list, key: Callable) -> List[list]:
+
+    groups = {}
+
+    for t in tracks:
+        groups.setdefault(key(t), []).append(t)
+
+    return list(groups.values())
+
+
+def spread(groups: List[list], rng: random.Random) -> list:
+    """Intercala os grupos (mantendo a ordem dentro de cada grupo) distribuindo os itens de cada grupo em intervalos
+    iguais ao longo da lista final, com um deslocamento aleatório por grupo."""
+
+    total = sum(len(g) for g in groups)
+
+    positions = []
+
+    for group in groups:
+        step = total / len(group)
+        offset = rng.random() * step
+        positions.extend((offset + i * step, item) for i, item in enumerate(group))
+
+    positions.sort(key=itemgetter(0))
+
+    return [item for _, item in positions]
+
+
+def smart_shuffle(tracks: list, rng: random.Random = random) -> list:
+
+    groups = []
+
+    for requester_tracks in group_by(tracks, lambda t: t.requester):
+
+        author_groups = group_by(requester_tracks, lambda t: t.author.lower())
+
+        for group in author_groups:
+            rng.shuffle(group)
+
+        groups.append(spread(author_groups, rng))
+
+    return spread(groups, rng)
+
+
+def fair_order(tracks: list, last_requester: int = None) -> list:
+    """Ordem do modo revezamento: uma música de cada membro por rodada, mantendo a ordem das músicas de cada membro e
+    a ordem em que os membros aparecem na fila (o membro informado em last_requester fica por último)."""
+
+    groups = group_by(tracks, lambda t: t.requester)
+
+    if last_requester is not None:
+        groups.sort(key=lambda g: g[0].requester == last_requester)
+
+    return [t for round_tracks in itertools.zip_longest(*groups) for t in round_tracks if t is not None]
+
+
+def fair_rounds(queue: TrackQueue, last_requester: int = None) -> Tuple[Dict[int, int], List[int]]:
+    """Quantidade de músicas de cada membro e a posição final (exclusiva) de cada rodada do modo revezamento.
+
+    A rodada de uma música é a quantidade de músicas do mesmo membro antes dela na fila (a música atual conta como
+    rodada 0 do last_requester), então a ordem atual da fila é respeitada mesmo após o uso de move/skipto/shuffle.
+    """
+
+    if queue.fair_rounds and queue.fair_rounds[:2] == (queue.version, last_requester):
+        return queue.fair_rounds[2], queue.fair_rounds[3]
+
+    counts = {}
+    # posição (+1) da última música de cada rodada.
+    last = []
+
+    for i, t in enumerate(queue):
+
+        r = counts.get(t.requester, 0) + (t.requester == last_requester)
+        counts[t.requester] = counts.get(t.requester, 0) + 1
+
+        while len(last) <= r:
+            last.append(0)
+
+        last[r] = i + 1
+
+    ends = list(itertools.accumulate(last, max))
+
+    queue.fair_rounds = (queue.version, last_requester, counts, ends)
+
+    return counts, ends
+
+
+def fair_extend(queue: TrackQueue, tracks: list, last_requester: int = None):
+    """Adiciona as músicas no modo revezamento: cada música vai para o final da rodada seguinte do membro, sem alterar
+    a ordem das músicas que já estavam na fila.
+
+    Músicas em rodadas que ainda não existem na fila (ex: o restante de uma playlist grande) são apenas adicionadas no
+    final, a fila só é reconstruída quando muitas músicas precisam entrar entre as demais.
+    """
+
+    for requester_tracks in group_by(tracks, lambda t: t.requester):
+
+        counts, ends = fair_rounds(queue, last_requester)
+
+        requester = requester_tracks[0].requester
+        first_round = counts.get(requester, 0) + (requester == last_requester)
+        middle = min(max(len(ends) - first_round, 0), len(requester_tracks))
+
+        if middle > 64:
+
+            items = list(queue)
+            new_items = []
+            start = 0
+
+            for i, track in enumerate(requester_tracks[:middle]):
+                end = ends[first_round + i]
+                new_items.extend(items[start:end])
+                new_items.append(track)
+                start = end
+
+            new_items.extend(items[start:])
+            new_items.extend(requester_tracks[middle:])
+
+            queue.replace(new_items)
+
+        else:
+
+            for i, track in enumerate(requester_tracks[:middle]):
+                queue.insert(ends[first_round + i] + i, track)
+
+            queue.extend(requester_tracks[middle:])
+
+        # cada música inserida no meio da fila desloca o fim da própria rodada e das rodadas seguintes.
+        if middle:
+            shifted = first_round + middle
+            ends[first_round:shifted] = [e + i + 1 for i, e in enumerate(ends[first_round:shifted])]
+            ends[shifted:] = [e + middle for e in ends[shifted:]]
+
+        size = len(queue) - len(requester_tracks) + middle
+
+        for i in range(middle, len(requester_tracks)):
+            while len(ends) < first_round + i:
+                ends.append(ends[-1] if ends else 0)
+            ends.append(size + i - middle + 1)
+
+        counts[requester] = counts.get(requester, 0) + len(requester_tracks)
+
+        queue.fair_rounds = (queue.version, last_requester, counts, ends)
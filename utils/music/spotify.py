@@ -4,6 +4,9 @@ import asyncspotify
 from utils.music.converters import fix_characters
 from utils.music.errors import MissingSpotifyClient, GenericError
 from asyncspotify import Client, ClientCredentialsFlow
+from asyncspotify.http import Route
+from asyncspotify.mixins import valid_item
+from asyncspotify.track import PlaylistTrack
 from utils.music.models import PartialPlaylist, PartialTrack
 from typing import Optional, TYPE_CHECKING
 
@@ -12,11 +15,72 @@ if TYPE_CHECKING:
 
 spotify_regex = re.compile("https://open.spotify.com?.+(album|playlist|artist|track)/([a-zA-Z0-9]+)")
 
+# quantidade de músicas retornadas junto com os dados da playlist (e em cada página adicional).
+playlist_page_size = 100
+
 
 def query_spotify_track(func, url_id: str):
     return func(url_id)
 
 
+def spotify_track(t, requester: int, playlist: PartialPlaylist) -> PartialTrack:
+
+    try:
+        thumb = t.album.images[1].url
+    except IndexError:
+        thumb = ""
+
+    track = PartialTrack(
+        uri=t.link,
+        author=t.artists[0].name or "Unknown Artist",
+        title=t.name,
+        thumb=thumb,
+        duration=t.duration.total_seconds() * 1000,
+        source_name="spotify",
+        requester=requester,
+        playlist=playlist
+    )
+
+    try:
+        track.info["extra"]["album"] = {
+            "name": t.album.name,
+            "url": t.album.external_urls["spotify"]
+        }
+    except (AttributeError, KeyError):
+        pass
+
+    if t.artists[0].name:
+        track.info["extra"]["authors"] = [fix_characters(i.name) for i in t.artists if f"feat. {i.name.lower()}" not in t.name.lower()]
+        track.info["extra"]["authors_md"] = ", ".join(f"[`{a.name}`]({a.link})" for a in t.artists)
+    else:
+        track.info["extra"]["authors"] = ["Unknown Artist"]
+        track.info["extra"]["authors_md"] = "`Unknown Artist`"
+
+    return track
+
+
+async def spotify_playlist_pages(bot: BotCore, playlist: PartialPlaylist, playlist_id: str, requester: int,
+                                 offset: int):
+    """Páginas restantes de uma playlist do spotify (a api retorna apenas as 100 primeiras músicas da playlist)."""
+
+    while offset < playlist.track_count:
+
+        data = await bot.spotify.http.request(
+            Route("GET", f"playlists/{playlist_id}/tracks", offset=offset, limit=playlist_page_size)
+        )
+
+        if not data["items"]:
+            break
+
+        offset += len(data["items"])
+
+        yield [spotify_track(PlaylistTrack(bot.spotify, item), requester, playlist)
+               for item in data["items"] if valid_item(item)]
+
+        if not data["next"]:
+            break
+
+
 async def process_spotify(bot: BotCore, requester: int, query: str):
 
     if not (matches := spotify_regex.match(query)):
@@ -118,40 +182,11 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
 
     playlist = PartialPlaylist(data, url=query)
 
-    for t in tracks_data:
-
-        try:
-            thumb = t.album.images[1].url
-        except IndexError:
-            thumb = ""
-
-        track = PartialTrack(
-            uri=t.link,
-            author=t.artists[0].name or "Unknown Artist",
-            title=t.name,
-            thumb=thumb,
-            duration=t.duration.total_seconds() * 1000,
-            source_name="spotify",
-            requester=requester,
-            playlist=playlist
-        )
-
-        try:
-            track.info["extra"]["album"] = {
-                "name": t.album.name,
-                "url": t.album.external_urls["spotify"]
-            }
-        except (AttributeError, KeyError):
-            pass
-
-        if t.artists[0].name:
-            track.info["extra"]["authors"] = [fix_characters(i.name) for i in t.artists if f"feat. {i.name.lower()}" not in t.name.lower()]
-            track.info["extra"]["authors_md"] = ", ".join(f"[`{a.name}`]({a.link})" for a in t.artists)
-        else:
-            track.info["extra"]["authors"] = ["Unknown Artist"]
-            track.info["extra"]["authors_md"] = "`Unknown Artist`"
+    playlist.tracks = [spotify_track(t, requester, playlist) for t in tracks_data]
 
-        playlist.tracks.append(track)
+    if url_type == "playlist" and (result.track_count or 0) > playlist_page_size:
+        playlist.track_count = result.track_count
+        playlist.pages = spotify_playlist_pages(bot, playlist, url_id, requester, offset=playlist_page_size)
 
     return playlist
 
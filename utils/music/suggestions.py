@@ -0,0 +1,142 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from utils.music.converters import google_search
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+
+class SuggestionService:
+    """Sugestões de busca (google) usadas no autocomplete dos comandos de tocar música.
+
+    Os resultados ficam em cache e são reaproveitados nas buscas que continuam um termo já pesquisado, buscas iguais
+    simultâneas compartilham a mesma requisição e a busca anterior de um usuário é cancelada ao digitar novamente.
+    Caso o serviço demore para responder são exibidas as músicas tocadas recentemente no pool que contém o termo.
+    """
+
+    cache_size = 2000
+    cache_ttl = 3600
+    # mínimo de resultados de um termo anterior para dispensar uma nova requisição.
+    min_prefix_results = 5
+    timeout = 1.5
+
+    def __init__(self):
+        self.cache: OrderedDict[str, Tuple[float, List[str]]] = OrderedDict()
+        self.pending: Dict[str, asyncio.Task] = {}
+        self.waiters: Dict[str, int] = {}
+        self.user_tasks: Dict[int, asyncio.Task] = {}
+        self.history: deque = deque(maxlen=500)
+
+    def add_history(self, title: str):
+
+        try:
+            self.history.remove(title)
+        except ValueError:
+            pass
+
+        self.history.appendleft(title)
+
+    def history_results(self, query: str) -> List[str]:
+        return [t[:99] for t in self.history if query in t.lower()]
+
+    def get_cache(self, query: str) -> Optional[List[str]]:
+
+        try:
+            expires, results = self.cache[query]
+        except KeyError:
+            return
+
+        if expires < time.monotonic():
+            del self.cache[query]
+            return
+
+        self.cache.move_to_end(query)
+        return results
+
+    def set_cache(self, query: str, results: List[str]):
+
+        self.cache[query] = (time.monotonic() + self.cache_ttl, results)
+        self.cache.move_to_end(query)
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def prefix_results(self, query: str) -> List[str]:
+
+        for size in range(len(query) - 1, 0, -1):
+            if (results := self.get_cache(query[:size])) is not None:
+                return [r for r in results if r.lower().startswith(query)]
+
+        return []
+
+    async def fetch(self, bot: BotCore, query: str) -> List[str]:
+        results = await google_search(bot, query)
+        self.set_cache(query, results)
+        return results
+
+    def fetch_done(self, query: str, task: asyncio.Task):
+
+        self.pending.pop(query, None)
+
+        # evitar o aviso de exception não recuperada quando ninguém aguarda mais a requisição.
+        if not task.cancelled():
+            task.exception()
+
+    async def wait_fetch(self, bot: BotCore, query: str) -> List[str]:
+
+        try:
+            task = self.pending[query]
+        except KeyError:
+            task = self.pending[query] = bot.loop.create_task(self.fetch(bot, query))
+            task.add_done_callback(lambda t: self.fetch_done(query, t))
+
+        self.waiters[query] = self.waiters.get(query, 0) + 1
+
+        try:
+            # ao esgotar o tempo a requisição continua em segundo plano (para preencher o cache).
+            return await asyncio.wait_for(asyncio.shield(task), timeout=self.timeout)
+        except asyncio.CancelledError:
+            if self.waiters[query] == 1:
+                task.cancel()
+            raise
+        finally:
+            if (waiters := self.waiters.pop(query) - 1) > 0:
+                self.waiters[query] = waiters
+
+    async def search(self, bot: BotCore, query: str, user_id: int, *, max_entries: int = 20) -> List[str]:
+
+        query = query.strip().lower()
+
+        if not query:
+            return []
+
+        if (results := self.get_cache(query)) is not None:
+            return results[:max_entries]
+
+        prefix_results = self.prefix_results(query)
+
+        if len(prefix_results) >= self.min_prefix_results:
+            return prefix_results[:max_entries]
+
+        # o discord exibe apenas a resposta do último autocomplete enviado pelo usuário.
+        try:
+            self.user_tasks.pop(user_id).cancel()
+        except KeyError:
+            pass
+
+        current_task = self.user_tasks[user_id] = asyncio.current_task()
+
+        try:
+            results = await self.wait_fetch(bot, query)
+        except Exception:
+            # serviço lento ou indisponível.
+            results = prefix_results or self.history_results(query)
+        finally:
+            if self.user_tasks.get(user_id) is current_task:
+                del self.user_tasks[user_id]
+
+        return results[:max_entries]
@@ -1,7 +1,15 @@
 import asyncio
+import heapq
+import multiprocessing
 import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
 import disnake
-import yt_dlp
 from utils.music.errors import GenericError
 from utils.music.models import PartialTrack
 
@@ -34,70 +42,416 @@ YTDL_OPTS = {
     }
 }
 
-class YTDLTools:
+# instância do YoutubeDL reutilizada em cada processo do pool de extração.
+ytdl_instance = None
 
-    def __init__(self):
-        self.extractors = yt_dlp.list_extractors()
 
-    def extract_info(self, url: str):
+def init_worker():
 
-        with yt_dlp.YoutubeDL(YTDL_OPTS) as ytdl:
-            return ytdl.extract_info(url=url, download=False)
+    global ytdl_instance
 
-    async def get_track_info(self, url: str, user: disnake.Member, loop = None):
+    import yt_dlp
 
-        for e in self.extractors:
+    ytdl_instance = yt_dlp.YoutubeDL(dict(YTDL_OPTS, socket_timeout=15))
 
-            if not e._VALID_URL:
-                continue
 
-            if not (matches := re.compile(e._VALID_URL).match(url)):
-                continue
+def extract_worker(url: str):
+
+    try:
+        data = ytdl_instance.extract_info(url=url, download=False)
+    except Exception as e:
+        # as exceptions do yt-dlp incluem o traceback (que não pode ser enviado ao processo principal).
+        raise Exception(str(e)) from None
+
+    # remove objetos internos do yt-dlp para o resultado poder ser enviado ao processo principal.
+    return ytdl_instance.sanitize_info(data)
+
+# marcador para trechos variáveis do host (ex: subdomínios [^/]+).
+WILDCARD = "\x00"
+
+URL_PREFIXES = ("https?://", "(?:https?://)?", "https://", "http://", "(?:https?:)?//")
+
+
+class HostParser:
+    """Expande a parte do host de um _VALID_URL nos hosts possíveis.
+
+    Suporta apenas literais, grupos, alternativas e o quantificador "?" (partes variáveis que não podem conter "/"
+    viram WILDCARD), qualquer outra coisa invalida a expansão e o extractor fica na lista genérica.
+    """
+
+    max_hosts = 256
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+
+    def peek(self, amount: int = 1) -> str:
+        return self.pattern[self.pos:self.pos + amount]
+
+    def is_end(self, depth: int) -> bool:
+
+        if self.pos >= len(self.pattern):
+            return True
+
+        c = self.pattern[self.pos]
+
+        if depth == 0 and c in "/[$:#":
+            return True
+
+        if depth == 0 and c == "(":
+            # grupos que já fazem parte do caminho da url: (?:/...), (?:[/?#]...), (?:$|...) etc.
+            inner = self.pattern[self.pos + 1:]
+            if inner.startswith("?:"):
+                inner = inner[2:]
+            elif inner.startswith("?P<"):
+                inner = inner[inner.find(">") + 1:]
+            return inner.startswith(("/", "[", "$", "\\?", "#", ":", "(?:/", "\\/"))
+
+        return False
+
+    def parse_alternatives(self, depth: int) -> Set[str]:
+
+        options = self.parse_sequence(depth)
+
+        while self.peek() == "|":
+            self.pos += 1
+            options |= self.parse_sequence(depth)
+
+        return options
+
+    def parse_sequence(self, depth: int) -> Set[str]:
+
+        result = {""}
+
+        while not self.is_end(depth) and self.peek() not in ("|", ")"):
+
+            atom = self.parse_atom(depth)
+
+            quantifier = self.peek()
+
+            if quantifier == "?":
+                self.pos += 1
+                atom = atom | {""}
+            elif quantifier in ("*", "+", "{"):
+                if not atom <= {WILDCARD}:
+                    raise ValueError("quantificador não suportado")
+                self.pos += 1
+                if quantifier == "{":
+                    self.pos = self.pattern.index("}", self.pos) + 1
+                if self.peek() == "?":
+                    self.pos += 1
+
+            result = {a + b for a in result for b in atom}
+
+            if len(result) > self.max_hosts:
+                raise ValueError("hosts demais")
+
+        return result
+
+    def parse_atom(self, depth: int) -> Set[str]:
+
+        c = self.peek()
+
+        if c == "(":
+
+            if self.peek(3) == "(?:":
+                self.pos += 3
+            elif self.peek(3) == "(?P":
+                self.pos = self.pattern.index(">", self.pos) + 1
+            elif self.peek(2) == "(?":
+                raise ValueError("grupo não suportado")
+            else:
+                self.pos += 1
+
+            options = self.parse_alternatives(depth + 1)
+
+            if self.peek() != ")":
+                raise ValueError("grupo não finalizado")
+
+            self.pos += 1
+            return options
+
+        if c == "[":
+            end = self.pattern.index("]", self.pos + 2)
+            char_class = self.pattern[self.pos:end + 1]
+            self.pos = end + 1
+            # apenas classes que não permitem "/" (ex: [^/], [^/?#], [a-z0-9-]).
+            if char_class.startswith("[^") and "/" in char_class or not char_class.startswith("[^") and "/" not in char_class:
+                return {WILDCARD}
+            raise ValueError("classe não suportada")
+
+        if c == "\\":
+            escaped = self.pattern[self.pos + 1:self.pos + 2]
+            self.pos += 2
+            if escaped in ("w", "d"):
+                return {WILDCARD}
+            if escaped in (".", "-"):
+                return {escaped}
+            raise ValueError("escape não suportado")
+
+        if c.isalnum() or c in "-_":
+            self.pos += 1
+            return {c.lower()}
+
+        raise ValueError(f"caractere não suportado: {c}")
+
+    def host_keys(self) -> Optional[Set[str]]:
+
+        for prefix in URL_PREFIXES:
+            if self.pattern.startswith(prefix):
+                self.pos = len(prefix)
+                break
+        else:
+            return
+
+        try:
+            hosts = self.parse_alternatives(0)
+        except ValueError:
+            return
+
+        if not self.is_end(0):
+            return
+
+        keys = set()
+
+        for host in hosts:
+
+            labels = host.split(".")
+
+            # os 2 últimos níveis do domínio precisam ser fixos (ex: youtube.com).
+            if len(labels) < 2 or any(not label or WILDCARD in label for label in labels[-2:]):
+                return
+
+            keys.add(".".join(labels[-2:]))
+
+        return keys
+
+
+class ExtractorEntry(NamedTuple):
+    index: int
+    pattern: re.Pattern
+    ie_key: str
+    adult: bool
+
 
-            if not matches.groups():
+class ExtractorTable:
+    """Tabela de extractors do yt-dlp agrupados pelo domínio do _VALID_URL.
+
+    Os padrões são compilados apenas uma vez e uma url só é comparada com os extractors do seu domínio e com os
+    extractors genéricos (padrões que não permitem identificar o domínio), mantendo a ordem original da lista.
+    """
+
+    def __init__(self, extractors: list):
+
+        self.buckets: Dict[str, List[ExtractorEntry]] = {}
+        self.generic: List[ExtractorEntry] = []
+
+        for index, e in enumerate(extractors):
+
+            valid_url = e._VALID_URL
+
+            if not valid_url:
                 continue
 
             if any(ee in type(e).__name__.lower() for ee in exclude_extractors):
                 continue
 
-            if e.age_limit > 17 and e.ie_key() != "Twitter":
-                raise GenericError("**Este link contém conteúdo para maiores de 18 anos!**")
+            for pattern in (valid_url if isinstance(valid_url, (list, tuple)) else [valid_url]):
+
+                try:
+                    compiled = re.compile(pattern)
+                except re.error:
+                    continue
+
+                entry = ExtractorEntry(index, compiled, e.ie_key(), e.age_limit > 17 and e.ie_key() != "Twitter")
+
+                if not (keys := HostParser(pattern).host_keys()):
+                    self.generic.append(entry)
+                    continue
+
+                for key in keys:
+                    self.buckets.setdefault(key, []).append(entry)
+
+    @staticmethod
+    def url_key(url: str) -> Optional[str]:
+
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            return
+
+        if host:
+            return ".".join(host.rsplit(".", 2)[-2:])
+
+    def match(self, url: str) -> Optional[ExtractorEntry]:
+
+        bucket = self.buckets.get(self.url_key(url), [])
+
+        for entry in heapq.merge(bucket, self.generic, key=lambda e: e.index) if bucket else self.generic:
+
+            if (matches := entry.pattern.match(url)) and matches.groups():
+                return entry
+
+
+def load_extractor_table() -> ExtractorTable:
+    import yt_dlp
+    return ExtractorTable(yt_dlp.list_extractors())
+
+
+class YTDLTools:
+    """Extração de links via yt-dlp em um pool de processos (com instâncias do YoutubeDL já carregadas), para que o
+    processamento das páginas não bloqueie o event loop dos bots.
+
+    Os resultados ficam em cache por url durante cache_ttl segundos e pedidos simultâneos do mesmo link aguardam a
+    mesma extração.
+    """
+
+    def __init__(self, processes: int = 2, timeout: int = 60, cache_ttl: int = 600, cache_size: int = 500):
+        self.processes = processes
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.cache: OrderedDict[str, Tuple[float, dict]] = OrderedDict()
+        self.pending: Dict[str, asyncio.Task] = {}
+        self.waiters: Dict[str, int] = {}
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.extractor_table: Optional[ExtractorTable] = None
+        self.extractor_table_lock = asyncio.Lock()
+
+    async def load_extractor_table(self) -> ExtractorTable:
+        """Carrega o yt_dlp e monta a tabela de extractors (milhares de padrões compilados) no executor para não
+        bloquear o event loop. Também é chamado na inicialização do pool para que o primeiro link não precise
+        aguardar."""
+
+        async with self.extractor_table_lock:
+            if self.extractor_table is None:
+                self.extractor_table = await asyncio.get_running_loop().run_in_executor(None, load_extractor_table)
+
+        return self.extractor_table
+
+    def get_pool(self) -> ProcessPoolExecutor:
 
-            if not loop:
-                loop = asyncio.get_event_loop()
-
-            data = await loop.run_in_executor(None, self.extract_info, url)
-
-            try:
-                if data["_type"] == "playlist":
-                    raise GenericError("**No momento não há suporte para playlists com o link fornecido...**")
-            except KeyError:
-                pass
-
-            try:
-                entrie = data["entries"][0]
-            except KeyError:
-                entrie = data
-
-            try:
-                if entrie["age_limit"] > 17:
-                    raise GenericError("**Este link contém conteúdo para maiores de 18 anos!**")
-            except KeyError:
-                pass
-
-            t = PartialTrack(
-                uri=entrie.get("webpage_url") or url,
-                title=entrie["title"],
-                author=entrie["uploader"],
-                thumb=entrie["thumbnail"],
-                duration=entrie["duration"] * 1000,
-                requester=user.id,
-                source_name=entrie["extractor"],
+        if not self.pool:
+            # spawn: evita copiar o estado do event loop/conexões do processo do bot nos processos do pool.
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"), initializer=init_worker
             )
 
-            t.info.update({
-                "search_uri": entrie["url"],
-                "authors": entrie["uploader"]
-            })
+        return self.pool
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def get_cache(self, url: str) -> Optional[dict]:
+
+        try:
+            expires, data = self.cache[url]
+        except KeyError:
+            return
+
+        if expires < time.monotonic():
+            del self.cache[url]
+            return
+
+        self.cache.move_to_end(url)
+        return data
+
+    def set_cache(self, url: str, data: dict):
+
+        self.cache[url] = (time.monotonic() + self.cache_ttl, data)
+        self.cache.move_to_end(url)
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def run_extraction(self, url: str) -> dict:
+
+        pool = self.get_pool()
+
+        try:
+            # ao cancelar (ou esgotar o tempo) a extração é removida da fila caso ainda não tenha iniciado.
+            data = await asyncio.wait_for(asyncio.wrap_future(pool.submit(extract_worker, url)), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise GenericError("**O tempo para obter as informações do link esgotou...**")
+        except BrokenProcessPool:
+            # um dos processos foi finalizado inesperadamente, o pool será recriado no próximo uso.
+            if self.pool is pool:
+                self.close()
+            raise GenericError("**Ocorreu um erro ao processar o link, tente novamente.**")
+
+        self.set_cache(url, data)
+        return data
+
+    async def extract_info(self, url: str) -> dict:
+
+        if (data := self.get_cache(url)) is not None:
+            return data
+
+        try:
+            task = self.pending[url]
+        except KeyError:
+            task = self.pending[url] = asyncio.create_task(self.run_extraction(url))
+            task.add_done_callback(lambda _: self.pending.pop(url, None))
+
+        self.waiters[url] = self.waiters.get(url, 0) + 1
+
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # a extração só é cancelada caso ninguém mais esteja aguardando o mesmo link.
+            if self.waiters[url] == 1:
+                task.cancel()
+            raise
+        finally:
+            if (waiters := self.waiters.pop(url) - 1) > 0:
+                self.waiters[url] = waiters
+
+    async def get_track_info(self, url: str, user: disnake.Member) -> Optional[List[PartialTrack]]:
+        """Retorna None caso o link não seja de um site suportado (ou seja processado pelo lavalink).
+
+        O parâmetro loop foi removido: a extração roda no pool de processos (get_pool) e não mais no executor do loop.
+        """
+
+        if not (entry := (self.extractor_table or await self.load_extractor_table()).match(url)):
+            return
+
+        if entry.adult:
+            raise GenericError("**Este link contém conteúdo para maiores de 18 anos!**")
+
+        data = await self.extract_info(url)
+
+        try:
+            if data["_type"] == "playlist":
+                raise GenericError("**No momento não há suporte para playlists com o link fornecido...**")
+        except KeyError:
+            pass
+
+        try:
+            entrie = data["entries"][0]
+        except KeyError:
+            entrie = data
+
+        try:
+            if entrie["age_limit"] > 17:
+                raise GenericError("**Este link contém conteúdo para maiores de 18 anos!**")
+        except KeyError:
+            pass
+
+        t = PartialTrack(
+            uri=entrie.get("webpage_url") or url,
+            title=entrie["title"],
+            author=entrie["uploader"],
+            thumb=entrie["thumbnail"],
+            duration=entrie["duration"] * 1000,
+            requester=user.id,
+            source_name=entrie["extractor"],
+        )
+
+        t.info.update({
+            "search_uri": entrie["url"],
+            "authors": entrie["uploader"]
+        })
 
-            return [t]
+        return [t]
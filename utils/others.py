@@ -445,9 +445,9 @@ def queue_track_index(inter: disnake.AppCmdInter, bot: BotCore, query: str, chec
 
     tracklist = []
 
-    for counter, track in enumerate(player.queue):
+    for counter, (track, fields) in enumerate(zip(player.queue, player.queue.fields)):
 
-        track_title = track.title.lower().split()
+        track_title = fields.title.split()
 
         q_found = 0
 
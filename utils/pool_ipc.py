@@ -0,0 +1,330 @@
+from __future__ import annotations
+import asyncio
+import itertools
+import json
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from utils.db import LocalDatabase, global_db_models
+
+# limite de tamanho de cada linha (o snapshot inicial pode conter todo o cache de playlists).
+STREAM_LIMIT = 2 ** 27
+
+
+def encode(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode() + b"\n"
+
+
+class PoolIPCServer:
+    """Servidor (processo supervisor) que mantém os dados compartilhados entre os processos do pool.
+
+    Cada namespace é um dict replicado em todos os workers: as alterações feitas por um worker são repassadas aos
+    demais e os workers recebem uma cópia completa ao conectar. Chaves marcadas como "session" pertencem ao worker
+    que as criou e são removidas caso o worker seja desconectado (ex: estado de voz dos bots daquele processo).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8095):
+        self.host = host
+        self.port = port
+        self.data: Dict[str, Dict[str, Any]] = {}
+        self.connections: Dict[asyncio.StreamWriter, Set[Tuple[str, str]]] = {}
+        self.handlers: Dict[str, Callable] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=STREAM_LIMIT)
+
+    def broadcast(self, payload: dict, exclude: Optional[asyncio.StreamWriter] = None):
+
+        data = encode(payload)
+
+        for writer in self.connections:
+            if writer is not exclude:
+                writer.write(data)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+
+        self.connections[writer] = set()
+
+        writer.write(encode({"op": "snapshot", "data": self.data}))
+
+        try:
+            async for line in reader:
+                try:
+                    await self.process(writer, json.loads(line))
+                except Exception:
+                    traceback.print_exc()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+
+            for ns, key in self.connections.pop(writer):
+                try:
+                    del self.data[ns][key]
+                except KeyError:
+                    continue
+                self.broadcast({"op": "delete", "ns": ns, "key": key})
+
+            writer.close()
+
+    async def process(self, writer: asyncio.StreamWriter, payload: dict):
+
+        op = payload["op"]
+
+        if op == "set":
+
+            ns, key = payload["ns"], payload["key"]
+            self.data.setdefault(ns, {})[key] = payload["value"]
+
+            if payload.get("session"):
+                self.connections[writer].add((ns, key))
+
+            self.broadcast(payload, exclude=writer)
+
+        elif op == "delete":
+
+            ns, key = payload["ns"], payload["key"]
+
+            try:
+                del self.data[ns][key]
+            except KeyError:
+                pass
+
+            self.connections[writer].discard((ns, key))
+            self.broadcast(payload, exclude=writer)
+
+        elif op == "clear":
+            self.data.pop(payload["ns"], None)
+            self.broadcast(payload, exclude=writer)
+
+        elif op == "call":
+
+            reply = {"op": "reply", "id": payload["id"]}
+
+            try:
+                reply["result"] = await self.handlers[payload["handler"]](**payload["kwargs"])
+            except Exception as e:
+                traceback.print_exc()
+                reply["error"] = repr(e)
+
+            writer.write(encode(reply))
+
+
+class PoolIPCClient:
+    """Conexão de um worker com o supervisor do pool."""
+
+    def __init__(self, worker_id: int, workers: int, port: int = 8095, host: str = "127.0.0.1"):
+        self.worker_id = worker_id
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.listeners: Dict[str, List[Tuple[Callable, Optional[Callable]]]] = {}
+        self.session: Dict[Tuple[str, str], Any] = {}
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.counter = itertools.count()
+        self.connected = asyncio.Event()
+
+    def subscribe(self, ns: str, on_update: Callable, on_snapshot: Optional[Callable] = None):
+        # on_update(key, value) recebe None como valor nas remoções.
+        self.listeners.setdefault(ns, []).append((on_update, on_snapshot))
+
+    def send(self, payload: dict):
+        if self.writer:
+            self.writer.write(encode(payload))
+
+    def set(self, ns: str, key: str, value: Any, session: bool = False):
+
+        if session:
+            self.session[(ns, key)] = value
+
+        self.send({"op": "set", "ns": ns, "key": key, "value": value, "session": session})
+
+    def delete(self, ns: str, key: str):
+        self.session.pop((ns, key), None)
+        self.send({"op": "delete", "ns": ns, "key": key})
+
+    def clear(self, ns: str):
+        self.send({"op": "clear", "ns": ns})
+
+    async def call(self, handler: str, **kwargs):
+        """Executa no supervisor o handler registrado em PoolIPCServer.handlers (os kwargs são repassados ao handler)."""
+
+        await self.connected.wait()
+
+        id_ = next(self.counter)
+        future = self.pending[id_] = asyncio.get_running_loop().create_future()
+
+        self.send({"op": "call", "id": id_, "handler": handler, "kwargs": kwargs})
+
+        try:
+            reply = await asyncio.wait_for(future, timeout=30)
+        finally:
+            self.pending.pop(id_, None)
+
+        if "error" in reply:
+            raise Exception(f"Erro no supervisor do pool: {reply['error']}")
+
+        return reply["result"]
+
+    def dispatch(self, payload: dict):
+
+        op = payload["op"]
+
+        if op == "reply":
+            try:
+                future = self.pending[payload["id"]]
+            except KeyError:
+                return
+            if not future.done():
+                future.set_result(payload)
+            return
+
+        if op == "snapshot":
+            for ns, items in payload["data"].items():
+                for on_update, on_snapshot in self.listeners.get(ns, []):
+                    if on_snapshot:
+                        on_snapshot(items)
+                    else:
+                        for key, value in items.items():
+                            on_update(key, value)
+            return
+
+        if op == "clear":
+            for _, on_snapshot in self.listeners.get(payload["ns"], []):
+                if on_snapshot:
+                    on_snapshot({})
+            return
+
+        for on_update, _ in self.listeners.get(payload["ns"], []):
+            on_update(payload["key"], payload.get("value"))
+
+    async def connect(self):
+
+        while True:
+
+            try:
+                reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT)
+            except OSError:
+                await asyncio.sleep(1)
+                continue
+
+            # dados vinculados a esse worker são removidos pelo supervisor ao desconectar.
+            for (ns, key), value in self.session.items():
+                self.send({"op": "set", "ns": ns, "key": key, "value": value, "session": True})
+
+            self.connected.set()
+
+            try:
+                async for line in reader:
+                    try:
+                        self.dispatch(json.loads(line))
+                    except Exception:
+                        traceback.print_exc()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+
+            self.connected.clear()
+            self.writer = None
+
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Conexão com o supervisor do pool perdida."))
+
+            print(f"Worker {self.worker_id}: conexão com o supervisor do pool perdida, reconectando...")
+            await asyncio.sleep(1)
+
+
+class SharedDict(dict):
+    """dict replicado entre os processos do pool (ex: cache de playlists)."""
+
+    def __init__(self, ipc: PoolIPCClient, ns: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ipc = ipc
+        self.ns = ns
+        ipc.subscribe(ns, self.remote_update, self.remote_snapshot)
+
+    def remote_update(self, key: str, value: Any):
+        if value is None:
+            super().pop(key, None)
+        else:
+            super().__setitem__(key, value)
+
+    def remote_snapshot(self, items: dict):
+        super().clear()
+        super().update(items)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.ipc.set(self.ns, key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.ipc.delete(self.ns, key)
+
+    def pop(self, key, *args):
+        value = super().pop(key, *args)
+        self.ipc.delete(self.ns, key)
+        return value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self.ipc.clear(self.ns)
+
+
+class SharedLocalDatabase(LocalDatabase):
+    """Database local dos workers: os dados globais (ex: prefixo) ficam apenas no processo supervisor para evitar
+    escritas simultâneas no mesmo arquivo."""
+
+    def __init__(self, ipc: PoolIPCClient):
+        super().__init__()
+        self.ipc = ipc
+
+    async def get_data(self, id_: int, *, db_name: str, collection: str, default_model: dict = None):
+        if collection != "global":
+            return await super().get_data(id_, db_name=db_name, collection=collection, default_model=default_model)
+        return await self.ipc.call("db", method="get_data", kwargs={"id_": str(id_), "db_name": db_name})
+
+    async def update_data(self, id_, data: dict, *, db_name: str, collection: str, default_model: dict = None):
+        if collection != "global":
+            return await super().update_data(id_, data, db_name=db_name, collection=collection, default_model=default_model)
+        return await self.ipc.call("db", method="update_data", kwargs={"id_": str(id_), "data": data, "db_name": db_name})
+
+    async def query_data(self, db_name: str, collection: str, filter: dict = None, limit: Optional[int] = 100) -> list:
+        if collection != "global":
+            return await super().query_data(db_name=db_name, collection=collection, filter=filter, limit=limit)
+        return await self.ipc.call("db", method="query_data", kwargs={"db_name": db_name, "filter": filter,
+                                                                         "limit": limit})
+
+    async def delete_data(self, id_, db_name: str, collection: str):
+        if collection != "global":
+            return await super().delete_data(id_, db_name=db_name, collection=collection)
+        return await self.ipc.call("db", method="delete_data", kwargs={"id_": str(id_), "db_name": db_name})
+
+
+class GlobalDatabaseHandler:
+    """Executa no supervisor as operações nos dados globais enviadas pelos workers (SharedLocalDatabase)."""
+
+    def __init__(self, database: LocalDatabase):
+        self.database = database
+
+    async def __call__(self, method: str, kwargs: dict):
+
+        if method == "get_data":
+            return await self.database.get_data(collection="global", default_model=global_db_models, **kwargs)
+
+        if method == "update_data":
+            return await self.database.update_data(collection="global", default_model=global_db_models, **kwargs)
+
+        if method == "query_data":
+            return list(await self.database.query_data(collection="global", **kwargs))
+
+        if method == "delete_data":
+            await self.database.delete_data(collection="global", **kwargs)
+            return
+
+        raise Exception(f"Operação inválida: {method}")
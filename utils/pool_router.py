@@ -0,0 +1,175 @@
+from __future__ import annotations
+import asyncio
+import traceback
+from typing import TYPE_CHECKING, Dict, Optional
+
+import disnake
+from disnake.ext.commands.view import StringView
+
+from utils.music.checks import check_pool_bots
+from utils.others import CustomContext
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+
+class RoutedMessage:
+
+    __slots__ = ("prefix_task", "messages", "waiters", "routed")
+
+    def __init__(self, prefix_task: asyncio.Task):
+        self.prefix_task = prefix_task
+        # cópia da mensagem recebida por cada bot (id do bot -> mensagem)
+        self.messages: Dict[int, disnake.Message] = {}
+        self.waiters: Dict[int, asyncio.Future] = {}
+        self.routed = False
+
+    def add(self, bot: BotCore, message: disnake.Message):
+
+        self.messages[bot.user.id] = message
+
+        try:
+            future = self.waiters.pop(bot.user.id)
+        except KeyError:
+            return
+
+        if not future.done():
+            future.set_result(message)
+
+    async def wait_message(self, bot: BotCore, timeout: float) -> Optional[disnake.Message]:
+
+        try:
+            return self.messages[bot.user.id]
+        except KeyError:
+            pass
+
+        try:
+            future = self.waiters[bot.user.id]
+        except KeyError:
+            future = self.waiters[bot.user.id] = bot.loop.create_future()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return
+
+
+class PoolMessageRouter:
+    """Processa cada mensagem apenas uma vez no pool (modo GLOBAL_PREFIX).
+
+    O primeiro bot que receber a mensagem obtém o prefixo (uma única leitura no database) e escolhe o bot que vai
+    executar o comando, os demais bots apenas registram a cópia da mensagem recebida para que o contexto possa ser
+    entregue diretamente ao bot escolhido.
+    """
+
+    def __init__(self, timeout: float = 4):
+        self.timeout = timeout
+        self.entries: Dict[int, RoutedMessage] = {}
+
+    def get_entry(self, bot: BotCore, message: disnake.Message) -> RoutedMessage:
+
+        try:
+            return self.entries[message.id]
+        except KeyError:
+            pass
+
+        entry = self.entries[message.id] = RoutedMessage(bot.loop.create_task(bot.get_prefix(message)))
+        bot.loop.call_later(self.timeout, self.entries.pop, message.id, None)
+        return entry
+
+    @staticmethod
+    def build_context(bot: BotCore, message: disnake.Message, prefix) -> CustomContext:
+
+        # mesmo processo do get_context do disnake mas usando o prefixo já obtido.
+        view = StringView(message.content)
+        ctx = CustomContext(prefix=None, view=view, bot=bot, message=message)
+
+        if not isinstance(prefix, str):
+            prefix = next((p for p in prefix or [] if message.content.startswith(p)), None)
+
+        if not prefix or not view.skip_string(prefix):
+            return ctx
+
+        if bot.strip_after_prefix:
+            view.skip_ws()
+
+        invoker = view.get_word()
+        ctx.invoked_with = invoker
+        ctx.prefix = prefix
+        ctx.command = bot.all_commands.get(invoker)
+        return ctx
+
+    async def route(self, bot: BotCore, message: disnake.Message):
+
+        entry = self.get_entry(bot, message)
+        entry.add(bot, message)
+
+        try:
+            prefix = await entry.prefix_task
+        except Exception:
+            traceback.print_exc()
+            return
+
+        ctx = self.build_context(bot, message, prefix)
+
+        # o canal de song-request é configurado separadamente para cada bot.
+        bot.dispatch("song_request", ctx, message)
+
+        if not ctx.valid or entry.routed:
+            return
+
+        entry.routed = True
+
+        await self.invoke(ctx, entry)
+
+    async def invoke(self, ctx: CustomContext, entry: RoutedMessage):
+
+        bot = ctx.bot
+
+        try:
+            kwargs = {
+                "only_voiced": ctx.command.pool_only_voiced,
+                "check_player": ctx.command.pool_check_player,
+                "return_first": ctx.command.pool_return_first,
+            }
+        except AttributeError:
+            kwargs = {"return_first": True}
+
+        if not await bot.can_send_message(ctx.message):
+            return
+
+        trace = bot.pool.tracer.start(ctx.command.qualified_name, ctx.guild.id, ctx.author.id) if bot.pool.tracer else None
+
+        try:
+
+            try:
+                await check_pool_bots(ctx, **kwargs)
+            except Exception as e:
+                ctx.command_failed = True
+                bot.dispatch("command_error", ctx, e)
+                return
+
+            try:
+                music_bot = ctx.music_bot
+            except AttributeError:
+                music_bot = bot
+
+            if music_bot is not bot:
+
+                if not (message := await entry.wait_message(music_bot, self.timeout)):
+                    # o bot escolhido não recebeu a mensagem (ex: sem permissão de ver o canal): o comando não é
+                    # executado por nenhum bot.
+                    return
+
+                ctx = self.build_context(music_bot, message, ctx.prefix)
+                ctx.music_bot = music_bot
+                ctx.music_guild = message.guild
+
+                if not await music_bot.can_send_message(ctx.message):
+                    return
+
+            await ctx.bot.invoke(ctx)
+
+        finally:
+            if trace:
+                bot.pool.tracer.finish(trace, failed=ctx.command_failed)
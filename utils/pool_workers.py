@@ -0,0 +1,127 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from typing import Dict, Optional
+
+from utils.db import LocalDatabase
+from utils.music.local_lavalink import run_lavalink
+from utils.pool_ipc import PoolIPCServer, GlobalDatabaseHandler
+from web_app import start
+
+
+def count_tokens(config: dict) -> int:
+    return len([v for k, v in config.items() if (k == "TOKEN" or k.lower().startswith("token_bot_")) and v])
+
+
+class PoolSupervisor:
+    """Processo principal do modo POOL_WORKERS.
+
+    Distribui os bots entre processos (workers) executando o main.py novamente com as variáveis POOL_WORKER_ID e
+    POOL_WORKER_COUNT, reinicia os workers finalizados e mantém os dados compartilhados entre eles (PoolIPCServer).
+    O servidor RPC e o lavalink local também rodam apenas aqui.
+    """
+
+    def __init__(self, config: dict, start_local: bool = False):
+        self.config = config
+        self.start_local = start_local
+        self.workers = min(config["POOL_WORKERS"], count_tokens(config))
+        self.processes: Dict[int, asyncio.subprocess.Process] = {}
+        self.hub = PoolIPCServer(port=config["POOL_IPC_PORT"])
+        self.closing = False
+
+    def load_shared_data(self):
+
+        try:
+            with open("./playlist_cache.json") as f:
+                self.hub.data["playlist_cache"] = json.load(f)
+        except FileNotFoundError:
+            pass
+
+        if not self.config["MONGO"]:
+            self.hub.handlers["db"] = GlobalDatabaseHandler(LocalDatabase())
+
+    async def supervise(self, worker_id: int):
+
+        delay = 5
+
+        env = dict(os.environ)
+        env.update({"POOL_WORKER_ID": str(worker_id), "POOL_WORKER_COUNT": str(self.workers)})
+
+        while not self.closing:
+
+            started = time.monotonic()
+
+            process = self.processes[worker_id] = await asyncio.create_subprocess_exec(sys.executable, *sys.argv, env=env)
+
+            print(f"Worker {worker_id} iniciado (pid: {process.pid}).")
+
+            code = await process.wait()
+
+            if self.closing:
+                return
+
+            # falhas seguidas aumentam o tempo de espera para reiniciar.
+            delay = 5 if time.monotonic() - started > 120 else min(delay * 2, 300)
+
+            print(f"Worker {worker_id} finalizado (código: {code}), reiniciando em {delay} segundos...")
+
+            await asyncio.sleep(delay)
+
+    def shutdown(self, *args):
+
+        self.closing = True
+
+        for process in self.processes.values():
+            if process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+
+        raise SystemExit(0)
+
+    def run(self):
+
+        print(f"Modo multi-processo: {self.workers} worker(s) para {count_tokens(self.config)} bot(s).\n{'-' * 30}")
+
+        if self.start_local:
+            run_lavalink(
+                lavalink_file_url=self.config['LAVALINK_FILE_URL'],
+                lavalink_initial_ram=self.config['LAVALINK_INITIAL_RAM'],
+                lavalink_ram_limit=self.config['LAVALINK_RAM_LIMIT'],
+                lavalink_additional_sleep=int(self.config['LAVALINK_ADDITIONAL_SLEEP']),
+            )
+
+        loop = asyncio.get_event_loop()
+
+        self.load_shared_data()
+
+        loop.run_until_complete(self.hub.start())
+
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.shutdown)
+        except NotImplementedError:
+            pass
+
+        for worker_id in range(self.workers):
+            loop.create_task(self.supervise(worker_id))
+
+        try:
+            if self.config["RUN_RPC_SERVER"]:
+                start(diagnostics_token=self.config["DIAGNOSTICS_TOKEN"])
+            else:
+                loop.run_forever()
+        except KeyboardInterrupt:
+            self.shutdown()
+
+
+def worker_info() -> Optional[tuple]:
+
+    try:
+        return int(os.environ["POOL_WORKER_ID"]), int(os.environ["POOL_WORKER_COUNT"])
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import disnake
+import psutil
+
+import wavelink.websocket
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+
+def setup_event_loop(config: dict) -> asyncio.AbstractEventLoop:
+    """Cria o event loop usado pelo pool aplicando as otimizações opcionais (PERFORMANCE_MODE):
+    uvloop (quando instalado), tamanho do executor padrão (usado no yt-dlp) e orjson no lavalink/discord."""
+
+    choices = {}
+
+    if config["PERFORMANCE_MODE"]:
+        try:
+            import uvloop
+        except ImportError:
+            choices["Event loop"] = "asyncio (uvloop não instalado)"
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            choices["Event loop"] = f"uvloop {uvloop.__version__}"
+    else:
+        choices["Event loop"] = "asyncio"
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    if workers := config["EXECUTOR_WORKERS"]:
+        pass
+    elif config["PERFORMANCE_MODE"]:
+        # as extrações do yt-dlp passam a maior parte do tempo esperando respostas http.
+        workers = min(64, (os.cpu_count() or 1) * 8)
+
+    if workers:
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=workers, thread_name_prefix="executor"))
+        choices["Executor"] = f"{workers} threads"
+    else:
+        choices["Executor"] = f"padrão ({min(32, (os.cpu_count() or 1) + 4)} threads)"
+
+    # o disnake já usa o orjson automaticamente quando está instalado.
+    if disnake.utils.HAS_ORJSON:
+
+        choices["JSON"] = "orjson"
+
+        if config["PERFORMANCE_MODE"]:
+            import orjson
+            wavelink.websocket.json_loads = orjson.loads
+            choices["JSON"] += " (discord e lavalink)"
+        else:
+            choices["JSON"] += " (discord)"
+
+    else:
+        choices["JSON"] = "json (orjson não instalado)"
+
+    print("\n".join(f"{k}: {v}" for k, v in choices.items()) + f"\n{'-' * 30}")
+
+    return loop
+
+
+class StartupTimer:
+    """Tempo gasto em cada etapa da inicialização (exibido quando todos os bots ficam online)."""
+
+    def __init__(self):
+        now = time.perf_counter()
+        self.start = now - (time.time() - psutil.Process().create_time())
+        self.last = now
+        # o tempo até a criação do pool inclui o interpretador e os imports.
+        self.steps: List[Tuple[str, float]] = [("imports", now - self.start)]
+        self.ready: Dict[str, float] = {}
+        self.reported = False
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+
+    def bot_ready(self, bot: BotCore, total: int):
+
+        self.ready[str(bot.user)] = time.perf_counter() - self.last
+
+        if self.reported or len(self.ready) < total:
+            return
+
+        self.reported = True
+        print(self.report())
+
+    def report(self) -> str:
+
+        txt = [f"Tempo de inicialização: {time.perf_counter() - self.start:.2f}s"]
+        txt.extend(f"    {name}: {duration:.2f}s" for name, duration in self.steps)
+
+        if self.ready:
+            txt.append("    bots online (login + ready):")
+            txt.extend(f"        {name}: {duration:.2f}s" for name, duration in sorted(self.ready.items(), key=lambda i: i[1]))
+
+        return "\n".join(txt) + f"\n{'-' * 30}"
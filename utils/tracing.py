@@ -0,0 +1,275 @@
+from __future__ import annotations
+import functools
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+from utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+command_latency = metrics.histogram("command_duration_seconds", "Tempo total dos comandos (apenas com COMMAND_TRACING).")
+
+current_trace: ContextVar[Optional[CommandTrace]] = ContextVar("current_trace", default=None)
+current_depth: ContextVar[int] = ContextVar("current_depth", default=0)
+
+
+class CommandTrace:
+
+    __slots__ = ("command", "guild_id", "user_id", "start", "timestamp", "duration", "spans", "failed", "finished",
+                 "tokens")
+
+    max_spans = 300
+
+    def __init__(self, command: str, guild_id: Optional[int] = None, user_id: Optional[int] = None):
+        self.command = command
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.start = time.perf_counter()
+        self.timestamp = int(time.time())
+        self.duration = 0.0
+        # (nome, início relativo ao comando, duração, profundidade)
+        self.spans: List[Tuple[str, float, float, int]] = []
+        self.failed = False
+        self.finished = False
+        self.tokens: Optional[Tuple[Token, Token]] = None
+
+    def add_span(self, name: str, start: float, duration: float, depth: int):
+        # tasks criadas durante o comando herdam o contexto e podem terminar depois do comando.
+        if not self.finished and len(self.spans) < self.max_spans:
+            self.spans.append((name, start - self.start, duration, depth))
+
+    def format(self) -> str:
+
+        lines = [f"{self.command} - {self.duration * 1000:.1f}ms{' (falhou)' if self.failed else ''} | "
+                 f"guild: {self.guild_id} | user: {self.user_id} | {time.strftime('%d/%m/%Y %H:%M:%S', time.gmtime(self.timestamp))} (UTC)"]
+
+        for name, offset, duration, depth in sorted(self.spans, key=lambda s: s[1]):
+            lines.append(f"{'    ' * (depth + 1)}+{offset * 1000:.1f}ms {name}: {duration * 1000:.1f}ms")
+
+        return "\n".join(lines)
+
+
+@contextmanager
+def span(name: str):
+
+    trace = current_trace.get()
+
+    if trace is None or trace.finished:
+        yield
+        return
+
+    depth = current_depth.get()
+    token = current_depth.set(depth + 1)
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        current_depth.reset(token)
+        trace.add_span(name, start, time.perf_counter() - start, depth)
+
+
+def traced(name: Optional[str] = None):
+
+    def decorator(func):
+
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+
+            if current_trace.get() is None:
+                return await func(*args, **kwargs)
+
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0
+    return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+
+class CommandTracer:
+
+    def __init__(self, max_samples: int = 1000, max_slowest: int = 25):
+        self.max_samples = max_samples
+        self.max_slowest = max_slowest
+        self.samples: Dict[str, Deque[float]] = {}
+        self.span_totals: Dict[str, Dict[str, list]] = {}
+        self.slowest: List[Tuple[float, int, CommandTrace]] = []
+        self.counter = itertools.count()
+
+    def start(self, command: str, guild_id: Optional[int] = None, user_id: Optional[int] = None) -> CommandTrace:
+        trace = CommandTrace(command, guild_id=guild_id, user_id=user_id)
+        trace.tokens = (current_trace.set(trace), current_depth.set(0))
+        install_webhook_tracing()
+        return trace
+
+    def finish(self, trace: CommandTrace, failed: bool = False):
+
+        if trace.finished:
+            return
+
+        trace.duration = time.perf_counter() - trace.start
+        trace.failed = failed
+        trace.finished = True
+
+        uninstall_webhook_tracing()
+
+        # restaura o contexto anterior ao comando (ex: o trace do comando que chamou outro comando).
+        try:
+            current_trace.reset(trace.tokens[0])
+            current_depth.reset(trace.tokens[1])
+        except ValueError:
+            # finish chamado em outro contexto (ex: em uma task diferente da que iniciou o trace).
+            if current_trace.get() is trace:
+                current_trace.set(None)
+
+        trace.tokens = None
+
+        try:
+            samples = self.samples[trace.command]
+        except KeyError:
+            samples = self.samples[trace.command] = deque(maxlen=self.max_samples)
+
+        samples.append(trace.duration)
+
+        command_latency.observe(trace.duration, command=trace.command)
+
+        try:
+            totals = self.span_totals[trace.command]
+        except KeyError:
+            totals = self.span_totals[trace.command] = {}
+
+        for name, _, duration, _ in trace.spans:
+            try:
+                data = totals[name]
+            except KeyError:
+                data = totals[name] = [0, 0.0]
+            data[0] += 1
+            data[1] += duration
+
+        item = (trace.duration, next(self.counter), trace)
+
+        if len(self.slowest) < self.max_slowest:
+            heapq.heappush(self.slowest, item)
+        elif trace.duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def stats(self) -> List[dict]:
+
+        data = []
+
+        for command, samples in self.samples.items():
+
+            values = sorted(samples)
+            invocations = len(values)
+            totals = self.span_totals.get(command, {})
+
+            data.append(
+                {
+                    "command": command,
+                    "samples": invocations,
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "p99": percentile(values, 99),
+                    "spans": sorted(
+                        ((name, count, total / invocations) for name, (count, total) in totals.items()),
+                        key=lambda s: s[2], reverse=True
+                    ),
+                }
+            )
+
+        return sorted(data, key=lambda d: d["p95"], reverse=True)
+
+    def slowest_traces(self, amount: Optional[int] = None) -> List[CommandTrace]:
+        return [t for _, _, t in sorted(self.slowest, reverse=True)[:amount]]
+
+    def dump(self, amount: Optional[int] = None) -> str:
+
+        txt = []
+
+        for d in self.stats():
+            txt.append(f"{d['command']} - {d['samples']} amostras | p50: {d['p50'] * 1000:.1f}ms | "
+                       f"p95: {d['p95'] * 1000:.1f}ms | p99: {d['p99'] * 1000:.1f}ms")
+            txt.extend(f"    {name}: {avg * 1000:.1f}ms em média por comando ({count}x)" for name, count, avg in d["spans"])
+
+        txt.append(f"\n{'-' * 30}\nExecuções mais lentas:\n{'-' * 30}")
+
+        txt.extend(f"{t.format()}\n" for t in self.slowest_traces(amount))
+
+        return "\n".join(txt)
+
+
+def trace_discord_requests(bot: BotCore):
+    """Requisições da api do discord (mensagens, edições etc) feitas pelo bot. As respostas de interações (via
+    webhook) são rastreadas pelo install_webhook_tracing."""
+
+    request = bot.http.request
+
+    async def traced_request(route, **kwargs):
+
+        if current_trace.get() is None:
+            return await request(route, **kwargs)
+
+        with span(f"discord: {route.method} {route.path}"):
+            return await request(route, **kwargs)
+
+    bot.http.request = traced_request
+
+
+# o AsyncWebhookAdapter é compartilhado por todo o processo: o patch só fica instalado enquanto houver comandos sendo
+# rastreados.
+active_traces = 0
+webhook_request = None
+
+
+def install_webhook_tracing():
+
+    global active_traces, webhook_request
+
+    active_traces += 1
+
+    if webhook_request is not None:
+        return
+
+    from disnake.webhook.async_ import AsyncWebhookAdapter
+
+    webhook_request = original = AsyncWebhookAdapter.request
+
+    async def traced_webhook_request(self, route, *args, **kwargs):
+
+        if current_trace.get() is None:
+            return await original(self, route, *args, **kwargs)
+
+        with span(f"discord: {route.method} {route.path}"):
+            return await original(self, route, *args, **kwargs)
+
+    AsyncWebhookAdapter.request = traced_webhook_request
+
+
+def uninstall_webhook_tracing():
+
+    global active_traces, webhook_request
+
+    active_traces = max(active_traces - 1, 0)
+
+    if active_traces or webhook_request is None:
+        return
+
+    from disnake.webhook.async_ import AsyncWebhookAdapter
+
+    AsyncWebhookAdapter.request = webhook_request
+    webhook_request = None
@@ -0,0 +1,207 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+
+import disnake
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+    from utils.pool_ipc import PoolIPCClient
+
+
+class RemoteBot:
+    """Bot do pool que está rodando em outro processo (modo POOL_WORKERS)."""
+
+    bot_ready = True
+
+    def __init__(self, user_id: int, identifier: str = ""):
+        self.user = disnake.Object(user_id)
+        self.identifier = identifier
+
+    def get_guild(self, guild_id: int):
+        return None
+
+
+class VoiceIndex:
+    """Índice em memória da ocupação dos bots do pool por servidor.
+
+    Atualizado pelos eventos de entrada/saída de servidor, atualização de voz e criação/remoção de players, para que a
+    escolha do bot no check_pool_bots não precise percorrer todos os bots do pool. No modo POOL_WORKERS as alterações
+    também são repassadas aos outros processos, que registram esses bots como RemoteBot.
+    """
+
+    def __init__(self):
+        # id do servidor -> {id do bot: bot}
+        self.guilds: Dict[int, Dict[int, Union[BotCore, RemoteBot]]] = {}
+        # id do servidor -> {id do bot: id do canal de voz}
+        self.voice: Dict[int, Dict[int, int]] = {}
+        # id do canal de voz -> {id do bot: bot}
+        self.channels: Dict[int, Dict[int, Union[BotCore, RemoteBot]]] = {}
+        # id do servidor -> ids dos bots com player ativo
+        self.players: Dict[int, Set[int]] = {}
+        self.remote_bots: Dict[int, RemoteBot] = {}
+        self.ipc: Optional[PoolIPCClient] = None
+
+    def attach(self, ipc: PoolIPCClient):
+        self.ipc = ipc
+        ipc.subscribe("presence", self.remote_presence)
+        ipc.subscribe("voice", self.remote_voice)
+        ipc.subscribe("players", self.remote_player)
+
+    def publish(self, ns: str, guild_id: int, bot: BotCore, value):
+
+        if not self.ipc:
+            return
+
+        key = f"{guild_id}:{bot.user.id}"
+
+        if value is None:
+            self.ipc.delete(ns, key)
+        else:
+            self.ipc.set(ns, key, value, session=True)
+
+    def load_bot(self, bot: BotCore):
+        for guild in bot.guilds:
+            self.add_guild(bot, guild)
+
+    def add_guild(self, bot: BotCore, guild: disnake.Guild):
+
+        self.set_presence(bot, guild.id, True)
+        self.publish("presence", guild.id, bot, bot.identifier)
+
+        try:
+            channel_id = guild.me.voice.channel.id
+        except AttributeError:
+            channel_id = None
+
+        self.update_voice(bot, guild.id, channel_id)
+
+    def remove_guild(self, bot: BotCore, guild_id: int):
+        self.update_voice(bot, guild_id, None)
+        self.player_destroyed(bot, guild_id)
+        self.set_presence(bot, guild_id, False)
+        self.publish("presence", guild_id, bot, None)
+
+    def update_voice(self, bot: BotCore, guild_id: int, channel_id: Optional[int]):
+        if self.set_voice(bot, guild_id, channel_id):
+            # o identifier vai junto para os casos em que o evento chega nos outros processos antes da presença.
+            self.publish("voice", guild_id, bot, [channel_id, bot.identifier] if channel_id else None)
+
+    def player_created(self, bot: BotCore, guild_id: int):
+        self.set_player(bot, guild_id, True)
+        self.publish("players", guild_id, bot, bot.identifier)
+
+    def player_destroyed(self, bot: BotCore, guild_id: int):
+        if self.set_player(bot, guild_id, False):
+            self.publish("players", guild_id, bot, None)
+
+    def set_presence(self, bot: Union[BotCore, RemoteBot], guild_id: int, present: bool):
+
+        if present:
+            try:
+                self.guilds[guild_id][bot.user.id] = bot
+            except KeyError:
+                self.guilds[guild_id] = {bot.user.id: bot}
+            return
+
+        try:
+            bots = self.guilds[guild_id]
+        except KeyError:
+            return
+
+        bots.pop(bot.user.id, None)
+
+        if not bots:
+            del self.guilds[guild_id]
+
+    def set_voice(self, bot: Union[BotCore, RemoteBot], guild_id: int, channel_id: Optional[int]) -> bool:
+
+        try:
+            old_channel_id = self.voice[guild_id].get(bot.user.id)
+        except KeyError:
+            old_channel_id = None
+
+        if old_channel_id == channel_id:
+            return False
+
+        if old_channel_id:
+
+            bots = self.channels[old_channel_id]
+            bots.pop(bot.user.id, None)
+
+            if not bots:
+                del self.channels[old_channel_id]
+
+        if channel_id:
+            self.voice.setdefault(guild_id, {})[bot.user.id] = channel_id
+            self.channels.setdefault(channel_id, {})[bot.user.id] = bot
+            return True
+
+        voice = self.voice[guild_id]
+        del voice[bot.user.id]
+
+        if not voice:
+            del self.voice[guild_id]
+
+        return True
+
+    def set_player(self, bot: Union[BotCore, RemoteBot], guild_id: int, active: bool) -> bool:
+
+        if active:
+            self.players.setdefault(guild_id, set()).add(bot.user.id)
+            return True
+
+        try:
+            players = self.players[guild_id]
+        except KeyError:
+            return False
+
+        players.discard(bot.user.id)
+
+        if not players:
+            del self.players[guild_id]
+
+        return True
+
+    def get_remote_bot(self, key: str, identifier: Optional[str] = None):
+
+        guild_id, bot_id = (int(i) for i in key.split(":"))
+
+        try:
+            bot = self.remote_bots[bot_id]
+        except KeyError:
+            bot = self.remote_bots[bot_id] = RemoteBot(bot_id)
+
+        if identifier:
+            bot.identifier = identifier
+
+        return guild_id, bot
+
+    def remote_presence(self, key: str, identifier: Optional[str]):
+        guild_id, bot = self.get_remote_bot(key, identifier)
+        self.set_presence(bot, guild_id, identifier is not None)
+
+    def remote_voice(self, key: str, value: Optional[list]):
+        channel_id, identifier = value or (None, None)
+        guild_id, bot = self.get_remote_bot(key, identifier)
+        self.set_voice(bot, guild_id, channel_id)
+
+    def remote_player(self, key: str, identifier: Optional[str]):
+        guild_id, bot = self.get_remote_bot(key, identifier)
+        self.set_player(bot, guild_id, identifier is not None)
+
+    @staticmethod
+    def ready_bots(bots: Dict[int, Union[BotCore, RemoteBot]]) -> List[Union[BotCore, RemoteBot]]:
+        return sorted((b for b in bots.values() if b.bot_ready), key=lambda b: b.identifier)
+
+    def guild_bots(self, guild_id: int) -> List[Union[BotCore, RemoteBot]]:
+        return self.ready_bots(self.guilds.get(guild_id, {}))
+
+    def channel_bots(self, channel_id: int) -> List[Union[BotCore, RemoteBot]]:
+        return self.ready_bots(self.channels.get(channel_id, {}))
+
+    def free_bots(self, guild_id: int) -> List[Union[BotCore, RemoteBot]]:
+
+        voice = self.voice.get(guild_id, {})
+        players = self.players.get(guild_id, set())
+
+        return [b for b in self.guild_bots(guild_id) if b.user.id not in voice and b.user.id not in players]
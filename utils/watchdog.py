@@ -0,0 +1,157 @@
+from __future__ import annotations
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from utils.metrics import loop_lag, loop_lag_histogram
+
+# o trecho de código do bot mais interno na stack é considerado o causador do travamento.
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def is_project_file(filename: str):
+    return filename.startswith(project_dir) and "site-packages" not in filename and "dist-packages" not in filename
+
+
+class LoopWatchdog:
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.1, max_offenders: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_offenders = max_offenders
+        self.heartbeat = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.offenders: Dict[str, dict] = {}
+        self.pending_offender: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+
+        if self.task:
+            return
+
+        self.task = loop.create_task(self.heartbeat_loop())
+        self.thread = threading.Thread(target=self.monitor, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    async def heartbeat_loop(self):
+
+        loop = asyncio.get_running_loop()
+
+        self.loop_thread_id = threading.get_ident()
+
+        while True:
+
+            start = loop.time()
+            self.heartbeat = time.monotonic()
+
+            await asyncio.sleep(self.interval)
+
+            self.lag = max(loop.time() - start - self.interval, 0)
+            loop_lag.set(self.lag)
+            loop_lag_histogram.observe(self.lag)
+
+            if self.lag > self.max_lag:
+                self.max_lag = self.lag
+
+            if self.lag >= self.threshold:
+                self.finish_stall(self.lag)
+
+    def monitor(self):
+
+        # thread separada: consegue ver a stack do event loop enquanto ele está travado.
+        captured_heartbeat = None
+
+        while True:
+
+            time.sleep(self.interval)
+
+            heartbeat = self.heartbeat
+
+            if heartbeat == captured_heartbeat:
+                continue
+
+            if time.monotonic() - heartbeat - self.interval < self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+
+            if frame is None:
+                continue
+
+            captured_heartbeat = heartbeat
+
+            stack = traceback.extract_stack(frame)
+
+            self.record_offender(stack)
+
+    def record_offender(self, stack: traceback.StackSummary):
+
+        try:
+            f = next(f for f in reversed(stack) if is_project_file(f.filename))
+        except StopIteration:
+            f = stack[-1]
+
+        location = f"{os.path.relpath(f.filename, project_dir)}:{f.lineno} ({f.name})"
+
+        with self.lock:
+
+            try:
+                data = self.offenders[location]
+            except KeyError:
+
+                if len(self.offenders) >= self.max_offenders:
+                    # descartar o causador com menor tempo total travado.
+                    del self.offenders[min(self.offenders, key=lambda k: self.offenders[k]["total"])]
+
+                data = self.offenders[location] = {"count": 0, "max": 0.0, "total": 0.0, "stack": ""}
+
+            data["stack"] = "".join(stack.format()[-15:])
+            data["last"] = int(time.time())
+            self.pending_offender = location
+
+    def finish_stall(self, lag: float):
+
+        self.stalls += 1
+
+        with self.lock:
+
+            location = self.pending_offender
+            self.pending_offender = None
+
+            if location is None or location not in self.offenders:
+                return
+
+            data = self.offenders[location]
+            data["count"] += 1
+            data["total"] += lag
+            data["max"] = max(data["max"], lag)
+
+            stack = data["stack"]
+
+        print(f"{'-' * 30}\n[Watchdog] O event loop ficou travado por {lag:.3f}s em: {location}\n{stack}{'-' * 30}")
+
+    def worst_offenders(self, amount: int = 10) -> List[dict]:
+
+        with self.lock:
+            offenders = [{"location": k, **v} for k, v in self.offenders.items() if v["count"]]
+
+        return sorted(offenders, key=lambda d: d["total"], reverse=True)[:amount]
+
+    def stats(self, amount: int = 10) -> dict:
+        return {
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "threshold": self.threshold,
+            "stalls": self.stalls,
+            "offenders": [{k: v for k, v in d.items() if k != "stack"} for d in self.worst_offenders(amount)],
+        }
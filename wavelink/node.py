@@ -25,6 +25,7 @@ import inspect
 import json
 import os
 import logging
+import time
 from disnake.ext import commands
 from typing import Any, Callable, Dict, Optional, Union
 from urllib.parse import quote
@@ -168,6 +169,21 @@ class Node:
             A list of or TrackPlaylist instance of :class:`wavelink.player.Track` objects.
             This could be None if no tracks were found.
         """
+        start = time.perf_counter()
+        result = "error"
+
+        try:
+            tracks = await self._get_tracks(query, retry_on_failure=retry_on_failure, **kwargs)
+            if tracks:
+                result = "ok"
+            return tracks
+        except TrackNotFound:
+            result = "no_matches"
+            raise
+        finally:
+            self._client.bot.dispatch('wavelink_rest_request', self, time.perf_counter() - start, result)
+
+    async def _get_tracks(self, query: str, *, retry_on_failure: bool = True, **kwargs) -> Union[list, TrackPlaylist, None]:
         backoff = ExponentialBackoff(base=1)
 
         mode = "loadtracks?identifier" if not kwargs.get('channels') else "searchchannels?query"
@@ -22,6 +22,7 @@ SOFTWARE.
 """
 import aiohttp
 import asyncio
+import json
 import logging
 import sys
 import traceback
@@ -34,6 +35,9 @@ from .stats import Stats
 
 __log__ = logging.getLogger(__name__)
 
+# pode ser trocado por um backend mais rápido (ex: orjson.loads) na inicialização.
+json_loads = json.loads
+
 
 class WebSocket:
 
@@ -131,7 +135,7 @@ class WebSocket:
                     self.bot.loop.create_task(self._connect())
             else:
                 __log__.debug(f'WEBSOCKET | Received Payload:: <{msg.data}>')
-                self.bot.loop.create_task(self.process_data(msg.json()))
+                self.bot.loop.create_task(self.process_data(msg.json(loads=json_loads)))
 
     async def process_data(self, data: Dict[str, Any]):
         op = data.get('op', None)
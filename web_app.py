@@ -1,44 +1,64 @@
 from __future__ import annotations
 import asyncio
+import hmac
 import json
 import logging
+import time
 from traceback import print_exc
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Dict, Set
 from os import environ
 import aiohttp
 import disnake
 import tornado.ioloop
 import tornado.web
 import tornado.websocket
-from async_timeout import timeout
+
+from utils.metrics import metrics, pool_collector
 
 if TYPE_CHECKING:
     from utils.client import BotPool, BotCore
 
 logging.getLogger('tornado.access').disabled = True
 
-users_ws = {}
-bots_ws = []
+# user_id -> conexões do usuário
+users_ws: Dict[int, Set[WebSocketHandler]] = {}
+# bot_id -> conexão do bot
+bots_ws: Dict[int, WebSocketHandler] = {}
+# último estado de rpc conhecido por usuário: {user_id: {bot_id: payload}}
+rpc_states = {}
 
 
-class IndexHandler(tornado.web.RequestHandler):
+def apply_rpc_delta(state: dict, data: dict):
+
+    state.update(data.get("set", {}))
+
+    for k, v in data.get("patch", {}).items():
+        state[k] = {**(state.get(k) or {}), **v}
+
+    return state
 
-    def initialize(self, bots: list):
+
+class PoolStatus:
+
+    def __init__(self, bots: list):
         self.bots = bots
-        self.text = ""
+        self.index_text = ""
+        self.health: dict = {}
+        self.refresh()
 
-    async def prepare(self):
+    def refresh(self):
 
         cells = ""
+        ready = 0
 
         for bot in self.bots:
 
-            try:
-                async with timeout(7):
-                    await bot.wait_until_ready()
-            except asyncio.TimeoutError:
+            # bots que ainda estão inicializando serão exibidos na próxima atualização.
+            if not bot.bot_ready:
                 continue
 
+            ready += 1
+
             if str(bot.user.id) in bot.config['INTERACTION_BOTS_CONTROLLER']:
                 continue
 
@@ -49,18 +69,18 @@ class IndexHandler(tornado.web.RequestHandler):
                      f"Adicionar:<br><a href=\"{disnake.utils.oauth_url(bot.user.id, permissions=disnake.Permissions(bot.config['INVITE_PERMISSIONS']), scopes=('bot', 'applications.commands'))}\" " \
                      f"target=\"_blank\">{bot.user}</a></td></tr>"
 
-        if not cells:
+        try:
+            killing_state = self.bots[0].pool.killing_state
+        except:
+            killing_state = False
 
-            try:
-                killing_state = self.bots[0].pool.killing_state
-            except:
-                killing_state = False
+        if not cells:
 
             if killing_state is True:
-                self.text = '<h1 style=\"font-size:5vw\">A aplicação será reiniciada em breve...</h1>'
+                self.index_text = '<h1 style=\"font-size:5vw\">A aplicação será reiniciada em breve...</h1>'
             else:
-                self.text = '<h1 style=\"font-size:5vw\">Não há bots disponíveis no momento...</h1>\n' \
-                            '<br>(se o seu bot não apareceu na lista, verifique o erro que apareceu no terminal/console \"'
+                self.index_text = '<h1 style=\"font-size:5vw\">Não há bots disponíveis no momento...</h1>\n' \
+                                  '<br>(se o seu bot não apareceu na lista, verifique o erro que apareceu no terminal/console \"'
 
         else:
 
@@ -71,7 +91,31 @@ class IndexHandler(tornado.web.RequestHandler):
             }
             </style>"""
 
-            self.text = f"<p style=\"font-size:30px\">Bots Disponíveis:</p>{style}\n<table>{cells}</table>"
+            self.index_text = f"<p style=\"font-size:30px\">Bots Disponíveis:</p>{style}\n<table>{cells}</table>"
+
+        if killing_state is True:
+            status = "restarting"
+        elif killing_state == "ratelimit":
+            status = "ratelimited"
+        elif ready:
+            status = "ok"
+        else:
+            status = "starting"
+
+        self.health = {
+            "status": status,
+            "bots": len(self.bots),
+            "ready": ready,
+            "rpc_users": len(users_ws),
+            "rpc_bots": len(bots_ws),
+            "updated_at": int(time.time()),
+        }
+
+
+class IndexHandler(tornado.web.RequestHandler):
+
+    def initialize(self, status: PoolStatus):
+        self.status = status
 
     def get(self):
 
@@ -84,22 +128,142 @@ class IndexHandler(tornado.web.RequestHandler):
                      ".replace(\"https\", \"wss\") + \"ws\"}</script></body>"
 
 
-        self.write(f"{self.text}<p><a href=\"#"
+        self.write(f"{self.status.index_text}<p><a href=\"#"
                    f"/releases\" target=\"_blank\">Baixe o app de rich presence aqui.</a></p>Link para adicionar no app "
                    f"de RPC abaixo: {ws_url}")
         # self.render("index.html") #será implementado futuramente...
 
 
+class HealthHandler(tornado.web.RequestHandler):
+
+    def initialize(self, status: PoolStatus):
+        self.status = status
+
+    def get(self):
+        self.write(self.status.health)
+
+
+class DiagnosticsHandler(tornado.web.RequestHandler):
+    """Páginas de diagnóstico (métricas/watchdog): só ficam disponíveis com a configuração DIAGNOSTICS_TOKEN e exigem
+    o token no header (Authorization: Bearer <token>) ou no parâmetro token."""
+
+    def initialize(self, token: str = "", **kwargs):
+        self.token = token
+
+    def prepare(self):
+
+        if not self.token:
+            raise tornado.web.HTTPError(404)
+
+        auth = self.request.headers.get("Authorization", "")
+
+        token = auth[7:] if auth.startswith("Bearer ") else self.get_argument("token", "")
+
+        if not hmac.compare_digest(token.encode(), self.token.encode()):
+            raise tornado.web.HTTPError(401)
+
+
+class MetricsHandler(DiagnosticsHandler):
+
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(metrics.render())
+
+
+class WatchdogHandler(DiagnosticsHandler):
+
+    def initialize(self, bots: list, **kwargs):
+        super().initialize(**kwargs)
+        self.bots = bots
+
+    def get(self):
+
+        try:
+            watchdog = self.bots[0].pool.watchdog
+        except IndexError:
+            watchdog = None
+
+        if not watchdog:
+            self.set_status(404)
+            self.write({"error": "watchdog não iniciado."})
+            return
+
+        try:
+            amount = int(self.get_argument("amount", "10"))
+        except ValueError:
+            amount = 10
+
+        self.write(watchdog.stats(amount))
+
+
 class WebSocketHandler(tornado.websocket.WebSocketHandler):
 
+    # limite de mensagens pendentes por conexão (mensagens mais antigas serão descartadas).
+    send_queue_size = 100
+    # quantidade de mensagens descartadas seguidas para desconectar um cliente lento.
+    max_dropped_messages = 50
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.user_ids: list = []
         self.bot_ids: list = []
+        self.send_queue: Optional[asyncio.Queue] = None
+        self.sender_task: Optional[asyncio.Task] = None
+        self.dropped_messages = 0
+
+    def open(self):
+        self.send_queue = asyncio.Queue(maxsize=self.send_queue_size)
+        self.sender_task = asyncio.create_task(self.sender())
+
+    async def sender(self):
+
+        while True:
+
+            message = await self.send_queue.get()
+
+            try:
+                await self.write_message(message)
+            except tornado.websocket.WebSocketClosedError:
+                return
+            except Exception as e:
+                print(f"Erro ao enviar dados do rpc para [{self.request.remote_ip}]: {repr(e)}")
+
+            if self.send_queue.empty():
+                self.dropped_messages = 0
+
+    def send(self, message: str):
+
+        if not self.sender_task or self.sender_task.done():
+            return
+
+        try:
+            self.send_queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # cliente não está conseguindo acompanhar: descartar a mensagem mais antiga.
+        try:
+            self.send_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        self.send_queue.put_nowait(message)
+
+        self.dropped_messages += 1
+
+        if self.dropped_messages >= self.max_dropped_messages:
+            print(f"Desconectando cliente lento: {self.user_ids or self.bot_ids} {self.request.remote_ip}")
+            self.sender_task.cancel()
+            self.close(code=1008, reason="Desconectando: o cliente não está recebendo os dados a tempo...")
 
     def on_message(self, message):
 
-        data = json.loads(message)
+        try:
+            data = json.loads(message)
+        except ValueError:
+            self.close(code=1003, reason="Desconectando: dados inválidos")
+            return
 
         ws_id = data.get("user_ids")
         bot_id = data.get("bot_id")
@@ -111,12 +275,7 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
                 self.close(code=1005, reason="Desconectando: por falta de ids de usuario")
                 return
 
-            try:
-                users_ws[data["user"]].write_message(json.dumps(data))
-            except KeyError:
-                pass
-            except Exception as e:
-                print(f"Erro ao processar dados do rpc para o user [{data['user']}]: {repr(e)}")
+            self.process_bot_data(data, bot_id)
             return
 
         is_bot = data.pop("bot", False)
@@ -124,7 +283,8 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
         if is_bot:
             print(f"Nova conexão - Bot: {ws_id} {self.request.remote_ip}")
             self.bot_ids = ws_id
-            bots_ws.append(self)
+            for b_id in ws_id:
+                bots_ws[b_id] = self
             return
 
         if len(ws_id) > 3:
@@ -136,48 +296,137 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
         print("\n".join(f"Nova conexão - User: {u} | {data}" for u in self.user_ids))
 
         for u_id in ws_id:
+
             try:
-                users_ws[u_id].close(code=403, reason="Nova sessão iniciada...")
-            except:
-                pass
-            users_ws[u_id] = self
+                connections = users_ws[u_id]
+            except KeyError:
+                users_ws[u_id] = {self}
+                continue
+
+            for w in list(connections):
+                if w is self:
+                    continue
+                try:
+                    w.close(code=403, reason="Nova sessão iniciada...")
+                except:
+                    pass
+                connections.discard(w)
+
+            connections.add(self)
+
+        message = json.dumps(data)
+
+        for w in set(bots_ws.values()):
+            w.send(message)
+
+    def process_bot_data(self, data: dict, bot_id: int):
+
+        try:
+            users = data.pop("users")
+        except KeyError:
+            users = [data["user"]]
+
+        op = data.get("op")
+
+        resync_users = []
+
+        # payload em lote: distribuir uma cópia para cada usuário conectado.
+        for u in users:
 
-        for w in bots_ws:
             try:
-                w.write_message(json.dumps(data))
-            except Exception as e:
-                print(f"Erro ao processar dados do rpc para os bot's {w.bot_ids}: {repr(e)}")
+                connections = users_ws[u]
+            except KeyError:
+                continue
+
+            if op == "delta":
+
+                try:
+                    payload = rpc_states[u][bot_id]
+                except KeyError:
+                    resync_users.append(u)
+                    continue
+
+                if payload.get("session") != data.get("session"):
+                    resync_users.append(u)
+                    continue
+
+                apply_rpc_delta(payload, data)
+
+            elif op == "close":
+                try:
+                    del rpc_states[u][bot_id]
+                except KeyError:
+                    pass
+                payload = data
+
+            elif "session" in data:
+                payload = dict(data)
+                rpc_states.setdefault(u, {})[bot_id] = payload
+
+            else:
+                payload = data
+
+            payload["user"] = u
+
+            message = json.dumps(payload)
+
+            for w in connections:
+                w.send(message)
+
+        if resync_users:
+            # estado desconhecido para esses usuários: solicitar um novo snapshot ao bot.
+            try:
+                bots_ws[bot_id].send(json.dumps({"op": "rpc_update", "user_ids": resync_users}))
+            except KeyError:
+                pass
 
     def check_origin(self, origin: str):
         return True
 
     def on_close(self):
 
+        try:
+            self.sender_task.cancel()
+        except AttributeError:
+            pass
+
         if self.user_ids:
             print("\n".join(f"Conexão Finalizada - User: {u}" for u in self.user_ids))
             for u_id in self.user_ids:
                 try:
-                    del users_ws[u_id]
+                    connections = users_ws[u_id]
                 except KeyError:
                     continue
+                connections.discard(self)
+                if not connections:
+                    del users_ws[u_id]
+                    rpc_states.pop(u_id, None)
             return
 
         if not self.bot_ids:
             print(f"Conexão Finalizada - IP: {self.request.remote_ip}")
+            return
 
-        else:
+        print(f"Conexão Finalizada - Bot ID's: {self.bot_ids}")
+
+        # bots que já reconectaram em outra conexão não são removidos.
+        owned = [b for b in self.bot_ids if bots_ws.get(b) is self]
 
-            print(f"Conexão Finalizada - Bot ID's: {self.bot_ids}")
+        if not owned:
+            return
 
-            data = {"op": "close", "bot_id": self.bot_ids}
+        for b_id in owned:
+            del bots_ws[b_id]
 
-            for w in users_ws.values():
-                try:
-                    w.write_message(data)
-                except Exception as e:
-                    print(f"Erro ao processar dados do rpc para os usuários: [{', '.join(str(i) for i in w.user_ids)}]: {repr(e)}")
+        for states in rpc_states.values():
+            for b_id in owned:
+                states.pop(b_id, None)
 
-        bots_ws.remove(self)
+        message = json.dumps({"op": "close", "bot_id": owned})
+
+        for connections in users_ws.values():
+            for w in connections:
+                w.send(message)
 
 
 class WSClient:
@@ -226,6 +475,8 @@ class WSClient:
 
         for bot in self.pool.bots:
             for player in bot.music.players.values():
+                # o servidor de rpc não possui mais os snapshots anteriores.
+                player.rpc_reset_users()
                 vc: disnake.VoiceChannel = player.bot.get_channel(player.channel_id)
                 if vc.voice_states:
                     bot.loop.create_task(player.process_rpc(vc))
@@ -297,25 +548,39 @@ class WSClient:
                             continue
                         vc_user_ids = [i for i in vc.voice_states if i in users]
                         if vc_user_ids:
-                            bot.loop.create_task(player.process_rpc(vc))
+                            player.rpc_reset_users(vc_user_ids)
+                            bot.loop.create_task(player.process_rpc(vc, users=vc_user_ids))
                             for i in vc_user_ids:
                                 users.remove(i)
 
 
-def run_app(bots: Optional[list] = None):
+def run_app(bots: Optional[list] = None, diagnostics_token: str = ""):
 
     bots = bots or []
 
-    app = tornado.web.Application([
-        (r'/', IndexHandler, {'bots': bots}),
-        (r'/ws', WebSocketHandler),
-    ])
+    status = PoolStatus(bots)
+
+    # a página inicial e o healthcheck usam apenas os dados dessa atualização periódica.
+    tornado.ioloop.PeriodicCallback(status.refresh, 15000).start()
+
+    metrics.add_collector(pool_collector(bots))
+
+    app = tornado.web.Application(
+        [
+            (r'/', IndexHandler, {'status': status}),
+            (r'/health', HealthHandler, {'status': status}),
+            (r'/metrics', MetricsHandler, {'token': diagnostics_token}),
+            (r'/watchdog', WatchdogHandler, {'bots': bots, 'token': diagnostics_token}),
+            (r'/ws', WebSocketHandler),
+        ],
+        websocket_max_message_size=1024 * 512,
+    )
 
     app.listen(port=environ.get("PORT", 80))
 
 
-def start(bots: Optional[list] = None):
-    run_app(bots)
+def start(bots: Optional[list] = None, diagnostics_token: str = ""):
+    run_app(bots, diagnostics_token)
     tornado.ioloop.IOLoop.instance().start()
 
 